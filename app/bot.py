@@ -5,11 +5,13 @@ import asyncio
 
 from aiogram import Bot, Dispatcher
 from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.bot import DefaultBotProperties
 from loguru import logger
 
-from app.middlewares import AntiFloodMiddleware, AddUser, UpdateLastAcivity, GroupVerificationMiddleware, BotStatusMiddleware
+from app.middlewares import (
+    AntiFloodMiddleware, AddUser, UpdateLastAcivity, GroupVerificationMiddleware, BotStatusMiddleware,
+    OutgoingRateLimitMiddleware, UnitOfWorkMiddleware, CommitBeforeRequestMiddleware, ImageFileIdMiddleware
+)
 from app.config import BOT_TOKEN, ADMINS_ID, SUPERADMIN_ID, BOT_NICKNAME
 from app.handlers.users import users_routers
 from app.handlers.admins import admin_routers
@@ -17,12 +19,24 @@ from app.utils.filters import ChatTypeFilter, HasRole
 from app.utils.roles import ROLE_ADMIN, ROLE_SUPERADMIN
 from app.database.db import init_db, AsyncSessionLocal
 from app.database.schema import DevChangelog
+from app.database.fsm_storage import create_fsm_storage
+from app.database.activity import activity_aggregator
+from app.database.image_usage import image_usage_aggregator
+from app.database.maintenance import sqlite_maintenance
+from app.database.users import known_user_cache
+from app.utils.group_utils import group_membership_cache
+from app.utils.broadcast_utils import broadcast_manager
+from app.utils.notification_queue import notification_queue
+from app.utils.channel_sync import channel_sync
+from app.utils.image_assets import image_asset_cache
+from app.utils.image_pool import image_pool
+from app.utils.render_cache import render_cache
 from sqlalchemy import select
 from datetime import datetime
 
 # ===== 日志与调度器 =====
-# 使用内存存储（演示/学习用，生产可替换为 Redis 等）
-storage = MemoryStorage()
+# FSM 存储：由 FSM_STORAGE 配置选择 memory / sql / redis，默认进程内存储
+storage = create_fsm_storage()
 dp = Dispatcher(
     storage=storage
 )  # 创建调度器实例
@@ -34,6 +48,11 @@ logger.add("./logs/all.log", enqueue=True, rotation="1 week", level="DEBUG")
 
 # ===== 机器人实例 =====
 bot = Bot(BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+# 出站请求前先提交当前 update 的数据库修改，再统一限速与 429 重试
+bot.session.middleware(CommitBeforeRequestMiddleware())
+# 面板图片外链替换为缓存的 file_id（在限速之外，失效后的 URL 重发同样经过限速）
+bot.session.middleware(ImageFileIdMiddleware())
+bot.session.middleware(OutgoingRateLimitMiddleware())
 
 # ===== 路由：管理（含超管） =====
 for router in admin_routers:
@@ -105,6 +124,35 @@ async def insert_initial_data_if_needed() -> None:
         # 不抛出异常，避免影响机器人启动
 
 
+async def on_startup(bot: Bot) -> None:
+    """调度器启动时：预热缓存并启动后台任务"""
+    await known_user_cache.warm_up()
+    activity_aggregator.start()
+    image_usage_aggregator.start()
+    sqlite_maintenance.start()
+    notification_queue.start()
+    channel_sync.start(bot)
+    await image_pool.load()
+    await image_asset_cache.start(bot)
+    # 恢复上次退出时未完成的群发任务
+    await broadcast_manager.resume_unfinished(bot)
+
+
+async def on_shutdown() -> None:
+    """调度器关闭时：停止后台任务并写回缓冲数据"""
+    await notification_queue.stop()
+    await channel_sync.stop()
+    await image_asset_cache.stop()
+    await broadcast_manager.stop()
+    await activity_aggregator.stop()
+    await image_usage_aggregator.stop()
+    await sqlite_maintenance.stop()
+    logger.info(f"已知用户缓存统计: {known_user_cache.stats()}")
+    logger.info(f"群组成员缓存统计: {group_membership_cache.stats()}")
+    logger.info(f"图片 file_id 缓存统计: {image_asset_cache.stats()}")
+    logger.info(f"列表页渲染缓存统计: {render_cache.stats()}")
+
+
 async def main() -> None:
     """
     程序入口：初始化数据库、中间件并启动长轮询。
@@ -118,6 +166,8 @@ async def main() -> None:
         
         # 首次启动时自动插入初始数据
         await insert_initial_data_if_needed()
+        # 每个 update 共用一个数据库会话（最外层）
+        dp.update.outer_middleware(UnitOfWorkMiddleware())
         # 机器人状态检查中间件（最高优先级）
         dp.message.middleware(BotStatusMiddleware())
         dp.callback_query.middleware(BotStatusMiddleware())
@@ -127,6 +177,9 @@ async def main() -> None:
         dp.message.middleware(UpdateLastAcivity())
         # 为回调查询添加群组验证中间件
         dp.callback_query.middleware(GroupVerificationMiddleware())
+        
+        dp.startup.register(on_startup)
+        dp.shutdown.register(on_shutdown)
         await dp.start_polling(bot)
     except Exception as e:
         logger.error(f"错误：{e}")
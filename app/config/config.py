@@ -49,11 +49,85 @@ if _sync_channel_raw and not SYNC_CHANNELS:
 _default_sqlite_url = "sqlite+aiosqlite:///./db/lustfulservice.db"
 DATABASE_URL_ASYNC = os.getenv("DATABASE_URL_ASYNC", _default_sqlite_url)
 
+# SQLite 连接参数（每个新连接建立时应用，其他数据库忽略）
+SQLITE_PRAGMAS_ENABLED = os.getenv("SQLITE_PRAGMAS_ENABLED", "true").lower() == "true"
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")  # WAL 下读写互不阻塞
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")  # WAL + NORMAL：仅在检查点时 fsync
+SQLITE_BUSY_TIMEOUT = int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # 等待写锁的毫秒数，避免 "database is locked"
+SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))  # 页缓存，负数表示 KiB（默认 64MB）
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", "268435456"))  # 内存映射读取大小（字节，默认 256MB）
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")  # 临时表/排序放在内存
+SQLITE_MAINTENANCE_INTERVAL = float(os.getenv("SQLITE_MAINTENANCE_INTERVAL", "3600"))  # WAL 检查点与 PRAGMA optimize 的执行间隔（秒）
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "8"))  # 只读连接池大小（写入固定使用单个连接）
+SQLITE_WRITE_TIMEOUT = float(os.getenv("SQLITE_WRITE_TIMEOUT", "30"))  # 等待写连接的超时时间（秒）
+
 # 分页配置常量
 REVIEW_PAGE_SIZE = 3  # 审核列表每页显示的项目数量
+REVIEW_BULK_MAX_ITEMS = 100  # 批量审核单次最多处理的项目数量
 BROWSE_PAGE_SIZE = 5  # 浏览列表每页显示的项目数量
 ADVANCED_BROWSE_PAGE_SIZE = 10  # 高级浏览每页显示的项目数量
 ADVANCED_BROWSE_LARGE_PAGE_SIZE = 15  # 高级浏览大页面每页显示的项目数量
 SUBMISSION_PAGE_SIZE = 5  # 投稿列表每页显示的项目数量
 CATEGORY_PAGE_SIZE = 5  # 分类列表每页显示的项目数量
-SETTINGS_PAGE_SIZE = 8  # 设置列表每页显示的项目数量
\ No newline at end of file
+SETTINGS_PAGE_SIZE = 8  # 设置列表每页显示的项目数量
+
+# 缓存配置
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "5"))  # 系统设置缓存的版本检查间隔（秒），多进程部署时的最大感知延迟
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "5"))  # 活跃数据写回间隔（秒）
+ACTIVITY_FLUSH_MAX_PENDING = int(os.getenv("ACTIVITY_FLUSH_MAX_PENDING", "500"))  # 积压用户数达到该值时立即写回
+KNOWN_USER_CACHE_SIZE = int(os.getenv("KNOWN_USER_CACHE_SIZE", "50000"))  # 已知用户缓存容量（LRU）
+ROLE_CACHE_SIZE = int(os.getenv("ROLE_CACHE_SIZE", "10000"))  # 角色缓存容量
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", "60"))  # 角色缓存有效期（秒），多进程部署时的最大感知延迟
+GROUP_MEMBER_CACHE_TTL = float(os.getenv("GROUP_MEMBER_CACHE_TTL", "300"))  # 群组成员验证缓存有效期（秒）
+GROUP_NONMEMBER_CACHE_TTL = float(os.getenv("GROUP_NONMEMBER_CACHE_TTL", "30"))  # 非成员结果缓存有效期（秒）
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))  # 分页总数缓存有效期（秒），数据变化时立即失效，此值兜底其他进程的写入
+SERVER_STATS_CACHE_TTL = float(os.getenv("SERVER_STATS_CACHE_TTL", "30"))  # 服务器统计缓存有效期（秒）
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "2000"))  # 列表页渲染缓存容量
+RENDER_CACHE_TTL = float(os.getenv("RENDER_CACHE_TTL", "60"))  # 列表页渲染缓存有效期（秒），数据变化时立即失效，此值只限制相对时间的滞后
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "8"))  # 全文搜索每页结果数
+DUPLICATE_SIMILARITY_THRESHOLD = float(os.getenv("DUPLICATE_SIMILARITY_THRESHOLD", "0.5"))  # 相似片名的 trigram 相似度下限（0~1）
+DUPLICATE_HINT_LIMIT = int(os.getenv("DUPLICATE_HINT_LIMIT", "5"))  # 求片时最多提示的相似求片数
+
+# FSM 状态存储配置
+FSM_STORAGE = os.getenv("FSM_STORAGE", "memory").strip().lower()  # memory / sql / redis
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+FSM_STATE_TTL = int(os.getenv("FSM_STATE_TTL", "86400"))  # 状态在最后一次写入后的保留时间（秒），0 表示永不过期
+FSM_FLUSH_INTERVAL = float(os.getenv("FSM_FLUSH_INTERVAL", "1"))  # SQL 存储的写回间隔（秒）
+FSM_CLEANUP_INTERVAL = float(os.getenv("FSM_CLEANUP_INTERVAL", "3600"))  # SQL 存储的过期清理间隔（秒）
+
+# 群发配置
+BROADCAST_CONCURRENCY = int(os.getenv("BROADCAST_CONCURRENCY", "20"))  # 群发并发数
+BROADCAST_BATCH_SIZE = 500  # 每批读取的用户数（每批完成后持久化进度）
+BROADCAST_MAX_RETRIES = 3  # 临时错误的最大重试次数
+BROADCAST_PROGRESS_INTERVAL = 5  # 进度消息刷新间隔（秒）
+
+# 频道同步配置（发件箱投递）
+CHANNEL_SYNC_MAX_ATTEMPTS = int(os.getenv("CHANNEL_SYNC_MAX_ATTEMPTS", "8"))  # 单个频道的最大投递次数，超过后标记为失败
+CHANNEL_SYNC_RETRY_BASE = float(os.getenv("CHANNEL_SYNC_RETRY_BASE", "30"))  # 首次重试的等待时间（秒），之后每次翻倍
+CHANNEL_SYNC_RETRY_MAX = 3600  # 重试等待时间上限（秒）
+CHANNEL_SYNC_BATCH_SIZE = 20  # 每次领取的待投递记录数（停止时需等待这一批发完）
+CHANNEL_SYNC_POLL_INTERVAL = 60  # 没有新记录时检查到期重试的最长间隔（秒）
+
+# 出站请求限速配置（Telegram 限制：全局约 30 条/秒，单个私聊约 1 条/秒，群组/频道约 20 条/分钟）
+OUTGOING_GLOBAL_RATE = float(os.getenv("OUTGOING_GLOBAL_RATE", "30"))
+OUTGOING_PRIVATE_RATE = 1.0  # 单个私聊每秒条数（对用户操作的直接响应不排队，但计入）
+OUTGOING_PRIVATE_BURST = 5  # 单个私聊允许的突发条数（如一次发送一页媒体）
+OUTGOING_GROUP_RATE_PER_MINUTE = 20.0  # 单个群组/频道每分钟条数
+OUTGOING_GROUP_BURST = 3  # 单个群组/频道允许的突发条数
+OUTGOING_MAX_RETRIES = 3  # 429 透明重试次数
+
+# 随机图片池配置
+IMAGE_USAGE_FLUSH_INTERVAL = float(os.getenv("IMAGE_USAGE_FLUSH_INTERVAL", "30"))  # 图片使用次数批量写回间隔（秒）
+IMAGE_POOL_WEIGHTING = os.getenv("IMAGE_POOL_WEIGHTING", "uniform").strip().lower()  # uniform（均匀）/ least_used（少用优先）/ recent（新图优先）
+IMAGE_POOL_RECENT_HALF_LIFE_DAYS = float(os.getenv("IMAGE_POOL_RECENT_HALF_LIFE_DAYS", "30"))  # recent 模式下权重减半所需天数
+IMAGE_SESSION_CACHE_SIZE = int(os.getenv("IMAGE_SESSION_CACHE_SIZE", "10000"))  # 用户会话图片缓存容量（LRU）
+
+# 图片 file_id 缓存配置
+# 启动时预热图片用的聊天（图片发出后立即删除），可设为私有频道ID；默认使用超管私聊，设为 0 关闭预热
+_image_warm_up_chat_raw = os.getenv("IMAGE_WARM_UP_CHAT_ID", "").strip()
+if not _image_warm_up_chat_raw:
+    IMAGE_WARM_UP_CHAT_ID = SUPERADMIN_ID
+elif _image_warm_up_chat_raw == "0":
+    IMAGE_WARM_UP_CHAT_ID = None
+else:
+    IMAGE_WARM_UP_CHAT_ID = _image_warm_up_chat_raw
\ No newline at end of file
@@ -1,5 +1,3 @@
-import random
-
 # 随机图片配置
 # 主面板每次唤起时随机选择一张图片，编辑操作在同一张图片上进行
 
@@ -19,27 +17,24 @@ IMAGE_LIST = [
     # "",
 ]
 
-# 当前会话使用的图片URL（每次/start时随机选择）
-CURRENT_WELCOME_IMAGE = None
-
+# 以上为内置图片：init_db 时写入图片库（image_library），图片库中没有启用的图片时也用作兜底
+# 随机取图与用户会话图片由随机图片池（app/utils/image_pool.py）统一管理
 
-# 用户会话图片缓存
-user_session_images = {}
 
 def get_random_image() -> str:
-    """从图片列表中随机选择一张图片"""
-    return random.choice(IMAGE_LIST)
+    """从图片池中随机选择一张图片"""
+    from app.utils.image_pool import image_pool
+    return image_pool.random()
 
 def get_user_session_image(user_id: int) -> str:
     """获取用户会话的图片（如果没有则随机选择一张）"""
-    if user_id not in user_session_images:
-        user_session_images[user_id] = get_random_image()
-    return user_session_images[user_id]
+    from app.utils.image_pool import image_pool
+    return image_pool.session_image(user_id)
 
 def refresh_user_session_image(user_id: int) -> str:
     """刷新用户会话图片（重新随机选择）"""
-    user_session_images[user_id] = get_random_image()
-    return user_session_images[user_id]
+    from app.utils.image_pool import image_pool
+    return image_pool.refresh_session(user_id)
 
 def get_welcome_image(user_id: int = None) -> str:
     """获取欢迎图片"""
@@ -69,33 +64,17 @@ DEFAULT_WELCOME_PHOTO = IMAGE_LIST[0]
 # 图片信息显示函数
 def get_image_info() -> dict:
     """获取图片配置信息"""
+    from app.utils.image_pool import image_pool
+    image_list = image_pool.urls()
     return {
-        'image_list': IMAGE_LIST,
-        'total_images': len(IMAGE_LIST),
-        'description': '主面板随机图片系统',
-        'active_sessions': len(user_session_images)
+        'image_list': image_list,
+        'total_images': len(image_list),
+        'from_library': image_pool.from_library,
+        'description': '主面板随机图片系统（图片库）' if image_pool.from_library else '主面板随机图片系统（内置图片）',
+        'active_sessions': image_pool.session_count
     }
 
-# 图片管理函数
-def add_image(url: str) -> bool:
-    """添加图片到列表"""
-    if url not in IMAGE_LIST:
-        IMAGE_LIST.append(url)
-        return True
-    return False
-
-def remove_image(url: str) -> bool:
-    """从列表中移除图片"""
-    if url in IMAGE_LIST and len(IMAGE_LIST) > 1:  # 至少保留一张图片
-        IMAGE_LIST.remove(url)
-        # 清除使用了该图片的会话缓存
-        for user_id in list(user_session_images.keys()):
-            if user_session_images[user_id] == url:
-                user_session_images[user_id] = get_random_image()
-        return True
-    return False
-
-def clear_all_sessions():
+def clear_all_sessions() -> int:
     """清除所有用户会话图片缓存"""
-    global user_session_images
-    user_session_images = {}
\ No newline at end of file
+    from app.utils.image_pool import image_pool
+    return image_pool.clear_sessions()
@@ -0,0 +1,99 @@
+"""
+用户活跃度写回缓冲模块
+在内存中按 chat_id 聚合活跃时间、消息/命令计数与行为数据，
+由后台任务定期（或积压达到阈值时）以一次 executemany 批量写回数据库，
+避免每条消息产生多次独立的 UPDATE。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import update, bindparam, func
+
+from app.database.schema import User
+from app.database.write_behind import WriteBehindAggregator
+from app.config.config import ACTIVITY_FLUSH_INTERVAL, ACTIVITY_FLUSH_MAX_PENDING
+
+
+@dataclass
+class _PendingActivity:
+    """单个用户尚未写回的活跃数据"""
+    last_activity_at: datetime
+    messages: int = 0
+    commands: int = 0
+    last_command: Optional[str] = None
+    active_hour: Optional[int] = None
+
+    def merge(self, other: "_PendingActivity") -> None:
+        """合并另一份（更早的）待写数据，用于写回失败后的回填"""
+        self.last_activity_at = max(self.last_activity_at, other.last_activity_at)
+        self.messages += other.messages
+        self.commands += other.commands
+        if self.last_command is None:
+            self.last_command = other.last_command
+        if self.active_hour is None:
+            self.active_hour = other.active_hour
+
+
+_users = User.__table__
+
+# 计数为增量累加；last_command / most_active_hour 为空时保留原值
+_flush_stmt = (
+    update(_users)
+    .where(_users.c.chat_id == bindparam("b_chat_id"))
+    .values(
+        last_activity_at=bindparam("b_last_activity_at"),
+        total_messages=_users.c.total_messages + bindparam("b_messages"),
+        total_commands=_users.c.total_commands + bindparam("b_commands"),
+        last_command=func.coalesce(bindparam("b_last_command"), _users.c.last_command),
+        most_active_hour=func.coalesce(bindparam("b_active_hour"), _users.c.most_active_hour),
+    )
+)
+
+
+class ActivityAggregator(WriteBehindAggregator):
+    """用户活跃度聚合器（write-behind）"""
+
+    flush_stmt = _flush_stmt
+    label = "活跃数据"
+    unit = "个用户"
+
+    def __init__(self, flush_interval: float = ACTIVITY_FLUSH_INTERVAL, max_pending: int = ACTIVITY_FLUSH_MAX_PENDING):
+        super().__init__(flush_interval, max_pending)
+
+    def record(self, chat_id: int, command: Optional[str] = None) -> None:
+        """
+        记录一次消息活动（纯内存操作）
+
+        Args:
+            chat_id: 用户聊天ID
+            command: 命令消息的命令名（如 /start），普通消息为 None
+        """
+        now = datetime.now()
+        entry = self._pending.get(chat_id)
+        if entry is None:
+            entry = self._pending[chat_id] = _PendingActivity(last_activity_at=now)
+
+        entry.last_activity_at = now
+        entry.messages += 1
+        entry.active_hour = now.hour
+        if command:
+            entry.commands += 1
+            entry.last_command = command
+
+        self._recorded()
+
+    def _params(self, chat_id: int, entry: _PendingActivity) -> dict:
+        return {
+            "b_chat_id": chat_id,
+            "b_last_activity_at": entry.last_activity_at,
+            "b_messages": entry.messages,
+            "b_commands": entry.commands,
+            "b_last_command": entry.last_command,
+            "b_active_hour": entry.active_hour,
+        }
+
+
+# 全局实例
+activity_aggregator = ActivityAggregator()
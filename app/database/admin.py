@@ -1,7 +1,8 @@
 from sqlalchemy import select, delete, func
 
 from app.database.schema import User
-from app.database.db import get_db
+from app.database.db import get_db, on_commit
+from app.database.users import known_user_cache, invalidate_role_cache
 from loguru import logger
 
 
@@ -44,14 +45,53 @@ async def get_all_users_id() -> list[int]:
             return []
 
 
+async def get_users_id_batch(after_chat_id: int | None = None, limit: int = 500) -> list[int]:
+    """按 chat_id 升序获取一批用户ID（游标分页，用于群发）。"""
+    async for session in get_db():
+        try:
+            query = select(User.chat_id).order_by(User.chat_id).limit(limit)
+            if after_chat_id is not None:
+                query = query.where(User.chat_id > after_chat_id)
+            result = await session.execute(query)
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(e)
+            await session.rollback()
+            return []
+
+
+def _forget_users(chat_ids: list[int]) -> None:
+    """从已知用户与角色缓存中移除已删除的用户"""
+    for chat_id in chat_ids:
+        known_user_cache.forget(chat_id)
+        invalidate_role_cache(chat_id)
+
+
 async def remove_user(chat_id: int) -> bool:
     """按 chat_id 删除用户。"""
     async for session in get_db():
         try:
             await session.execute(delete(User).filter_by(chat_id=chat_id))
             await session.commit()
+            on_commit(session, lambda: _forget_users([chat_id]))
             return True
         except Exception as e:
             logger.error(e)
             await session.rollback()
             return False
+
+
+async def remove_users(chat_ids: list[int]) -> int:
+    """按 chat_id 批量删除用户，返回删除数量。"""
+    if not chat_ids:
+        return 0
+    async for session in get_db():
+        try:
+            result = await session.execute(delete(User).where(User.chat_id.in_(chat_ids)))
+            await session.commit()
+            on_commit(session, lambda: _forget_users(chat_ids))
+            return result.rowcount
+        except Exception as e:
+            logger.error(e)
+            await session.rollback()
+            return 0
@@ -0,0 +1,65 @@
+"""
+群发任务数据库操作模块
+保存群发任务及其进度，进程重启后可从游标处继续发送
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select, update
+from loguru import logger
+
+from app.database.db import get_db
+from app.database.schema import BroadcastJob
+
+
+async def create_broadcast_job(admin_id: int, from_chat_id: int, message_id: int, total: int) -> Optional[BroadcastJob]:
+    """创建群发任务"""
+    async for session in get_db():
+        try:
+            job = BroadcastJob(
+                admin_id=admin_id,
+                from_chat_id=from_chat_id,
+                message_id=message_id,
+                status="running",
+                total=total
+            )
+            session.add(job)
+            await session.commit()
+            await session.refresh(job)
+            return job
+        except Exception as e:
+            logger.error(f"创建群发任务失败: {e}")
+            await session.rollback()
+            return None
+
+
+async def get_running_broadcast_jobs() -> List[BroadcastJob]:
+    """获取未完成的群发任务（用于启动时恢复）"""
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                select(BroadcastJob)
+                .where(BroadcastJob.status == "running")
+                .order_by(BroadcastJob.id)
+            )
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"获取未完成群发任务失败: {e}")
+            return []
+
+
+async def update_broadcast_job(job_id: int, **values) -> bool:
+    """更新群发任务的进度或状态"""
+    async for session in get_db():
+        try:
+            values['updated_at'] = datetime.now()
+            result = await session.execute(
+                update(BroadcastJob).where(BroadcastJob.id == job_id).values(**values)
+            )
+            await session.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            logger.error(f"更新群发任务失败: {e}")
+            await session.rollback()
+            return False
@@ -1,16 +1,23 @@
-from sqlalchemy import select, delete, func, update, desc, asc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, func, update, desc, asc, and_, or_, case, true
+from sqlalchemy.orm import selectinload, aliased
 from app.database.schema import User, MovieRequest, ContentSubmission, UserFeedback, AdminAction, MovieCategory, SystemSettings, DevChangelog
-from app.database.db import get_db
+from app.database.db import get_db, on_commit
+from app.database.channel_outbox import enqueue_channel_posts, notify_channel_outbox
+from app.database.count_cache import count_cache
+from app.config.config import SETTINGS_CACHE_TTL, SERVER_STATS_CACHE_TTL
 from loguru import logger
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+import asyncio
+import time
 
 
 # ==================== 管理员管理 ====================
 
 async def promote_user_to_admin(admin_id: int, target_id: int) -> bool:
     """提升用户为管理员"""
+    from app.database.users import invalidate_role_cache
+    
     async for session in get_db():
         try:
             # 更新用户角色
@@ -28,6 +35,8 @@ async def promote_user_to_admin(admin_id: int, target_id: int) -> bool:
             session.add(action)
             
             await session.commit()
+            on_commit(session, lambda: invalidate_role_cache(target_id))
+            on_commit(session, invalidate_server_stats)
             return result.rowcount > 0
         except Exception as e:
             logger.error(f"提升管理员失败: {e}")
@@ -37,48 +46,153 @@ async def promote_user_to_admin(admin_id: int, target_id: int) -> bool:
 
 # ==================== 高级浏览功能 ====================
 
+def _is_nullable(column) -> bool:
+    """排序字段是否可为空"""
+    return bool(getattr(column.expression, "nullable", True))
+
+
+def _seek_condition(sort_column, id_column, cursor: tuple, forward: bool):
+    """
+    构建游标条件：取排序键 (sort_column, id) 位于游标之后（forward）或之前的行。
+
+    写成 col >= v AND (col > v OR id > last) 的形式，索引可以直接定位到游标处；
+    写成 col > v OR (col = v AND id > last) 时 SQLite 只能从索引开头逐行扫描，越往后翻越慢。
+    可为空的排序字段中 NULL 视为最小值（升序时排在最前）。
+    """
+    value, last_id = cursor
+    if value is None:
+        # 游标位于 NULL 段（只有可为空的排序字段会出现）
+        if forward:
+            return or_(and_(sort_column.is_(None), id_column > last_id), sort_column.isnot(None))
+        return and_(sort_column.is_(None), id_column < last_id)
+    if forward:
+        return and_(sort_column >= value, or_(sort_column > value, id_column > last_id))
+    seek = and_(sort_column <= value, or_(sort_column < value, id_column < last_id))
+    if _is_nullable(sort_column):
+        return or_(seek, sort_column.is_(None))
+    return seek
+
+
+def advanced_count_query(model, conditions: list):
+    """高级浏览的总数查询"""
+    return select(func.count(model.id)).where(*conditions)
+
+
+def _sort_column(model, sort_field: str):
+    """高级浏览的排序字段（未知字段按创建时间排序）"""
+    sort_column = getattr(model, sort_field, None)
+    return model.created_at if sort_column is None else sort_column
+
+
+def advanced_browse_query(
+    model,
+    conditions: list,
+    sort_field: str = "created_at",
+    sort_order: str = "asc",
+    cursor: Optional[tuple] = None,
+    direction: str = "next",
+    options: tuple = ()
+):
+    """
+    高级浏览的分页查询（不含 offset / limit）
+
+    direction 为 "prev" / "last" 时按反方向排序，取出后需翻转；传入 cursor 时只取游标方向上的行。
+    只有可为空的排序字段才指定 NULL 的排列位置，非空字段的排序与索引顺序一致。
+    """
+    sort_column = _sort_column(model, sort_field)
+    forward = (sort_order.lower() != "desc") != (direction in ("prev", "last"))
+    nullable = _is_nullable(sort_column)
+    if forward:
+        order_by = (sort_column.asc().nulls_first() if nullable else sort_column.asc(), model.id.asc())
+    else:
+        order_by = (sort_column.desc().nulls_last() if nullable else sort_column.desc(), model.id.desc())
+
+    query = select(model).options(*options).where(*conditions).order_by(*order_by)
+    if cursor is not None:
+        query = query.where(_seek_condition(sort_column, model.id, cursor, forward))
+    return query
+
+
+async def _query_advanced(
+    session,
+    model,
+    conditions: list,
+    sort_field: str,
+    sort_order: str,
+    offset: int,
+    limit: int,
+    cursor: Optional[tuple],
+    direction: str,
+    fresh_total: bool,
+    options: tuple = ()
+) -> Dict[str, Any]:
+    """
+    高级浏览通用查询
+
+    - 传入 cursor 时按 (排序字段, id) 进行游标分页，深页与首页代价相同；
+      direction 为 "next" 取游标之后的一页，"prev" 取游标之前的一页，"last" 取最后一页。
+    - 未传入 cursor 时退化为 offset 分页（首页或指定页跳转）。
+    - 总数带缓存，只有 fresh_total=True 时才重新统计。
+    """
+    sort_column = _sort_column(model, sort_field)
+
+    # 总数（缓存）
+    total_count = await count_cache.count(session, advanced_count_query(model, conditions), fresh=fresh_total)
+
+    # 上一页 / 最后一页时反向扫描，取出后再翻转
+    reverse = direction in ("prev", "last")
+    query = advanced_browse_query(model, conditions, sort_field, sort_order, cursor, direction, options)
+    if cursor is None:
+        if direction == "last":
+            remainder = total_count % limit if total_count else 0
+            limit = remainder or limit
+        else:
+            query = query.offset(offset)
+
+    # 多取一条用于判断游标方向上是否还有数据
+    result = await session.execute(query.limit(limit + 1))
+    items = list(result.scalars().all())
+    has_more = len(items) > limit
+    items = items[:limit]
+    if reverse:
+        items.reverse()
+
+    def key_of(item) -> tuple:
+        return getattr(item, sort_column.key), item.id
+
+    return {
+        'items': items,
+        'total': total_count,
+        'has_more': has_more,
+        'first_cursor': key_of(items[0]) if items else None,
+        'last_cursor': key_of(items[-1]) if items else None
+    }
+
+
 async def get_movie_requests_advanced(
     offset: int = 0,
     limit: int = 10,
     sort_field: str = "created_at",
     sort_order: str = "asc",
-    status_filter: str = None
+    status_filter: str = None,
+    cursor: tuple = None,
+    direction: str = "next",
+    fresh_total: bool = False
 ) -> Dict[str, Any]:
     """高级求片请求查询"""
     async for session in get_db():
         try:
-            # 构建基础查询
-            query = select(MovieRequest).options(selectinload(MovieRequest.category))
-            
+            conditions = []
             # 状态过滤
             if status_filter:
-                query = query.where(MovieRequest.status == status_filter)
-            
-            # 排序
-            sort_column = getattr(MovieRequest, sort_field, MovieRequest.created_at)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-            
-            # 获取总数
-            count_query = select(func.count(MovieRequest.id))
-            if status_filter:
-                count_query = count_query.where(MovieRequest.status == status_filter)
-            
-            total_result = await session.execute(count_query)
-            total_count = total_result.scalar()
-            
-            # 分页查询
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            items = result.scalars().all()
-            
-            return {
-                'items': items,
-                'total': total_count
-            }
-            
+                conditions.append(MovieRequest.status == status_filter)
+
+            return await _query_advanced(
+                session, MovieRequest, conditions, sort_field, sort_order,
+                offset, limit, cursor, direction, fresh_total,
+                options=(selectinload(MovieRequest.category),)
+            )
+
         except Exception as e:
             logger.error(f"高级求片请求查询失败: {e}")
             return {'items': [], 'total': 0}
@@ -89,43 +203,25 @@ async def get_content_submissions_advanced(
     limit: int = 10,
     sort_field: str = "created_at",
     sort_order: str = "asc",
-    status_filter: str = None
+    status_filter: str = None,
+    cursor: tuple = None,
+    direction: str = "next",
+    fresh_total: bool = False
 ) -> Dict[str, Any]:
     """高级投稿查询"""
     async for session in get_db():
         try:
-            # 构建基础查询
-            query = select(ContentSubmission).options(selectinload(ContentSubmission.category))
-            
+            conditions = []
             # 状态过滤
             if status_filter:
-                query = query.where(ContentSubmission.status == status_filter)
-            
-            # 排序
-            sort_column = getattr(ContentSubmission, sort_field, ContentSubmission.created_at)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-            
-            # 获取总数
-            count_query = select(func.count(ContentSubmission.id))
-            if status_filter:
-                count_query = count_query.where(ContentSubmission.status == status_filter)
-            
-            total_result = await session.execute(count_query)
-            total_count = total_result.scalar()
-            
-            # 分页查询
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            items = result.scalars().all()
-            
-            return {
-                'items': items,
-                'total': total_count
-            }
-            
+                conditions.append(ContentSubmission.status == status_filter)
+
+            return await _query_advanced(
+                session, ContentSubmission, conditions, sort_field, sort_order,
+                offset, limit, cursor, direction, fresh_total,
+                options=(selectinload(ContentSubmission.category),)
+            )
+
         except Exception as e:
             logger.error(f"高级投稿查询失败: {e}")
             return {'items': [], 'total': 0}
@@ -137,49 +233,27 @@ async def get_user_feedback_advanced(
     sort_field: str = "created_at",
     sort_order: str = "asc",
     status_filter: str = None,
-    type_filter: str = None
+    type_filter: str = None,
+    cursor: tuple = None,
+    direction: str = "next",
+    fresh_total: bool = False
 ) -> Dict[str, Any]:
     """高级反馈查询"""
     async for session in get_db():
         try:
-            # 构建基础查询
-            query = select(UserFeedback)
-            
+            conditions = []
             # 状态过滤
             if status_filter:
-                query = query.where(UserFeedback.status == status_filter)
-            
+                conditions.append(UserFeedback.status == status_filter)
             # 类型过滤
             if type_filter:
-                query = query.where(UserFeedback.feedback_type == type_filter)
-            
-            # 排序
-            sort_column = getattr(UserFeedback, sort_field, UserFeedback.created_at)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-            
-            # 获取总数
-            count_query = select(func.count(UserFeedback.id))
-            if status_filter:
-                count_query = count_query.where(UserFeedback.status == status_filter)
-            if type_filter:
-                count_query = count_query.where(UserFeedback.feedback_type == type_filter)
-            
-            total_result = await session.execute(count_query)
-            total_count = total_result.scalar()
-            
-            # 分页查询
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            items = result.scalars().all()
-            
-            return {
-                'items': items,
-                'total': total_count
-            }
-            
+                conditions.append(UserFeedback.feedback_type == type_filter)
+
+            return await _query_advanced(
+                session, UserFeedback, conditions, sort_field, sort_order,
+                offset, limit, cursor, direction, fresh_total
+            )
+
         except Exception as e:
             logger.error(f"高级反馈查询失败: {e}")
             return {'items': [], 'total': 0}
@@ -190,43 +264,24 @@ async def get_users_advanced(
     limit: int = 10,
     sort_field: str = "created_at",
     sort_order: str = "asc",
-    role_filter: str = None
+    role_filter: str = None,
+    cursor: tuple = None,
+    direction: str = "next",
+    fresh_total: bool = False
 ) -> Dict[str, Any]:
     """高级用户查询"""
     async for session in get_db():
         try:
-            # 构建基础查询
-            query = select(User)
-            
+            conditions = []
             # 角色过滤
             if role_filter:
-                query = query.where(User.role == role_filter)
-            
-            # 排序
-            sort_column = getattr(User, sort_field, User.created_at)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-            
-            # 获取总数
-            count_query = select(func.count(User.id))
-            if role_filter:
-                count_query = count_query.where(User.role == role_filter)
-            
-            total_result = await session.execute(count_query)
-            total_count = total_result.scalar()
-            
-            # 分页查询
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            items = result.scalars().all()
-            
-            return {
-                'items': items,
-                'total': total_count
-            }
-            
+                conditions.append(User.role == role_filter)
+
+            return await _query_advanced(
+                session, User, conditions, sort_field, sort_order,
+                offset, limit, cursor, direction, fresh_total
+            )
+
         except Exception as e:
             logger.error(f"高级用户查询失败: {e}")
             return {'items': [], 'total': 0}
@@ -238,49 +293,27 @@ async def get_admin_actions_advanced(
     sort_field: str = "created_at",
     sort_order: str = "asc",
     action_type_filter: str = None,
-    admin_id_filter: int = None
+    admin_id_filter: int = None,
+    cursor: tuple = None,
+    direction: str = "next",
+    fresh_total: bool = False
 ) -> Dict[str, Any]:
     """高级管理员操作记录查询"""
     async for session in get_db():
         try:
-            # 构建基础查询
-            query = select(AdminAction)
-            
+            conditions = []
             # 操作类型过滤
             if action_type_filter:
-                query = query.where(AdminAction.action_type == action_type_filter)
-            
+                conditions.append(AdminAction.action_type == action_type_filter)
             # 管理员过滤
             if admin_id_filter:
-                query = query.where(AdminAction.admin_id == admin_id_filter)
-            
-            # 排序
-            sort_column = getattr(AdminAction, sort_field, AdminAction.created_at)
-            if sort_order.lower() == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
-            
-            # 获取总数
-            count_query = select(func.count(AdminAction.id))
-            if action_type_filter:
-                count_query = count_query.where(AdminAction.action_type == action_type_filter)
-            if admin_id_filter:
-                count_query = count_query.where(AdminAction.admin_id == admin_id_filter)
-            
-            total_result = await session.execute(count_query)
-            total_count = total_result.scalar()
-            
-            # 分页查询
-            query = query.offset(offset).limit(limit)
-            result = await session.execute(query)
-            items = result.scalars().all()
-            
-            return {
-                'items': items,
-                'total': total_count
-            }
-            
+                conditions.append(AdminAction.admin_id == admin_id_filter)
+
+            return await _query_advanced(
+                session, AdminAction, conditions, sort_field, sort_order,
+                offset, limit, cursor, direction, fresh_total
+            )
+
         except Exception as e:
             logger.error(f"高级管理员操作记录查询失败: {e}")
             return {'items': [], 'total': 0}
@@ -288,6 +321,8 @@ async def get_admin_actions_advanced(
 
 async def demote_admin_to_user(admin_id: int, target_id: int) -> bool:
     """降级管理员为普通用户"""
+    from app.database.users import invalidate_role_cache
+    
     async for session in get_db():
         try:
             # 更新用户角色
@@ -305,6 +340,8 @@ async def demote_admin_to_user(admin_id: int, target_id: int) -> bool:
             session.add(action)
             
             await session.commit()
+            on_commit(session, lambda: invalidate_role_cache(target_id))
+            on_commit(session, invalidate_server_stats)
             return result.rowcount > 0
         except Exception as e:
             logger.error(f"降级管理员失败: {e}")
@@ -330,18 +367,25 @@ async def get_admin_list() -> List[User]:
 async def create_movie_request(user_id: int, category_id: int, title: str, description: str = None, file_id: str = None) -> bool:
     """创建求片请求"""
     from app.database.users import update_user_stats
+    from app.database.duplicates import normalize_title, add_title_trigrams
     
     async for session in get_db():
         try:
+            normalized_title = normalize_title(title)
             request = MovieRequest(
                 user_id=user_id,
                 category_id=category_id,
                 title=title,
+                normalized_title=normalized_title,
                 description=description,
                 file_id=file_id
             )
             session.add(request)
+            await session.flush()
+            # 相似片名索引与求片在同一事务中写入
+            add_title_trigrams(session, request.id, normalized_title)
             await session.commit()
+            on_commit(session, lambda: _bump_server_stats(total_requests=1, pending_requests=1))
             
             # 更新用户求片统计
             await update_user_stats(user_id, 'requests')
@@ -353,16 +397,57 @@ async def create_movie_request(user_id: int, category_id: int, title: str, descr
             return False
 
 
+def user_movie_requests_query(user_id: int):
+    """用户求片请求查询（新的在前，可直接交给 QueryPaginator 分页）"""
+    return (
+        select(MovieRequest)
+        .options(selectinload(MovieRequest.category))
+        .where(MovieRequest.user_id == user_id)
+        .order_by(MovieRequest.created_at.desc(), MovieRequest.id.desc())
+    )
+
+
+def pending_movie_requests_query():
+    """
+    待审核求片请求查询（早的在前）
+
+    归一化片名相同的求片只列出最早的一条，其余在列表中显示为它的重复项，审核通过时一并处理
+    """
+    earlier = aliased(MovieRequest)
+    has_earlier_duplicate = (
+        select(earlier.id)
+        .where(
+            earlier.normalized_title == MovieRequest.normalized_title,
+            earlier.status == "pending",
+            earlier.id < MovieRequest.id
+        )
+        .exists()
+    )
+    return (
+        select(MovieRequest)
+        .options(selectinload(MovieRequest.category))
+        .where(
+            MovieRequest.status == "pending",
+            or_(MovieRequest.normalized_title.is_(None), ~has_earlier_duplicate)
+        )
+        .order_by(MovieRequest.created_at.asc(), MovieRequest.id.asc())
+    )
+
+
+def all_movie_requests_query():
+    """全部求片请求查询（新的在前）"""
+    return (
+        select(MovieRequest)
+        .options(selectinload(MovieRequest.category))
+        .order_by(MovieRequest.created_at.desc(), MovieRequest.id.desc())
+    )
+
+
 async def get_user_movie_requests(user_id: int) -> List[MovieRequest]:
     """获取用户的求片请求"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(MovieRequest)
-                .options(selectinload(MovieRequest.category))
-                .where(MovieRequest.user_id == user_id)
-                .order_by(MovieRequest.created_at.desc())
-            )
+            result = await session.execute(user_movie_requests_query(user_id))
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取用户求片请求失败: {e}")
@@ -373,27 +458,36 @@ async def get_pending_movie_requests() -> List[MovieRequest]:
     """获取待审核的求片请求"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(MovieRequest)
-                .options(selectinload(MovieRequest.category))
-                .where(MovieRequest.status == "pending")
-                .order_by(MovieRequest.created_at.asc())
-            )
+            result = await session.execute(pending_movie_requests_query())
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取待审核求片请求失败: {e}")
             return []
 
 
+def pending_movie_requests_after_query(cursor: tuple, limit: int = 1):
+    """待审核列表中位于游标 (created_at, id) 之后的求片请求查询"""
+    return pending_movie_requests_query().where(
+        _seek_condition(MovieRequest.created_at, MovieRequest.id, cursor, True)
+    ).limit(limit)
+
+
+async def get_pending_movie_requests_after(cursor: tuple, limit: int = 1) -> List[MovieRequest]:
+    """获取待审核列表中位于游标 (created_at, id) 之后的求片请求（审核后给当前页补位）"""
+    async for session in get_db():
+        try:
+            result = await session.execute(pending_movie_requests_after_query(cursor, limit))
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"获取后续待审核求片请求失败: {e}")
+            return []
+
+
 async def get_all_movie_requests() -> List[MovieRequest]:
     """获取所有求片请求"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(MovieRequest)
-                .options(selectinload(MovieRequest.category))
-                .order_by(MovieRequest.created_at.desc())
-            )
+            result = await session.execute(all_movie_requests_query())
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取所有求片请求失败: {e}")
@@ -415,32 +509,87 @@ async def get_movie_request_by_id(request_id: int) -> Optional[MovieRequest]:
             return None
 
 
+async def _merge_duplicate_requests(session, reviewed: List[tuple], reviewer_id: int, reviewed_at: datetime, review_note: str = None) -> int:
+    """
+    审核通过后，把归一化片名相同的其他待审核求片一并通过
+
+    Args:
+        reviewed: 刚通过的 [(求片ID, 归一化片名)]，同名的多条以 ID 最小的为主求片
+
+    Returns:
+        一并通过的重复求片数
+    """
+    primaries = {}
+    for request_id, normalized_title in sorted(reviewed, key=lambda row: row[0]):
+        if normalized_title:
+            primaries.setdefault(normalized_title, request_id)
+
+    merged = 0
+    for normalized_title, request_id in primaries.items():
+        merged += (await session.execute(
+            update(MovieRequest)
+            .where(
+                MovieRequest.normalized_title == normalized_title,
+                MovieRequest.status == "pending",
+                MovieRequest.id != request_id
+            )
+            .values(
+                status="approved",
+                reviewed_at=reviewed_at,
+                reviewed_by=reviewer_id,
+                review_note=review_note,
+                duplicate_of=request_id
+            )
+        )).rowcount
+    return merged
+
+
 async def review_movie_request(request_id: int, reviewer_id: int, status: str, review_note: str = None) -> bool:
-    """审核求片请求"""
+    """
+    审核求片请求
+
+    审核通过时，归一化片名相同的其他待审核求片一并通过（duplicate_of 记为本求片ID），
+    通知见 get_merged_movie_requests
+    """
     async for session in get_db():
         try:
+            reviewed_at = datetime.now()
             result = await session.execute(
                 update(MovieRequest)
                 .where(MovieRequest.id == request_id)
                 .values(
                     status=status,
-                    reviewed_at=datetime.now(),
+                    reviewed_at=reviewed_at,
                     reviewed_by=reviewer_id,
                     review_note=review_note
                 )
             )
             
+            merged = 0
+            if status == "approved" and result.rowcount > 0:
+                normalized_title = (await session.execute(
+                    select(MovieRequest.normalized_title).where(MovieRequest.id == request_id)
+                )).scalar()
+                merged = await _merge_duplicate_requests(
+                    session, [(request_id, normalized_title)], reviewer_id, reviewed_at, review_note
+                )
+                # 频道同步与审核结果同一事务写入发件箱（重复求片只通知用户，不再同步）
+                await enqueue_channel_posts(session, "movie", [request_id])
+            
             # 记录管理员操作
             note_text = f"，备注：{review_note}" if review_note else ""
+            merged_text = f"，同时通过重复求片 {merged} 条" if merged else ""
             action = AdminAction(
                 admin_id=reviewer_id,
                 action_type="review",
                 target_id=request_id,
-                description=f"审核求片请求 {request_id}，结果：{status}{note_text}"
+                description=f"审核求片请求 {request_id}，结果：{status}{merged_text}{note_text}"
             )
             session.add(action)
             
             await session.commit()
+            on_commit(session, invalidate_server_stats)
+            on_commit(session, notify_channel_outbox)
             return result.rowcount > 0
         except Exception as e:
             logger.error(f"审核求片请求失败: {e}")
@@ -448,6 +597,100 @@ async def review_movie_request(request_id: int, reviewer_id: int, status: str, r
             return False
 
 
+async def review_movie_requests(request_ids: List[int], reviewer_id: int, status: str, review_note: str = None) -> List[int]:
+    """
+    批量审核求片请求（一个事务、一条 UPDATE），只处理仍待审核的求片
+
+    Returns:
+        实际审核的求片ID（不含一并通过的重复求片）
+    """
+    if not request_ids:
+        return []
+    
+    async for session in get_db():
+        try:
+            reviewed_at = datetime.now()
+            result = await session.execute(
+                update(MovieRequest)
+                .where(MovieRequest.id.in_(request_ids), MovieRequest.status == "pending")
+                .values(
+                    status=status,
+                    reviewed_at=reviewed_at,
+                    reviewed_by=reviewer_id,
+                    review_note=review_note
+                )
+                .returning(MovieRequest.id, MovieRequest.normalized_title)
+            )
+            reviewed = [tuple(row) for row in result.all()]
+            
+            merged = 0
+            if status == "approved":
+                merged = await _merge_duplicate_requests(session, reviewed, reviewer_id, reviewed_at, review_note)
+                await enqueue_channel_posts(session, "movie", [request_id for request_id, _ in reviewed])
+            
+            # 记录管理员操作（每条求片一条记录，与单条审核一致）
+            note_text = f"，备注：{review_note}" if review_note else ""
+            session.add_all(
+                AdminAction(
+                    admin_id=reviewer_id,
+                    action_type="review",
+                    target_id=request_id,
+                    description=f"批量审核求片请求 {request_id}，结果：{status}{note_text}"
+                )
+                for request_id, _ in reviewed
+            )
+            
+            await session.commit()
+            on_commit(session, invalidate_server_stats)
+            on_commit(session, notify_channel_outbox)
+            if merged:
+                logger.info(f"批量审核求片 {len(reviewed)} 条，同时通过重复求片 {merged} 条")
+            return sorted(request_id for request_id, _ in reviewed)
+        except Exception as e:
+            logger.error(f"批量审核求片请求失败: {e}")
+            await session.rollback()
+            return []
+
+
+async def get_movie_requests_by_ids(request_ids: List[int]) -> List[MovieRequest]:
+    """按ID批量获取求片请求（含类型）"""
+    if not request_ids:
+        return []
+    
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                select(MovieRequest)
+                .options(selectinload(MovieRequest.category))
+                .where(MovieRequest.id.in_(request_ids))
+                .order_by(MovieRequest.id.asc())
+            )
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"批量获取求片请求失败: {e}")
+            return []
+
+
+async def get_merged_movie_requests(request_id: int) -> List[MovieRequest]:
+    """获取随指定求片一并审核的重复求片"""
+    async for session in get_db():
+        try:
+            normalized_title = (
+                select(MovieRequest.normalized_title)
+                .where(MovieRequest.id == request_id)
+                .scalar_subquery()
+            )
+            result = await session.execute(
+                select(MovieRequest)
+                .where(MovieRequest.normalized_title == normalized_title, MovieRequest.duplicate_of == request_id)
+                .order_by(MovieRequest.id.asc())
+            )
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"获取重复求片失败: {e}")
+            return []
+
+
 # ==================== 内容投稿 ====================
 
 async def create_content_submission(user_id: int, title: str, content: str, file_id: str = None, category_id: int = None) -> bool:
@@ -465,6 +708,7 @@ async def create_content_submission(user_id: int, title: str, content: str, file
             )
             session.add(submission)
             await session.commit()
+            on_commit(session, lambda: _bump_server_stats(total_submissions=1, pending_submissions=1))
             
             # 更新用户投稿统计
             await update_user_stats(user_id, 'submissions')
@@ -476,16 +720,40 @@ async def create_content_submission(user_id: int, title: str, content: str, file
             return False
 
 
+def user_content_submissions_query(user_id: int):
+    """用户内容投稿查询（新的在前，可直接交给 QueryPaginator 分页）"""
+    return (
+        select(ContentSubmission)
+        .options(selectinload(ContentSubmission.category))
+        .where(ContentSubmission.user_id == user_id)
+        .order_by(ContentSubmission.created_at.desc(), ContentSubmission.id.desc())
+    )
+
+
+def pending_content_submissions_query():
+    """待审核内容投稿查询（早的在前）"""
+    return (
+        select(ContentSubmission)
+        .options(selectinload(ContentSubmission.category))
+        .where(ContentSubmission.status == "pending")
+        .order_by(ContentSubmission.created_at.asc(), ContentSubmission.id.asc())
+    )
+
+
+def all_content_submissions_query():
+    """全部内容投稿查询（新的在前）"""
+    return (
+        select(ContentSubmission)
+        .options(selectinload(ContentSubmission.category))
+        .order_by(ContentSubmission.created_at.desc(), ContentSubmission.id.desc())
+    )
+
+
 async def get_user_content_submissions(user_id: int) -> List[ContentSubmission]:
     """获取用户的内容投稿"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(ContentSubmission)
-                .options(selectinload(ContentSubmission.category))
-                .where(ContentSubmission.user_id == user_id)
-                .order_by(ContentSubmission.created_at.desc())
-            )
+            result = await session.execute(user_content_submissions_query(user_id))
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取用户内容投稿失败: {e}")
@@ -496,27 +764,36 @@ async def get_pending_content_submissions() -> List[ContentSubmission]:
     """获取待审核的内容投稿"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(ContentSubmission)
-                .options(selectinload(ContentSubmission.category))
-                .where(ContentSubmission.status == "pending")
-                .order_by(ContentSubmission.created_at.asc())
-            )
+            result = await session.execute(pending_content_submissions_query())
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取待审核内容投稿失败: {e}")
             return []
 
 
+def pending_content_submissions_after_query(cursor: tuple, limit: int = 1):
+    """待审核列表中位于游标 (created_at, id) 之后的内容投稿查询"""
+    return pending_content_submissions_query().where(
+        _seek_condition(ContentSubmission.created_at, ContentSubmission.id, cursor, True)
+    ).limit(limit)
+
+
+async def get_pending_content_submissions_after(cursor: tuple, limit: int = 1) -> List[ContentSubmission]:
+    """获取待审核列表中位于游标 (created_at, id) 之后的内容投稿（审核后给当前页补位）"""
+    async for session in get_db():
+        try:
+            result = await session.execute(pending_content_submissions_after_query(cursor, limit))
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"获取后续待审核内容投稿失败: {e}")
+            return []
+
+
 async def get_all_content_submissions() -> List[ContentSubmission]:
     """获取所有内容投稿"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(ContentSubmission)
-                .options(selectinload(ContentSubmission.category))
-                .order_by(ContentSubmission.created_at.desc())
-            )
+            result = await session.execute(all_content_submissions_query())
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取所有内容投稿失败: {e}")
@@ -551,6 +828,8 @@ async def review_content_submission(submission_id: int, reviewer_id: int, status
                     review_note=review_note
                 )
             )
+            if status == "approved" and result.rowcount > 0:
+                await enqueue_channel_posts(session, "content", [submission_id])
             
             # 记录管理员操作
             note_text = f"，备注：{review_note}" if review_note else ""
@@ -563,6 +842,8 @@ async def review_content_submission(submission_id: int, reviewer_id: int, status
             session.add(action)
             
             await session.commit()
+            on_commit(session, invalidate_server_stats)
+            on_commit(session, notify_channel_outbox)
             return result.rowcount > 0
         except Exception as e:
             logger.error(f"审核内容投稿失败: {e}")
@@ -570,6 +851,74 @@ async def review_content_submission(submission_id: int, reviewer_id: int, status
             return False
 
 
+async def review_content_submissions(submission_ids: List[int], reviewer_id: int, status: str, review_note: str = None) -> List[int]:
+    """
+    批量审核内容投稿（一个事务、一条 UPDATE），只处理仍待审核的投稿
+
+    Returns:
+        实际审核的投稿ID
+    """
+    if not submission_ids:
+        return []
+    
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                update(ContentSubmission)
+                .where(ContentSubmission.id.in_(submission_ids), ContentSubmission.status == "pending")
+                .values(
+                    status=status,
+                    reviewed_at=datetime.now(),
+                    reviewed_by=reviewer_id,
+                    review_note=review_note
+                )
+                .returning(ContentSubmission.id)
+            )
+            reviewed = sorted(result.scalars().all())
+            if status == "approved":
+                await enqueue_channel_posts(session, "content", reviewed)
+            
+            # 记录管理员操作（每条投稿一条记录，与单条审核一致）
+            note_text = f"，备注：{review_note}" if review_note else ""
+            session.add_all(
+                AdminAction(
+                    admin_id=reviewer_id,
+                    action_type="review",
+                    target_id=submission_id,
+                    description=f"批量审核内容投稿 {submission_id}，结果：{status}{note_text}"
+                )
+                for submission_id in reviewed
+            )
+            
+            await session.commit()
+            on_commit(session, invalidate_server_stats)
+            on_commit(session, notify_channel_outbox)
+            return reviewed
+        except Exception as e:
+            logger.error(f"批量审核内容投稿失败: {e}")
+            await session.rollback()
+            return []
+
+
+async def get_content_submissions_by_ids(submission_ids: List[int]) -> List[ContentSubmission]:
+    """按ID批量获取内容投稿（含类型）"""
+    if not submission_ids:
+        return []
+    
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                select(ContentSubmission)
+                .options(selectinload(ContentSubmission.category))
+                .where(ContentSubmission.id.in_(submission_ids))
+                .order_by(ContentSubmission.id.asc())
+            )
+            return result.scalars().all()
+        except Exception as e:
+            logger.error(f"批量获取内容投稿失败: {e}")
+            return []
+
+
 # ==================== 用户反馈 ====================
 
 async def create_user_feedback(user_id: int, feedback_type: str, content: str) -> bool:
@@ -585,6 +934,7 @@ async def create_user_feedback(user_id: int, feedback_type: str, content: str) -
             )
             session.add(feedback)
             await session.commit()
+            on_commit(session, lambda: _bump_server_stats(total_feedback=1, pending_feedback=1))
             
             # 更新用户反馈统计
             await update_user_stats(user_id, 'feedback')
@@ -596,14 +946,21 @@ async def create_user_feedback(user_id: int, feedback_type: str, content: str) -
             return False
 
 
+def user_feedback_query(user_id: int):
+    """用户的反馈查询（新的在前）"""
+    return select(UserFeedback).where(UserFeedback.user_id == user_id).order_by(UserFeedback.created_at.desc())
+
+
+def all_feedback_query():
+    """全部反馈查询（新的在前）"""
+    return select(UserFeedback).order_by(UserFeedback.created_at.desc())
+
+
 async def get_user_feedback_list(user_id: int) -> List[UserFeedback]:
     """获取用户的反馈列表"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(UserFeedback).where(UserFeedback.user_id == user_id)
-                .order_by(UserFeedback.created_at.desc())
-            )
+            result = await session.execute(user_feedback_query(user_id))
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取用户反馈列表失败: {e}")
@@ -614,9 +971,7 @@ async def get_all_feedback_list() -> List[UserFeedback]:
     """获取所有反馈列表（管理员用）"""
     async for session in get_db():
         try:
-            result = await session.execute(
-                select(UserFeedback).order_by(UserFeedback.created_at.desc())
-            )
+            result = await session.execute(all_feedback_query())
             return result.scalars().all()
         except Exception as e:
             logger.error(f"获取所有反馈列表失败: {e}")
@@ -648,6 +1003,7 @@ async def reply_user_feedback(feedback_id: int, admin_id: int, reply_content: st
             session.add(action)
             
             await session.commit()
+            on_commit(session, invalidate_server_stats)
             return result.rowcount > 0
         except Exception as e:
             logger.error(f"回复用户反馈失败: {e}")
@@ -657,59 +1013,85 @@ async def reply_user_feedback(feedback_id: int, admin_id: int, reply_content: st
 
 # ==================== 统计信息 ====================
 
+# 服务器统计缓存：短 TTL + 单飞刷新，同一时刻最多一个协程执行统计查询。
+# 本进程内的新建操作直接累加到缓存上，审核等改变待审核数的操作使缓存失效。
+_server_stats: Optional[dict] = None
+_server_stats_at: float = 0.0
+_server_stats_lock = asyncio.Lock()
+
+
+def invalidate_server_stats() -> None:
+    """使服务器统计缓存失效，下次读取时重新统计"""
+    global _server_stats
+    _server_stats = None
+
+
+def _bump_server_stats(**deltas: int) -> None:
+    """按增量更新已缓存的统计值（缓存为空时无需处理，下次读取会重新统计）"""
+    if _server_stats is None:
+        return
+    for key, delta in deltas.items():
+        _server_stats[key] = _server_stats.get(key, 0) + delta
+
+
+def _count_with_pending(model, pending_column, pending_value: str):
+    """单表统计子查询：总数 + 满足条件的行数"""
+    return select(
+        func.count().label("total"),
+        func.coalesce(func.sum(case((pending_column == pending_value, 1), else_=0)), 0).label("matched")
+    ).select_from(model).subquery()
+
+
+async def _query_server_stats(session) -> dict:
+    """一次查询统计全部数据（每张表一个条件聚合子查询）"""
+    users = _count_with_pending(User, User.role, "admin")
+    requests = _count_with_pending(MovieRequest, MovieRequest.status, "pending")
+    submissions = _count_with_pending(ContentSubmission, ContentSubmission.status, "pending")
+    feedback = _count_with_pending(UserFeedback, UserFeedback.status, "pending")
+    
+    result = await session.execute(
+        select(
+            users.c.total, users.c.matched,
+            requests.c.total, requests.c.matched,
+            submissions.c.total, submissions.c.matched,
+            feedback.c.total, feedback.c.matched
+        )
+        # 各子查询都只有一行，显式交叉连接
+        .select_from(users.join(requests, true()).join(submissions, true()).join(feedback, true()))
+    )
+    row = result.one()
+    return {
+        "total_users": row[0],
+        "total_admins": row[1],
+        "total_requests": row[2],
+        "pending_requests": row[3],
+        "total_submissions": row[4],
+        "pending_submissions": row[5],
+        "total_feedback": row[6],
+        "pending_feedback": row[7]
+    }
+
+
 async def get_server_stats() -> dict:
-    """获取服务器统计信息"""
-    async for session in get_db():
-        try:
-            # 用户统计
-            user_count = await session.execute(select(func.count()).select_from(User))
-            total_users = user_count.scalar()
-            
-            admin_count = await session.execute(
-                select(func.count()).select_from(User).where(User.role == "admin")
-            )
-            total_admins = admin_count.scalar()
-            
-            # 求片统计
-            movie_count = await session.execute(select(func.count()).select_from(MovieRequest))
-            total_requests = movie_count.scalar()
-            
-            pending_movie_count = await session.execute(
-                select(func.count()).select_from(MovieRequest).where(MovieRequest.status == "pending")
-            )
-            pending_requests = pending_movie_count.scalar()
-            
-            # 投稿统计
-            submission_count = await session.execute(select(func.count()).select_from(ContentSubmission))
-            total_submissions = submission_count.scalar()
-            
-            pending_submission_count = await session.execute(
-                select(func.count()).select_from(ContentSubmission).where(ContentSubmission.status == "pending")
-            )
-            pending_submissions = pending_submission_count.scalar()
-            
-            # 反馈统计
-            feedback_count = await session.execute(select(func.count()).select_from(UserFeedback))
-            total_feedback = feedback_count.scalar()
-            
-            pending_feedback_count = await session.execute(
-                select(func.count()).select_from(UserFeedback).where(UserFeedback.status == "pending")
-            )
-            pending_feedback = pending_feedback_count.scalar()
-            
-            return {
-                "total_users": total_users,
-                "total_admins": total_admins,
-                "total_requests": total_requests,
-                "pending_requests": pending_requests,
-                "total_submissions": total_submissions,
-                "pending_submissions": pending_submissions,
-                "total_feedback": total_feedback,
-                "pending_feedback": pending_feedback
-            }
-        except Exception as e:
-            logger.error(f"获取服务器统计信息失败: {e}")
-            return {}
+    """获取服务器统计信息（带缓存）"""
+    global _server_stats, _server_stats_at
+    
+    if _server_stats is not None and time.monotonic() - _server_stats_at < SERVER_STATS_CACHE_TTL:
+        return dict(_server_stats)
+    
+    async with _server_stats_lock:
+        # 等待锁期间可能已被其他协程刷新
+        if _server_stats is not None and time.monotonic() - _server_stats_at < SERVER_STATS_CACHE_TTL:
+            return dict(_server_stats)
+        
+        async for session in get_db():
+            try:
+                _server_stats = await _query_server_stats(session)
+                _server_stats_at = time.monotonic()
+                return dict(_server_stats)
+            except Exception as e:
+                logger.error(f"获取服务器统计信息失败: {e}")
+                return {}
 
 
 # ==================== 内容分类管理（求片和投稿共用） ====================
@@ -803,20 +1185,64 @@ async def delete_movie_category(category_id: int) -> bool:
 
 # ==================== 系统设置管理 ====================
 
-async def get_system_setting(setting_key: str, default_value: str = None) -> str:
-    """获取系统设置值"""
-    async for session in get_db():
-        try:
+# 系统设置缓存：整表常驻内存，读取不再访问数据库。
+# 版本戳由（行数, 最近修改时间, 最近创建时间）组成，每隔 SETTINGS_CACHE_TTL 秒
+# 检查一次，使共享同一数据库的多个进程在有界延迟内感知到开关变化。
+_settings_cache: Dict[str, str] = {}
+_settings_version: Optional[tuple] = None
+_settings_checked_at: float = 0.0
+_settings_lock = asyncio.Lock()
+
+
+def invalidate_settings_cache() -> None:
+    """使系统设置缓存失效，下次读取时重新加载"""
+    global _settings_version
+    _settings_version = None
+
+
+async def _load_settings_cache() -> Dict[str, str]:
+    """返回系统设置快照，必要时检查版本戳并重新加载整表"""
+    global _settings_cache, _settings_version, _settings_checked_at
+
+    if _settings_version is not None and time.monotonic() - _settings_checked_at < SETTINGS_CACHE_TTL:
+        return _settings_cache
+
+    async with _settings_lock:
+        # 等待锁期间可能已被其他协程刷新
+        if _settings_version is not None and time.monotonic() - _settings_checked_at < SETTINGS_CACHE_TTL:
+            return _settings_cache
+
+        async for session in get_db():
             result = await session.execute(
-                select(SystemSettings).where(
-                    SystemSettings.setting_key == setting_key
+                select(
+                    func.count(SystemSettings.id),
+                    func.max(SystemSettings.updated_at),
+                    func.max(SystemSettings.created_at)
                 )
             )
-            setting = result.scalar_one_or_none()
-            return setting.setting_value if setting else default_value
-        except Exception as e:
-            logger.error(f"获取系统设置失败: {e}")
-            return default_value
+            version = tuple(result.one())
+
+            if version != _settings_version:
+                result = await session.execute(
+                    select(SystemSettings.setting_key, SystemSettings.setting_value)
+                )
+                # 整体替换而非原地修改，读取方拿到的快照始终完整
+                _settings_cache = {key: value for key, value in result.all()}
+                _settings_version = version
+
+            _settings_checked_at = time.monotonic()
+
+    return _settings_cache
+
+
+async def get_system_setting(setting_key: str, default_value: str = None) -> str:
+    """获取系统设置值（优先读取内存缓存）"""
+    try:
+        settings = await _load_settings_cache()
+        return settings.get(setting_key, default_value)
+    except Exception as e:
+        logger.error(f"获取系统设置失败: {e}")
+        return default_value
 
 
 async def set_system_setting(setting_key: str, setting_value: str, setting_type: str = "boolean", description: str = None, updater_id: int = None) -> bool:
@@ -850,6 +1276,7 @@ async def set_system_setting(setting_key: str, setting_value: str, setting_type:
                 session.add(setting)
             
             await session.commit()
+            on_commit(session, invalidate_settings_cache)
             return True
         except Exception as e:
             logger.error(f"设置系统设置失败: {e}")
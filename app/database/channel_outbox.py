@@ -0,0 +1,158 @@
+"""
+频道同步发件箱数据库操作模块
+审核通过时在同一事务中为每个同步频道写入一条待投递记录，由后台任务（utils/channel_sync.py）投递。
+
+记录状态：pending（待投递）→ sending（已领取、正在发送）→ sent / failed。
+领取时先提交 sending 再发送：进程在发送途中退出时无法确认消息是否已发出，
+这类记录在下次启动时标记为 failed 而不是重发，保证不会重复发布到频道。
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import select, update, func
+from loguru import logger
+
+from app.database.db import get_db, engine
+from app.database.schema import ChannelPost
+from app.config.config import SYNC_CHANNELS
+
+# 新记录提交后的回调（投递任务注册，用于立即唤醒）
+_listeners: list = []
+
+
+def add_outbox_listener(callback) -> None:
+    """注册有新的待投递记录时的回调"""
+    _listeners.append(callback)
+
+
+def notify_channel_outbox() -> None:
+    """通知投递任务有新的待投递记录（在事务提交后调用）"""
+    for callback in _listeners:
+        callback()
+
+
+def _insert_ignore(rows: list):
+    """按数据库方言构建忽略重复记录的插入语句"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(ChannelPost.__table__).values(rows).on_conflict_do_nothing(
+        index_elements=["item_type", "item_id", "channel"]
+    )
+
+
+async def enqueue_channel_posts(session, item_type: str, item_ids: List[int]) -> None:
+    """
+    在调用方的事务中为每个同步频道写入待投递记录（未提交）
+
+    同一内容在同一频道已有记录时忽略，重复审核通过不会重复发布。
+    调用方提交后应调用 notify_channel_outbox。
+    """
+    if not SYNC_CHANNELS or not item_ids:
+        return
+    now = datetime.now()
+    rows = [
+        {
+            "item_type": item_type,
+            "item_id": item_id,
+            "channel": channel,
+            "status": "pending",
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+        }
+        for item_id in item_ids
+        for channel in SYNC_CHANNELS
+    ]
+    await session.execute(_insert_ignore(rows))
+
+
+def claim_due_posts_query(now: datetime, limit: int):
+    """领取到期待投递记录的 UPDATE ... RETURNING 语句"""
+    due_ids = (
+        select(ChannelPost.id)
+        .where(ChannelPost.status == "pending", ChannelPost.next_attempt_at <= now)
+        .order_by(ChannelPost.next_attempt_at, ChannelPost.id)
+        .limit(limit)
+        .scalar_subquery()
+    )
+    return (
+        update(ChannelPost)
+        .where(ChannelPost.id.in_(due_ids), ChannelPost.status == "pending")
+        .values(status="sending", attempts=ChannelPost.attempts + 1)
+        .returning(ChannelPost)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def claim_due_posts(limit: int) -> List[ChannelPost]:
+    """领取到期的待投递记录（标记为 sending 并计入一次尝试），多进程部署时每条只会被领取一次"""
+    async for session in get_db():
+        try:
+            result = await session.execute(claim_due_posts_query(datetime.now(), limit))
+            posts = list(result.scalars().all())
+            await session.commit()
+            return posts
+        except Exception as e:
+            logger.error(f"领取待投递频道消息失败: {e}")
+            await session.rollback()
+            return []
+
+
+async def get_next_due_time() -> Optional[datetime]:
+    """最早一条等待重试的记录的投递时间，没有时返回 None"""
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                select(func.min(ChannelPost.next_attempt_at)).where(ChannelPost.status == "pending")
+            )
+            return result.scalar()
+        except Exception as e:
+            logger.error(f"获取频道消息下次投递时间失败: {e}")
+            return None
+
+
+async def _update_post(post_id: int, **values) -> None:
+    async for session in get_db():
+        try:
+            await session.execute(update(ChannelPost).where(ChannelPost.id == post_id).values(**values))
+            await session.commit()
+        except Exception as e:
+            logger.error(f"更新频道投递记录 {post_id} 失败: {e}")
+            await session.rollback()
+
+
+async def mark_post_sent(post_id: int, message_id: int) -> None:
+    """记录投递成功及频道消息ID"""
+    await _update_post(post_id, status="sent", message_id=message_id, sent_at=datetime.now(), last_error=None)
+
+
+async def mark_post_retry(post_id: int, error: str, next_attempt_at: datetime) -> None:
+    """投递失败，等待下次重试"""
+    await _update_post(post_id, status="pending", last_error=error, next_attempt_at=next_attempt_at)
+
+
+async def mark_post_failed(post_id: int, error: str) -> None:
+    """投递失败且不再重试"""
+    await _update_post(post_id, status="failed", last_error=error)
+
+
+async def recover_interrupted_posts() -> int:
+    """启动时处理上次退出时仍在发送中的记录：结果未知，标记为失败以免重复发布"""
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                update(ChannelPost)
+                .where(ChannelPost.status == "sending")
+                .values(status="failed", last_error="进程在发送途中退出，发送结果未知，为避免重复发布不再重试")
+            )
+            await session.commit()
+            if result.rowcount:
+                logger.warning(f"{result.rowcount} 条频道消息在上次退出时发送结果未知，已标记为失败")
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"恢复中断的频道投递记录失败: {e}")
+            await session.rollback()
+            return 0
@@ -0,0 +1,48 @@
+"""
+分页总数缓存模块
+列表分页（QueryPaginator）与高级浏览翻页时不重复 COUNT(*)：
+总数按 (计数 SQL, 涉及表的数据版本) 缓存，相关表提交写入后版本变化，缓存自然失效，写入处无需手动清理。
+有效期用于兜底数据版本覆盖不到的写入（其他进程、原生 SQL）。
+"""
+
+from cachetools import TTLCache
+from sqlalchemy import Table
+from sqlalchemy.sql.util import find_tables
+
+from app.database.data_version import table_version
+from app.config.config import COUNT_CACHE_TTL
+
+
+def statement_tables(statement) -> tuple:
+    """语句涉及的表名（含子查询中的表）"""
+    return tuple(sorted({table.name for table in find_tables(statement) if isinstance(table, Table)}))
+
+
+class CountCache:
+    """分页总数缓存"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = COUNT_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def count(self, session, count_query, fresh: bool = False) -> int:
+        """
+        执行计数查询（带缓存）
+
+        Args:
+            session: 数据库会话
+            count_query: 返回单个计数值的 select
+            fresh: 为 True 时忽略缓存重新统计
+        """
+        key = (
+            str(count_query.compile(compile_kwargs={"literal_binds": True})),
+            table_version(*statement_tables(count_query)),
+        )
+        if not fresh and key in self._cache:
+            return self._cache[key]
+        total = (await session.execute(count_query)).scalar() or 0
+        self._cache[key] = total
+        return total
+
+
+# 全局实例
+count_cache = CountCache()
@@ -0,0 +1,88 @@
+"""
+数据版本计数模块
+为每张表维护一个进程内的版本号：写连接上执行的 INSERT/UPDATE/DELETE 提交后（连接归还连接池时）把涉及的表版本加一，
+回滚则不计。渲染缓存把相关表的版本作为键的一部分，数据变化后旧的缓存自然失效，无需逐处清理。
+
+- Core 语句与 ORM flush 产生的写入都会被统计；原生 SQL（text）写入请自行调用 bump_table_version。
+- users 表的写入大多是活跃统计、忙碌状态等不参与展示的列，只有更新展示或筛选用的列时才计入版本。
+- 版本只在当前进程内有效，多进程部署时其他进程的写入不会使本进程的缓存失效。
+"""
+
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase, Update
+
+from app.database.db import write_engine
+
+# 只有更新这些列（列表展示或按其筛选计数）时才计入版本的表（其余表的任何写入都计入）
+_DISPLAY_COLUMNS = {
+    "users": {"username", "full_name", "role"},
+}
+
+_versions: Counter = Counter()
+
+
+def table_version(*tables: str) -> tuple:
+    """获取若干表的当前版本"""
+    return tuple(_versions[table] for table in tables)
+
+
+def bump_table_version(*tables: str) -> None:
+    """手动使若干表的版本加一（原生 SQL 写入后调用）"""
+    for table in tables:
+        _versions[table] += 1
+
+
+def _updated_columns(statement: Update, multiparams, params) -> set:
+    """UPDATE 语句设置的列名（来自 values() 与执行参数）"""
+    columns = {getattr(key, "key", key) for key in (statement._values or {})}
+    for param in (multiparams or []) + ([params] if params else []):
+        if isinstance(param, dict):
+            columns.update(param)
+    return columns
+
+
+def _written_table(statement, multiparams, params) -> Optional[str]:
+    """写语句涉及的表名，不影响展示的写入返回 None"""
+    if not isinstance(statement, UpdateBase):
+        return None
+    table = getattr(statement.table, "name", None)
+    if table is None:
+        return None
+    display_columns = _DISPLAY_COLUMNS.get(table)
+    if display_columns is not None and isinstance(statement, Update):
+        if not display_columns & _updated_columns(statement, multiparams, params):
+            return None
+    return table
+
+
+@event.listens_for(write_engine.sync_engine, "before_execute")
+def _track_write(conn, clauseelement, multiparams, params, execution_options) -> None:
+    table = _written_table(clauseelement, multiparams, params)
+    if table is not None:
+        conn.info.setdefault("written_tables", set()).add(table)
+
+
+@event.listens_for(write_engine.sync_engine, "commit")
+def _on_commit(conn) -> None:
+    # commit 事件在真正提交之前触发，等连接归还连接池（提交已完成）时再更新版本，
+    # 否则提交完成前的读取会以新版本缓存旧数据
+    tables = conn.info.pop("written_tables", None)
+    if tables:
+        conn.info.setdefault("committed_tables", set()).update(tables)
+
+
+@event.listens_for(write_engine.sync_engine, "rollback")
+def _on_rollback(conn) -> None:
+    conn.info.pop("written_tables", None)
+
+
+@event.listens_for(write_engine.sync_engine.pool, "checkin")
+def _bump_on_checkin(dbapi_connection, connection_record) -> None:
+    if connection_record is None:
+        return
+    tables = connection_record.info.pop("committed_tables", None)
+    if tables:
+        bump_table_version(*tables)
@@ -1,34 +1,363 @@
+import asyncio
 import os
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Optional
+from loguru import logger
+from sqlalchemy import inspect, event, make_url, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     AsyncSession,
+    AsyncSessionTransaction,
     async_sessionmaker,
 )
 
 from app.database.schema import Base
-from app.config import DATABASE_URL_ASYNC
+from app.config import (
+    DATABASE_URL_ASYNC, SQLITE_PRAGMAS_ENABLED, SQLITE_JOURNAL_MODE, SQLITE_SYNCHRONOUS,
+    SQLITE_BUSY_TIMEOUT, SQLITE_CACHE_SIZE, SQLITE_MMAP_SIZE, SQLITE_TEMP_STORE,
+    SQLITE_READ_POOL_SIZE, SQLITE_WRITE_TIMEOUT
+)
+
+
+_url = make_url(DATABASE_URL_ASYNC)
+IS_SQLITE = _url.get_backend_name() == "sqlite"
 
+# SQLite 文件数据库读写分离：只读连接池 + 单个写连接（写入在连接池处排队串行）。
+# aiosqlite 默认使用 NullPool（每个会话新建连接），这里显式使用连接池复用连接。
+# 内存数据库无法跨连接共享，PostgreSQL 等使用常规连接池，两者都不拆分。
+SPLIT_READ_WRITE = IS_SQLITE and _url.database not in (None, "", ":memory:")
 
 """
 Create an async engine.
 Defaults to SQLite with aiosqlite driver if DATABASE_URL_ASYNC is not provided.
 """
-engine = create_async_engine(DATABASE_URL_ASYNC)
+if SPLIT_READ_WRITE:
+    engine = create_async_engine(
+        DATABASE_URL_ASYNC, poolclass=AsyncAdaptedQueuePool,
+        pool_size=SQLITE_READ_POOL_SIZE, max_overflow=0
+    )
+    write_engine = create_async_engine(
+        DATABASE_URL_ASYNC, poolclass=AsyncAdaptedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=SQLITE_WRITE_TIMEOUT
+    )
+else:
+    engine = create_async_engine(DATABASE_URL_ASYNC)
+    write_engine = engine
+
+# SQLite 连接参数
+SQLITE_PRAGMAS = {
+    "journal_mode": SQLITE_JOURNAL_MODE,
+    "synchronous": SQLITE_SYNCHRONOUS,
+    "busy_timeout": SQLITE_BUSY_TIMEOUT,
+    "cache_size": SQLITE_CACHE_SIZE,
+    "mmap_size": SQLITE_MMAP_SIZE,
+    "temp_store": SQLITE_TEMP_STORE,
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, pragmas: dict = SQLITE_PRAGMAS) -> None:
+    """在新建的 SQLite 连接上应用 PRAGMA"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+if IS_SQLITE and SQLITE_PRAGMAS_ENABLED:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_sqlite_connect(dbapi_connection, connection_record) -> None:
+        apply_sqlite_pragmas(dbapi_connection)
+
+    if SPLIT_READ_WRITE:
+        @event.listens_for(write_engine.sync_engine, "connect")
+        def _on_sqlite_write_connect(dbapi_connection, connection_record) -> None:
+            apply_sqlite_pragmas(dbapi_connection)
+
+if SPLIT_READ_WRITE:
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_sqlite_read_connect(dbapi_connection, connection_record) -> None:
+        # 只读连接上的写入直接报错，而不是绕过写连接产生锁竞争
+        apply_sqlite_pragmas(dbapi_connection, {"query_only": 1})
+
+
+class RoutingSession(Session):
+    """
+    读写分离会话：查询走只读连接池，flush 与 INSERT/UPDATE/DELETE 走写连接。
+    同一事务一旦写入，后续语句都固定在写连接上，保证能读到本事务未提交的修改；
+    事务结束后恢复按语句路由。原生 SQL 写入请直接使用 write_engine。
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("use_writer") or self._flushing or isinstance(clause, UpdateBase):
+            self.info["use_writer"] = True
+            return write_engine.sync_engine
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_session_route(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("use_writer", None)
+
+
+_SyncSession = RoutingSession if SPLIT_READ_WRITE else Session
 
 # Create a session factory
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
     class_=AsyncSession,
+    sync_session_class=_SyncSession,
+    expire_on_commit=False,
+)
+
+
+class UnitOfWorkSyncSession(_SyncSession):
+    """工作单元会话使用的同步会话，用于只对工作单元挂载事件"""
+
+
+if IS_SQLITE:
+    @event.listens_for(UnitOfWorkSyncSession, "after_begin")
+    def _emit_begin(session, transaction, connection) -> None:
+        # pysqlite 只在 DML 前隐式 BEGIN，事务的第一条语句是 SAVEPOINT 时，释放它就等于提交，
+        # 无法正确嵌套。工作单元为每次 helper 调用设置 SAVEPOINT，因此在其事务开始时显式 BEGIN；
+        # 驱动发现已在事务中便不会再隐式 BEGIN，提交与回滚照常。其他会话保持驱动默认的事务行为。
+        if transaction.parent is None:
+            connection.exec_driver_sql("BEGIN")
+
+
+@dataclass
+class _HelperSavepoint:
+    """一次 helper 调用的 SAVEPOINT"""
+    transaction: AsyncSessionTransaction
+    pending: bool  # 开启时是否已有待提交的修改
+    callbacks: int  # 开启时已注册的提交后回调数
+    finished: bool = False  # helper 是否已结束
+
+
+class UnitOfWorkSession(AsyncSession):
+    """
+    更新级工作单元会话：处理一个 update 期间所有 helper 共用此会话。
+    helper 内的 commit() 只 flush，由 complete() 统一提交一次。
+    每次 helper 调用（get_db）开启一个 SAVEPOINT，helper 结束后释放；commit() 释放后重新开启。
+    语句、flush 失败或调用 rollback() 时只回滚当前 helper 的 SAVEPOINT 及其中注册的提交后回调，
+    之前已成功返回的 helper 的修改仍随工作单元提交，当前 helper 也可继续使用该会话。
+    """
+
+    def _savepoints(self) -> list:
+        # 最近开启的在最后；外层事务结束（complete 或整体回滚）时清空
+        return self.info.setdefault("savepoints", [])
+
+    def _current_index(self) -> Optional[int]:
+        """当前（最内层未结束的）helper 的 SAVEPOINT 下标，不在 helper 中时返回 None"""
+        savepoints = self._savepoints()
+        for index in range(len(savepoints) - 1, -1, -1):
+            if not savepoints[index].finished:
+                return index
+        return None
+
+    def in_helper(self) -> bool:
+        """是否有 helper 调用尚未结束"""
+        return self._current_index() is not None
+
+    async def _release_above(self, index: int) -> None:
+        """由内向外释放下标 index 之上的 SAVEPOINT（都属于已结束的 helper）"""
+        savepoints = self._savepoints()
+        while len(savepoints) > index + 1:
+            await savepoints.pop().transaction.commit()
+
+    async def release_finished(self) -> None:
+        """释放已结束的 helper 的 SAVEPOINT"""
+        index = self._current_index()
+        await self._release_above(-1 if index is None else index)
+
+    async def begin_savepoint(self) -> _HelperSavepoint:
+        """为一次 helper 调用开启 SAVEPOINT"""
+        await self.release_finished()
+        savepoint = _HelperSavepoint(
+            await self.begin_nested(),
+            self.info.get("pending_commit", False),
+            len(self.info.get("after_commit", [])),
+        )
+        self._savepoints().append(savepoint)
+        return savepoint
+
+    async def execute(self, *args, **kwargs):
+        try:
+            return await super().execute(*args, **kwargs)
+        except Exception:
+            await self.rollback()
+            raise
+
+    async def commit(self) -> None:
+        try:
+            await self.flush()
+            index = self._current_index()
+            if index is not None:
+                await self._release_above(index)
+                savepoint = self._savepoints()[index]
+                await savepoint.transaction.commit()
+                # 之后的修改若回滚，只回滚到这次提交为止
+                savepoint.transaction = await self.begin_nested()
+                savepoint.pending = True
+                savepoint.callbacks = len(self.info.get("after_commit", []))
+        except Exception:
+            await self.rollback()
+            raise
+        self.info["pending_commit"] = True
+
+    async def rollback(self) -> None:
+        """回滚当前 helper 的 SAVEPOINT（含其中已结束的嵌套 helper）；不在 helper 中时回滚整个工作单元"""
+        index = self._current_index()
+        if index is None:
+            self.info.pop("savepoints", None)
+            self.info.pop("pending_commit", None)
+            self.info.pop("after_commit", None)
+            await super().rollback()
+            return
+        savepoints = self._savepoints()
+        savepoint = savepoints[index]
+        del savepoints[index + 1:]
+        await savepoint.transaction.rollback()
+        if not savepoint.pending:
+            self.info.pop("pending_commit", None)
+        del self.info.get("after_commit", [])[savepoint.callbacks:]
+        # helper 仍可继续使用会话
+        savepoint.transaction = await self.begin_nested()
+
+    async def complete(self) -> None:
+        """真正提交（同时释放所有 SAVEPOINT），并执行提交后回调"""
+        self.info.pop("savepoints", None)
+        try:
+            await super().commit()
+        except Exception:
+            self.info.pop("pending_commit", None)
+            self.info.pop("after_commit", None)
+            await super().rollback()
+            raise
+        self.info.pop("pending_commit", None)
+        for callback in self.info.pop("after_commit", []):
+            callback()
+
+
+UnitOfWorkSessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=UnitOfWorkSession,
+    sync_session_class=UnitOfWorkSyncSession,
     expire_on_commit=False,
 )
 
+# 当前工作单元：(会话, 所属任务)。只在开启它的任务内复用，
+# 避免 create_task / gather 派生的任务并发使用同一会话。
+_unit_of_work: ContextVar[Optional[tuple]] = ContextVar("unit_of_work", default=None)
+
+
+def current_unit_of_work() -> Optional[UnitOfWorkSession]:
+    """获取当前任务的工作单元会话，没有时返回 None"""
+    current = _unit_of_work.get()
+    if current is None:
+        return None
+    session, owner = current
+    return session if owner is asyncio.current_task() else None
+
+
+@asynccontextmanager
+async def unit_of_work():
+    """
+    开启工作单元：块内通过 get_db() 取得的都是同一个会话，退出时统一提交。
+    已处于工作单元中时直接复用外层会话。
+    块内抛出异常时，已成功返回的 helper 的写入仍会提交（与各 helper 自行提交时的行为一致）。
+    """
+    session = current_unit_of_work()
+    if session is not None:
+        yield session
+        return
+
+    async with UnitOfWorkSessionLocal() as session:
+        token = _unit_of_work.set((session, asyncio.current_task()))
+        try:
+            yield session
+        finally:
+            _unit_of_work.reset(token)
+            await session.complete()
+
+
+async def commit_unit_of_work() -> None:
+    """
+    在 handler 层结束当前工作单元的事务并归还连接（如发起网络请求前，避免在等待响应期间占用连接）：
+    有待提交的修改时提交，只读事务同样结束（expire_on_commit=False，已加载的对象不会过期）。
+    之后的 helper 在同一会话中按需开启新事务。
+    helper 尚未结束时（helper 内部发起请求）不提交，以免提交其未完成的修改。
+    """
+    session = current_unit_of_work()
+    if session is not None and session.in_transaction() and not session.in_helper():
+        await session.complete()
+
 
-async def get_db():
+def on_commit(session: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    注册提交后回调（缓存更新等依赖数据已落库的操作）。
+    工作单元会话中延迟到真正提交后执行，回滚则丢弃；普通会话立即执行。
+    """
+    if isinstance(session, UnitOfWorkSession):
+        session.info.setdefault("after_commit", []).append(callback)
+    else:
+        callback()
+
+
+class _HelperScope:
+    """
+    工作单元中 get_db() 返回的异步迭代器，对应一次 helper 调用：
+    第一次迭代开启 SAVEPOINT 并交出会话，循环结束时标记 helper 已结束并释放 SAVEPOINT。
+    helper 在循环内 return 或抛出异常时，迭代器随即被回收（__del__）并同步标记结束，
+    SAVEPOINT 在下一次开启、提交或工作单元结束时释放。
+    不用异步生成器：它的 finally 要等事件循环另起任务执行，届时 handler 已在继续使用会话。
+    """
+
+    def __init__(self, session: UnitOfWorkSession):
+        self._session = session
+        self._savepoint: Optional[_HelperSavepoint] = None
+        self._started = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> UnitOfWorkSession:
+        if not self._started:
+            self._started = True
+            self._savepoint = await self._session.begin_savepoint()
+            return self._session
+        self._finish()
+        await self._session.release_finished()
+        raise StopAsyncIteration
+
+    def _finish(self) -> None:
+        if self._savepoint is not None:
+            self._savepoint.finished = True
+
+    __del__ = _finish
+
+
+async def _new_session():
     async with AsyncSessionLocal() as session:
         yield session
 
 
+def get_db():
+    session = current_unit_of_work()
+    if session is not None:
+        # 每次 helper 调用使用独立的 SAVEPOINT，失败时只回滚本次调用的修改
+        return _HelperScope(session)
+    return _new_session()
+
+
 async def init_db() -> None:
     """Create all tables if they do not exist (for SQLite learning mode)."""
     # 自动创建数据库目录
@@ -44,8 +373,31 @@ async def init_db() -> None:
             os.makedirs(db_dir, exist_ok=True)
             print(f"数据库目录已创建: {db_dir}")
     
-    async with engine.begin() as conn:
+    from app.database.search import ensure_search_index
+    from app.database.duplicates import backfill_title_keys
+    from app.database.image_library import seed_builtin_images
+
+    async with write_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # create_all 不会修改已存在的表，这里单独补齐新增的列和索引
+        added = await conn.run_sync(_add_missing_columns)
+        created = await conn.run_sync(_create_missing_indexes)
+        # 全文搜索索引（SQLite FTS5 / PostgreSQL GIN）
+        search_index = await conn.run_sync(ensure_search_index)
+        # 求片查重用的归一化片名与 trigram 索引
+        backfilled = await conn.run_sync(backfill_title_keys)
+        # 内置图片写入图片库，随图片库一起参与随机
+        seeded_images = await conn.run_sync(seed_builtin_images)
+    if added:
+        logger.info(f"已补加列: {', '.join(added)}")
+    if created:
+        logger.info(f"已补建索引: {', '.join(created)}")
+    if search_index:
+        logger.info(f"已创建全文索引: {search_index}")
+    if backfilled:
+        logger.info(f"已更新 {backfilled} 条求片的归一化片名")
+    if seeded_images:
+        logger.info(f"已将 {seeded_images} 张内置图片写入图片库")
     
     # 初始化默认系统设置
     await init_default_settings()
@@ -54,6 +406,44 @@ async def init_db() -> None:
     await init_default_categories()
 
 
+def _add_missing_columns(sync_conn) -> list:
+    """为已存在的表补加 schema 中新增的可空列（幂等）；非空列无法自动补加，只记录警告"""
+    inspector = inspect(sync_conn)
+    preparer = sync_conn.dialect.identifier_preparer
+    added = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            if not column.nullable or column.server_default is not None:
+                logger.warning(f"无法自动补加列 {table.name}.{column.name}，请手动迁移")
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(
+                f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {preparer.format_column(column)} {column_type}"
+            ))
+            added.append(f"{table.name}.{column.name}")
+    return added
+
+
+def _create_missing_indexes(sync_conn) -> list:
+    """为已存在的表创建 schema 中声明但数据库里缺失的索引（幂等）"""
+    inspector = inspect(sync_conn)
+    created = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(sync_conn)
+                created.append(index.name)
+    return created
+
+
 async def init_default_settings() -> None:
     """初始化默认系统设置"""
     from app.database.business import get_system_setting, set_system_setting
@@ -0,0 +1,239 @@
+"""
+重复求片检测模块
+- 归一化片名：全角转半角、大小写折叠、繁体转简体、去掉标点与空白，存入 movie_requests.normalized_title（带索引），
+  归一化后相同的待审核求片视为同一组，审核通过其中一条时一并处理
+- 相似片名：归一化片名的 trigram 存入 movie_title_trigrams（按 trigram 建索引），
+  按共有 trigram 数取候选后计算 Jaccard 相似度，用于提交前提示“已有相似求片”
+
+繁简转换使用 opencc（opencc-python-reimplemented）的 t2s 配置。
+修改归一化规则（如更换转换方式）后递增 TITLE_KEY_VERSION，下次启动时 init_db 自动重建已有数据的归一化片名。
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import select, update, delete, insert, func, bindparam
+from loguru import logger
+from opencc import OpenCC
+
+from app.database.db import get_db
+from app.database.schema import MovieRequest, MovieTitleTrigram, SystemSettings
+from app.config.config import DUPLICATE_SIMILARITY_THRESHOLD, DUPLICATE_HINT_LIMIT
+
+# 归一化规则版本，记录在系统设置中；与数据库中记录的不一致时重建全部归一化片名
+TITLE_KEY_VERSION = 1
+_TITLE_KEY_VERSION_SETTING = "title_key_version"
+
+# 繁体转简体（字词级转换）
+_opencc = OpenCC("t2s")
+
+# trigram 两端补空格（与 pg_trgm 一致），1~2 个字的片名也能生成 trigram；归一化后的片名不含空白，不会混淆
+_PAD_LEFT = "  "
+_PAD_RIGHT = " "
+# 按共有 trigram 数取前若干条候选后再精确计算相似度
+_MAX_CANDIDATES = 50
+
+
+@dataclass
+class DuplicateMatch:
+    """一条相似求片"""
+    request_id: int
+    title: str
+    status: str
+    user_id: int
+    created_at: Optional[datetime]
+    score: float  # trigram Jaccard 相似度
+    exact: bool  # 归一化片名完全相同
+
+
+def to_simplified(text: str) -> str:
+    """繁体转简体"""
+    return _opencc.convert(text)
+
+
+def normalize_title(title: str) -> str:
+    """
+    片名归一化：全角转半角（NFKC）、大小写折叠、繁转简，只保留文字与数字
+
+    只含标点/符号的片名退化为折叠空白后的原文，保证非空片名得到非空结果
+    """
+    folded = to_simplified(unicodedata.normalize("NFKC", title or "").casefold())
+    key = "".join(ch for ch in folded if ch.isalnum())
+    return key or " ".join(folded.split())
+
+
+def title_trigrams(key: str) -> Set[str]:
+    """归一化片名的 trigram 集合"""
+    if not key:
+        return set()
+    padded = f"{_PAD_LEFT}{key}{_PAD_RIGHT}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _jaccard(shared: int, left: int, right: int) -> float:
+    union = left + right - shared
+    return shared / union if union else 0.0
+
+
+def _trigram_rows(request_id: int, key: str) -> List[dict]:
+    return [{"request_id": request_id, "trigram": gram} for gram in sorted(title_trigrams(key))]
+
+
+def add_title_trigrams(session, request_id: int, key: str) -> None:
+    """为新求片写入 trigram 索引（随调用方的事务一起提交）"""
+    session.add_all(MovieTitleTrigram(**row) for row in _trigram_rows(request_id, key))
+
+
+def similar_requests_query(grams: Set[str]):
+    """按共有 trigram 数取候选求片（未被拒绝），结果为 (求片, 共有 trigram 数)"""
+    shared = func.count().label("shared")
+    candidates = (
+        select(MovieTitleTrigram.request_id, shared)
+        .where(MovieTitleTrigram.trigram.in_(grams))
+        .group_by(MovieTitleTrigram.request_id)
+        .order_by(shared.desc())
+        .limit(_MAX_CANDIDATES)
+    ).subquery()
+    return (
+        select(MovieRequest, candidates.c.shared)
+        .join(candidates, candidates.c.request_id == MovieRequest.id)
+        .where(MovieRequest.status != "rejected")
+    )
+
+
+async def find_similar_requests(title: str, limit: int = DUPLICATE_HINT_LIMIT,
+                                threshold: float = DUPLICATE_SIMILARITY_THRESHOLD) -> List[DuplicateMatch]:
+    """
+    查找与片名相似的未被拒绝的求片（归一化相同的排在最前）
+
+    Returns:
+        按相似度从高到低排列的匹配列表
+    """
+    key = normalize_title(title)
+    grams = title_trigrams(key)
+    if not grams:
+        return []
+
+    async for session in get_db():
+        try:
+            result = await session.execute(similar_requests_query(grams))
+
+            matches = []
+            for request, shared_count in result.all():
+                exact = request.normalized_title == key
+                score = 1.0 if exact else _jaccard(
+                    shared_count, len(grams), len(title_trigrams(request.normalized_title))
+                )
+                if score >= threshold:
+                    matches.append(DuplicateMatch(
+                        request_id=request.id,
+                        title=request.title,
+                        status=request.status,
+                        user_id=request.user_id,
+                        created_at=request.created_at,
+                        score=score,
+                        exact=exact,
+                    ))
+            matches.sort(key=lambda match: (match.exact, match.score, match.status == "approved"), reverse=True)
+            return matches[:limit]
+        except Exception as e:
+            logger.error(f"查找相似求片失败: {e}")
+            return []
+
+
+def pending_requests_by_key_query(keys: Set[str]):
+    """归一化片名在给定集合中的待审核求片（早的在前）"""
+    return (
+        select(MovieRequest)
+        .where(MovieRequest.normalized_title.in_(keys), MovieRequest.status == "pending")
+        .order_by(MovieRequest.created_at.asc(), MovieRequest.id.asc())
+    )
+
+
+async def get_pending_duplicates(requests: Sequence[MovieRequest]) -> Dict[int, List[MovieRequest]]:
+    """
+    查找与给定求片归一化片名相同的其他待审核求片
+
+    Returns:
+        求片ID -> 同组的其他待审核求片（早的在前），没有重复的求片不出现在结果中
+    """
+    keys = {request.normalized_title for request in requests if request.normalized_title}
+    if not keys:
+        return {}
+
+    async for session in get_db():
+        try:
+            result = await session.execute(pending_requests_by_key_query(keys))
+            groups: Dict[str, List[MovieRequest]] = {}
+            for request in result.scalars().all():
+                groups.setdefault(request.normalized_title, []).append(request)
+
+            duplicates = {}
+            for request in requests:
+                others = [item for item in groups.get(request.normalized_title, []) if item.id != request.id]
+                if others:
+                    duplicates[request.id] = others
+            return duplicates
+        except Exception as e:
+            logger.error(f"查找重复求片失败: {e}")
+            return {}
+
+
+def _stored_title_key_version(sync_conn) -> Optional[str]:
+    settings = SystemSettings.__table__
+    return sync_conn.execute(
+        select(settings.c.setting_value).where(settings.c.setting_key == _TITLE_KEY_VERSION_SETTING)
+    ).scalar()
+
+
+def _store_title_key_version(sync_conn, exists: bool) -> None:
+    settings = SystemSettings.__table__
+    if exists:
+        sync_conn.execute(
+            update(settings)
+            .where(settings.c.setting_key == _TITLE_KEY_VERSION_SETTING)
+            .values(setting_value=str(TITLE_KEY_VERSION), updated_at=datetime.now())
+        )
+    else:
+        sync_conn.execute(insert(settings).values(
+            setting_key=_TITLE_KEY_VERSION_SETTING,
+            setting_value=str(TITLE_KEY_VERSION),
+            setting_type="integer",
+            description="片名归一化规则版本（自动维护）",
+        ))
+
+
+def backfill_title_keys(sync_conn) -> int:
+    """
+    补齐求片的归一化片名与 trigram 索引（init_db 时执行，幂等）：
+    平时只处理缺少归一化片名的求片；数据库中记录的归一化规则版本与 TITLE_KEY_VERSION 不一致时
+    （含首次记录版本）重建全部求片并更新版本
+
+    Returns:
+        处理的求片数
+    """
+    stored_version = _stored_title_key_version(sync_conn)
+    rebuild = stored_version != str(TITLE_KEY_VERSION)
+    query = select(MovieRequest.id, MovieRequest.title)
+    if rebuild:
+        sync_conn.execute(delete(MovieTitleTrigram))
+        _store_title_key_version(sync_conn, stored_version is not None)
+    else:
+        query = query.where(MovieRequest.normalized_title.is_(None))
+    rows = sync_conn.execute(query).all()
+    if not rows:
+        return 0
+
+    keys = [{"request_id": request_id, "key": normalize_title(title)} for request_id, title in rows]
+    table = MovieRequest.__table__
+    sync_conn.execute(
+        update(table).where(table.c.id == bindparam("request_id")).values(normalized_title=bindparam("key")),
+        keys,
+    )
+    trigram_rows = [row for item in keys for row in _trigram_rows(item["request_id"], item["key"])]
+    if trigram_rows:
+        sync_conn.execute(insert(MovieTitleTrigram), trigram_rows)
+    return len(rows)
+
@@ -0,0 +1,265 @@
+"""
+FSM 状态存储模块
+提供可替换的 aiogram FSM 存储后端：
+- memory：进程内存储（重启丢失）
+- sql：以内存为读缓存、合并写回数据库的持久化存储（SQLite / PostgreSQL）
+- redis：aiogram 自带的 RedisStorage，可在多个进程间共享
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from sqlalchemy import select, delete
+from loguru import logger
+
+from app.database.db import AsyncSessionLocal, engine
+from app.database.schema import FsmState
+from app.config.config import (
+    FSM_STORAGE, REDIS_URL, FSM_STATE_TTL, FSM_FLUSH_INTERVAL, FSM_CLEANUP_INTERVAL
+)
+
+
+@dataclass
+class _Record:
+    """单个存储键的状态与数据"""
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    updated_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+def _build_upsert_stmt():
+    """按数据库方言构建 fsm_states 的 upsert 语句"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(FsmState.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=[FsmState.key],
+        set_={
+            "state": stmt.excluded.state,
+            "data": stmt.excluded.data,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+
+
+class SQLStorage(BaseStorage):
+    """
+    数据库 FSM 存储：
+    - 首次访问时一次性加载未过期的记录，之后所有读取都在内存中完成。
+    - 写入只修改内存并标记为脏，由后台任务每 flush_interval 秒合并写回一次。
+    - 超过 state_ttl 未写入的记录视为已放弃，读取时忽略并由后台任务批量清理。
+
+    内存为读写的权威来源，因此同一数据库只应由一个机器人进程使用该存储；
+    多进程共享状态请使用 Redis 存储。
+    """
+
+    def __init__(
+        self,
+        key_builder: Optional[KeyBuilder] = None,
+        state_ttl: int = FSM_STATE_TTL,
+        flush_interval: float = FSM_FLUSH_INTERVAL,
+        cleanup_interval: float = FSM_CLEANUP_INTERVAL,
+    ) -> None:
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self.state_ttl = state_ttl
+        self.flush_interval = flush_interval
+        self.cleanup_interval = cleanup_interval
+        self._records: Dict[str, _Record] = {}
+        self._dirty: set[str] = set()
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._upsert_stmt = _build_upsert_stmt()
+
+    def _is_expired(self, record: _Record, now: datetime) -> bool:
+        return bool(self.state_ttl) and now - record.updated_at > timedelta(seconds=self.state_ttl)
+
+    async def _ensure_loaded(self) -> None:
+        """首次访问时加载数据库中未过期的记录，并启动后台任务"""
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            query = select(FsmState)
+            if self.state_ttl:
+                query = query.where(FsmState.updated_at >= datetime.now() - timedelta(seconds=self.state_ttl))
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(query)
+                for row in result.scalars().all():
+                    try:
+                        data = json.loads(row.data) if row.data else {}
+                    except ValueError:
+                        logger.warning(f"FSM 数据解析失败，已忽略: {row.key}")
+                        data = {}
+                    # 内存中已有的记录是加载期间的新写入，以其为准
+                    self._records.setdefault(row.key, _Record(row.state, data, row.updated_at))
+            self._loaded = True
+            logger.info(f"FSM 状态已加载: {len(self._records)} 条")
+            if self._task is None:
+                self._task = asyncio.create_task(self._run())
+
+    async def _get_record(self, key: StorageKey) -> Optional[_Record]:
+        await self._ensure_loaded()
+        storage_key = self.key_builder.build(key)
+        record = self._records.get(storage_key)
+        if record is not None and self._is_expired(record, datetime.now()):
+            self._records.pop(storage_key, None)
+            self._dirty.add(storage_key)
+            return None
+        return record
+
+    async def _write(self, key: StorageKey) -> _Record:
+        """获取（或创建）可写记录，并标记为待写回"""
+        await self._ensure_loaded()
+        storage_key = self.key_builder.build(key)
+        record = self._records.get(storage_key)
+        if record is None or self._is_expired(record, datetime.now()):
+            record = self._records[storage_key] = _Record()
+        record.updated_at = datetime.now()
+        self._dirty.add(storage_key)
+        return record
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        record = await self._write(key)
+        record.state = state.state if isinstance(state, State) else state
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        record = await self._get_record(key)
+        return record.state if record else None
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        record = await self._write(key)
+        record.data = data.copy()
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        record = await self._get_record(key)
+        return record.data.copy() if record else {}
+
+    async def flush(self) -> int:
+        """将脏记录合并写回数据库，返回写回的键数量"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return 0
+
+            dirty, self._dirty = self._dirty, set()
+            upserts = []
+            deletes = []
+            for storage_key in dirty:
+                record = self._records.get(storage_key)
+                if record is None or record.is_empty:
+                    self._records.pop(storage_key, None)
+                    deletes.append(storage_key)
+                    continue
+                try:
+                    data = json.dumps(record.data, ensure_ascii=False)
+                except (TypeError, ValueError) as e:
+                    logger.error(f"FSM 数据无法序列化，跳过持久化 {storage_key}: {e}")
+                    continue
+                upserts.append({
+                    "key": storage_key,
+                    "state": record.state,
+                    "data": data,
+                    "updated_at": record.updated_at,
+                })
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    if deletes:
+                        await session.execute(delete(FsmState).where(FsmState.key.in_(deletes)))
+                    if upserts:
+                        await session.execute(self._upsert_stmt, upserts)
+                    await session.commit()
+                return len(dirty)
+            except Exception as e:
+                logger.error(f"FSM 状态写回失败: {e}")
+                # 重新标记，等待下次写回
+                self._dirty |= dirty
+                return 0
+
+    async def cleanup_expired(self) -> int:
+        """批量清理过期（已放弃）的状态，返回清理的数据库记录数"""
+        if not self.state_ttl:
+            return 0
+
+        now = datetime.now()
+        for storage_key in [k for k, r in self._records.items() if self._is_expired(r, now)]:
+            self._records.pop(storage_key, None)
+            self._dirty.discard(storage_key)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    delete(FsmState).where(FsmState.updated_at < now - timedelta(seconds=self.state_ttl))
+                )
+                await session.commit()
+            if result.rowcount:
+                logger.info(f"已清理过期 FSM 状态: {result.rowcount} 条")
+            return result.rowcount
+        except Exception as e:
+            logger.error(f"清理过期 FSM 状态失败: {e}")
+            return 0
+
+    async def _run(self) -> None:
+        """后台任务：定期写回与清理"""
+        loop = asyncio.get_running_loop()
+        next_cleanup = loop.time() + self.cleanup_interval
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+            if loop.time() >= next_cleanup:
+                await self.cleanup_expired()
+                next_cleanup = loop.time() + self.cleanup_interval
+
+    async def close(self) -> None:
+        """停止后台任务并写回剩余数据（调度器关闭时自动调用）"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def create_fsm_storage(backend: str = FSM_STORAGE) -> BaseStorage:
+    """
+    根据配置创建 FSM 存储
+
+    Args:
+        backend: memory / sql / redis
+
+    Returns:
+        FSM 存储实例
+    """
+    if backend == "memory":
+        return MemoryStorage()
+
+    if backend == "redis":
+        try:
+            from aiogram.fsm.storage.redis import RedisStorage
+        except ImportError as e:
+            raise RuntimeError('FSM_STORAGE=redis 需要安装 redis 可选依赖：pip install ".[redis]"') from e
+        ttl = FSM_STATE_TTL or None
+        return RedisStorage.from_url(REDIS_URL, state_ttl=ttl, data_ttl=ttl)
+
+    if backend == "sql":
+        return SQLStorage()
+
+    logger.warning(f"未知的 FSM_STORAGE 配置: {backend}，使用 memory 存储")
+    return MemoryStorage()
@@ -7,12 +7,60 @@
 
 from datetime import datetime
 from typing import List, Optional, Dict, Any
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, update, delete, insert, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from app.database.db import AsyncSessionLocal
-from app.database.schema import ImageLibrary
+from app.database.db import get_db, on_commit
+from app.database.schema import ImageLibrary, User
+from app.database.image_usage import image_usage_aggregator
+from app.config import SUPERADMIN_ID
+from app.config.image_config import IMAGE_LIST
+
+# 图片库修改提交后的回调（随机图片池注册，用于重新加载）
+_listeners: list = []
+
+
+def add_image_library_listener(callback) -> None:
+    """注册图片库有修改时的回调"""
+    _listeners.append(callback)
+
+
+def notify_image_library_changed() -> None:
+    """通知图片库有修改（在事务提交后调用）"""
+    for callback in _listeners:
+        callback()
+
+
+def seed_builtin_images(sync_conn) -> int:
+    """
+    把内置图片（image_config.IMAGE_LIST）写入图片库（init_db 时执行）
+
+    图片库中已有任一内置图片时视为已写入过，不再重复写入，删除的内置图片不会在重启后恢复；
+    记录的添加者为超管，超管用户尚未创建时（首次启动）跳过，在此之前图片池使用内置图片兜底。
+
+    Returns:
+        写入的图片数
+    """
+    if not IMAGE_LIST or SUPERADMIN_ID is None:
+        return 0
+    seeded = sync_conn.execute(
+        select(ImageLibrary.id).where(ImageLibrary.image_url.in_(IMAGE_LIST)).limit(1)
+    ).first()
+    if seeded is not None:
+        return 0
+    if sync_conn.execute(select(User.chat_id).where(User.chat_id == SUPERADMIN_ID)).first() is None:
+        return 0
+    now = datetime.now()
+    sync_conn.execute(
+        insert(ImageLibrary),
+        [
+            {"image_url": url, "description": "内置图片", "added_by": SUPERADMIN_ID, "added_at": now,
+             "is_active": True, "usage_count": 0}
+            for url in dict.fromkeys(IMAGE_LIST)
+        ],
+    )
+    return len(set(IMAGE_LIST))
 
 
 async def save_image_url(image_url: str, added_by: int, description: str = None) -> Optional[ImageLibrary]:
@@ -27,7 +75,7 @@ async def save_image_url(image_url: str, added_by: int, description: str = None)
         保存的图片记录，失败返回None
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             # 检查URL是否已存在
             existing = await session.execute(
                 select(ImageLibrary).where(ImageLibrary.image_url == image_url)
@@ -49,6 +97,7 @@ async def save_image_url(image_url: str, added_by: int, description: str = None)
             session.add(image_record)
             await session.commit()
             await session.refresh(image_record)
+            on_commit(session, notify_image_library_changed)
             
             logger.info(f"图片URL保存成功: {image_url} (ID: {image_record.id})")
             return image_record
@@ -70,7 +119,7 @@ async def get_all_images(limit: int = 50, offset: int = 0, active_only: bool = T
         图片记录列表
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             query = select(ImageLibrary)
             
             if active_only:
@@ -98,7 +147,7 @@ async def get_image_by_id(image_id: int) -> Optional[ImageLibrary]:
         图片记录，不存在返回None
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             result = await session.execute(
                 select(ImageLibrary).where(ImageLibrary.id == image_id)
             )
@@ -119,7 +168,7 @@ async def get_image_by_url(image_url: str) -> Optional[ImageLibrary]:
         图片记录，不存在返回None
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             result = await session.execute(
                 select(ImageLibrary).where(ImageLibrary.image_url == image_url)
             )
@@ -140,11 +189,13 @@ async def delete_image_by_url(image_url: str) -> bool:
         删除成功返回True，失败返回False
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             result = await session.execute(
                 delete(ImageLibrary).where(ImageLibrary.image_url == image_url)
             )
             await session.commit()
+            if result.rowcount > 0:
+                on_commit(session, notify_image_library_changed)
             
             if result.rowcount > 0:
                 logger.info(f"图片记录删除成功: {image_url}")
@@ -159,36 +210,16 @@ async def delete_image_by_url(image_url: str) -> bool:
 
 
 async def update_image_usage(image_url: str) -> bool:
-    """更新图片使用次数
+    """记录一次图片使用（在内存中累计，由后台任务批量写回使用次数与最后使用时间）
     
     Args:
         image_url: 图片URL
         
     Returns:
-        更新成功返回True，失败返回False
+        始终返回True
     """
-    try:
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                update(ImageLibrary)
-                .where(ImageLibrary.image_url == image_url)
-                .values(
-                    usage_count=ImageLibrary.usage_count + 1,
-                    last_used_at=datetime.now()
-                )
-            )
-            await session.commit()
-            
-            if result.rowcount > 0:
-                logger.debug(f"图片使用次数更新成功: {image_url}")
-                return True
-            else:
-                logger.warning(f"图片记录不存在，无法更新使用次数: {image_url}")
-                return False
-                
-    except Exception as e:
-        logger.error(f"更新图片使用次数失败: {e}")
-        return False
+    image_usage_aggregator.record(image_url)
+    return True
 
 
 async def get_image_stats() -> Dict[str, Any]:
@@ -198,7 +229,7 @@ async def get_image_stats() -> Dict[str, Any]:
         统计信息字典
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             # 总图片数
             total_result = await session.execute(
                 select(func.count(ImageLibrary.id))
@@ -260,7 +291,7 @@ async def get_active_image_urls() -> List[str]:
         图片URL列表
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             result = await session.execute(
                 select(ImageLibrary.image_url)
                 .where(ImageLibrary.is_active == True)
@@ -274,6 +305,31 @@ async def get_active_image_urls() -> List[str]:
         return []
 
 
+def pool_images_query():
+    """随机图片池查询：启用的图片（只含抽样所需字段）"""
+    return (
+        select(ImageLibrary.image_url, ImageLibrary.usage_count, ImageLibrary.added_at)
+        .where(ImageLibrary.is_active == True)
+        .order_by(ImageLibrary.added_at.desc())
+    )
+
+
+async def get_pool_images() -> Optional[List[ImageLibrary]]:
+    """获取随机图片池使用的启用图片（只含抽样所需字段）
+    
+    Returns:
+        图片记录列表，读取失败返回None
+    """
+    try:
+        async for session in get_db():
+            result = await session.execute(pool_images_query())
+            return list(result.all())
+            
+    except Exception as e:
+        logger.error(f"获取随机图片池失败: {e}")
+        return None
+
+
 async def toggle_image_status(image_url: str, is_active: bool) -> bool:
     """切换图片状态
     
@@ -285,13 +341,15 @@ async def toggle_image_status(image_url: str, is_active: bool) -> bool:
         更新成功返回True，失败返回False
     """
     try:
-        async with AsyncSessionLocal() as session:
+        async for session in get_db():
             result = await session.execute(
                 update(ImageLibrary)
                 .where(ImageLibrary.image_url == image_url)
                 .values(is_active=is_active)
             )
             await session.commit()
+            if result.rowcount > 0:
+                on_commit(session, notify_image_library_changed)
             
             if result.rowcount > 0:
                 status_text = "启用" if is_active else "禁用"
@@ -303,4 +361,48 @@ async def toggle_image_status(image_url: str, is_active: bool) -> bool:
                 
     except Exception as e:
         logger.error(f"切换图片状态失败: {e}")
-        return False
\ No newline at end of file
+        return False
+
+async def get_cached_file_ids() -> Dict[str, str]:
+    """获取已缓存 Telegram file_id 的图片（URL -> file_id）
+    
+    Returns:
+        URL 到 file_id 的映射
+    """
+    try:
+        async for session in get_db():
+            result = await session.execute(
+                select(ImageLibrary.image_url, ImageLibrary.telegram_file_id)
+                .where(ImageLibrary.telegram_file_id.is_not(None))
+            )
+            return {url: file_id for url, file_id in result.all()}
+            
+    except Exception as e:
+        logger.error(f"获取图片 file_id 缓存失败: {e}")
+        return {}
+
+
+async def save_image_file_id(image_url: str, file_id: Optional[str]) -> bool:
+    """记录图片的 Telegram file_id（传入 None 表示清除失效的 file_id）
+    
+    Args:
+        image_url: 图片URL
+        file_id: Telegram 返回的 file_id
+        
+    Returns:
+        图片库中存在该URL返回True，否则返回False
+    """
+    async for session in get_db():
+        try:
+            result = await session.execute(
+                update(ImageLibrary)
+                .where(ImageLibrary.image_url == image_url)
+                .values(telegram_file_id=file_id)
+            )
+            await session.commit()
+            return result.rowcount > 0
+            
+        except Exception as e:
+            logger.error(f"保存图片 file_id 失败: {e}")
+            await session.rollback()
+            return False
@@ -0,0 +1,78 @@
+"""
+图片使用次数写回缓冲模块
+每次展示面板图片只在内存中按 URL 累加次数与最后使用时间，
+由后台任务定期以一次 executemany 写回（每张图片一条 UPDATE），
+避免每次 /start、每次刷新面板都产生一次独立的写入。
+
+缓冲、写回与失败回填见 app.database.write_behind。
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import update, bindparam
+
+from app.database.schema import ImageLibrary
+from app.database.write_behind import WriteBehindAggregator
+from app.config.config import IMAGE_USAGE_FLUSH_INTERVAL
+
+
+@dataclass
+class _PendingUsage:
+    """单张图片尚未写回的使用数据"""
+    last_used_at: datetime
+    count: int = 0
+
+    def merge(self, other: "_PendingUsage") -> None:
+        """合并另一份（更早的）待写数据，用于写回失败后的回填"""
+        self.last_used_at = max(self.last_used_at, other.last_used_at)
+        self.count += other.count
+
+
+_images = ImageLibrary.__table__
+
+# 次数为增量累加，不在图片库中的 URL（内置图片）不影响任何行
+_flush_stmt = (
+    update(_images)
+    .where(_images.c.image_url == bindparam("b_image_url"))
+    .values(
+        usage_count=_images.c.usage_count + bindparam("b_count"),
+        last_used_at=bindparam("b_last_used_at"),
+    )
+)
+
+
+class ImageUsageAggregator(WriteBehindAggregator):
+    """图片使用次数聚合器（write-behind）"""
+
+    flush_stmt = _flush_stmt
+    label = "图片使用次数"
+    unit = "张图片"
+
+    def __init__(self, flush_interval: float = IMAGE_USAGE_FLUSH_INTERVAL):
+        super().__init__(flush_interval)
+        self._flush_listeners: list = []
+
+    def add_flush_listener(self, callback) -> None:
+        """注册写回成功后的回调（按使用次数加权的图片池据此更新权重）"""
+        self._flush_listeners.append(callback)
+
+    def _flushed(self, count: int) -> None:
+        for callback in self._flush_listeners:
+            callback()
+
+    def record(self, image_url: str) -> None:
+        """记录一次图片展示（纯内存操作）"""
+        now = datetime.now()
+        entry = self._pending.get(image_url)
+        if entry is None:
+            entry = self._pending[image_url] = _PendingUsage(last_used_at=now)
+        entry.last_used_at = now
+        entry.count += 1
+
+    def _params(self, image_url: str, entry: _PendingUsage) -> dict:
+        return {"b_image_url": image_url, "b_count": entry.count, "b_last_used_at": entry.last_used_at}
+
+
+# 全局实例
+image_usage_aggregator = ImageUsageAggregator()
@@ -0,0 +1,69 @@
+"""
+SQLite 定期维护模块
+WAL 模式下定期执行检查点，防止 -wal 文件无限增长；
+同时执行 PRAGMA optimize，让 SQLite 根据查询情况更新统计信息。
+非 SQLite 数据库时不做任何操作。
+"""
+
+import asyncio
+from typing import Optional
+
+from sqlalchemy import text
+from loguru import logger
+
+from app.database.db import write_engine, IS_SQLITE
+from app.config.config import SQLITE_MAINTENANCE_INTERVAL
+
+
+class SQLiteMaintenance:
+    """SQLite 维护任务"""
+
+    def __init__(self, interval: float = SQLITE_MAINTENANCE_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> Optional[tuple]:
+        """
+        执行一次检查点与统计优化
+
+        Returns:
+            wal_checkpoint 的结果 (busy, wal 页数, 已写回页数)，失败返回 None
+        """
+        try:
+            async with write_engine.connect() as conn:
+                result = await conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+                checkpoint = tuple(result.one())
+                await conn.execute(text("PRAGMA optimize"))
+            logger.debug(f"SQLite 维护完成，检查点结果: {checkpoint}")
+            return checkpoint
+        except Exception as e:
+            logger.error(f"SQLite 维护失败: {e}")
+            return None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def start(self) -> None:
+        """启动定期维护任务（仅 SQLite）"""
+        if not IS_SQLITE or self.interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"SQLite 维护任务已启动（间隔 {self.interval}s）")
+
+    async def stop(self) -> None:
+        """停止维护任务，退出前再做一次检查点"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            await self.run_once()
+
+
+# 全局实例
+sqlite_maintenance = SQLiteMaintenance()
@@ -0,0 +1,135 @@
+"""
+热点查询执行计划检查模块
+登记业务中高频使用的查询，通过 EXPLAIN QUERY PLAN（SQLite）确认它们都走索引，
+防止新增查询或修改索引后悄悄退化为全表扫描；游标分页查询还要求由索引直接定位到游标处。
+登记的语句由业务代码中的查询构建函数生成，检查的就是实际执行的查询。
+
+用法：python tools/check_query_plans.py
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, Set, Tuple
+
+from app.database.schema import User, MovieRequest, ContentSubmission, UserFeedback, AdminAction
+from app.database.business import (
+    pending_movie_requests_query, user_movie_requests_query, all_movie_requests_query,
+    pending_content_submissions_query, user_content_submissions_query, all_content_submissions_query,
+    pending_movie_requests_after_query, pending_content_submissions_after_query,
+    advanced_browse_query, advanced_count_query, user_feedback_query, all_feedback_query
+)
+from app.database.duplicates import similar_requests_query, pending_requests_by_key_query, normalize_title, title_trigrams
+from app.database.sent_messages import latest_sent_message_query, unread_replies_query, sent_messages_by_admin_query
+from app.database.image_library import pool_images_query
+from app.database.channel_outbox import claim_due_posts_query
+from app.utils.pagination import QueryPaginator
+from app.config.config import REVIEW_PAGE_SIZE, BROWSE_PAGE_SIZE, SUBMISSION_PAGE_SIZE, ADVANCED_BROWSE_PAGE_SIZE
+
+# 代表性的参数值
+_CURSOR = (datetime(2024, 1, 1), 100)
+_NOW = datetime(2024, 1, 1)
+
+
+def _page(query, page_size: int):
+    """QueryPaginator 实际执行的某一页数据查询"""
+    return QueryPaginator(query, page_size=page_size).page_query(3)
+
+
+def _count(query):
+    """QueryPaginator 实际执行的总数查询"""
+    return QueryPaginator(query).count_query()
+
+
+def _advanced(model, conditions=(), sort_order: str = "asc", cursor=_CURSOR, direction: str = "next"):
+    """高级浏览实际执行的一页查询（多取一条判断是否还有数据）"""
+    return advanced_browse_query(
+        model, list(conditions), "created_at", sort_order, cursor, direction
+    ).limit(ADVANCED_BROWSE_PAGE_SIZE + 1)
+
+
+# 热点查询登记表：名称 -> 构建语句的函数。语句均由业务代码中的查询构建函数生成（参数取代表性的值）
+HOT_QUERIES: Dict[str, Callable] = {
+    # 审核 / 浏览 / 我的提交（QueryPaginator）
+    "待审核求片": lambda: _page(pending_movie_requests_query(), REVIEW_PAGE_SIZE),
+    "待审核求片总数": lambda: _count(pending_movie_requests_query()),
+    "待审核求片补位": lambda: pending_movie_requests_after_query(_CURSOR),
+    "我的求片": lambda: _page(user_movie_requests_query(1), SUBMISSION_PAGE_SIZE),
+    "我的求片总数": lambda: _count(user_movie_requests_query(1)),
+    "全部求片": lambda: _page(all_movie_requests_query(), BROWSE_PAGE_SIZE),
+    "待审核投稿": lambda: _page(pending_content_submissions_query(), REVIEW_PAGE_SIZE),
+    "待审核投稿总数": lambda: _count(pending_content_submissions_query()),
+    "待审核投稿补位": lambda: pending_content_submissions_after_query(_CURSOR),
+    "我的投稿": lambda: _page(user_content_submissions_query(1), SUBMISSION_PAGE_SIZE),
+    "全部投稿": lambda: _page(all_content_submissions_query(), BROWSE_PAGE_SIZE),
+    # 重复求片（duplicates.py）
+    "相似片名候选": lambda: similar_requests_query(title_trigrams(normalize_title("流浪地球"))),
+    "同名待审核求片": lambda: pending_requests_by_key_query({normalize_title("流浪地球")}),
+    # 高级浏览（business.advanced_browse_query，按创建时间的游标分页）
+    "高级浏览-求片游标页": lambda: _advanced(MovieRequest),
+    "高级浏览-求片上一页": lambda: _advanced(MovieRequest, direction="prev"),
+    "高级浏览-待审核求片游标页": lambda: _advanced(MovieRequest, [MovieRequest.status == "pending"], "desc"),
+    "高级浏览-投稿游标页": lambda: _advanced(ContentSubmission, sort_order="desc"),
+    "高级浏览-用户游标页": lambda: _advanced(User),
+    "高级浏览-用户上一页": lambda: _advanced(User, sort_order="desc", direction="prev"),
+    "高级浏览-反馈游标页": lambda: _advanced(UserFeedback),
+    "高级浏览-操作记录游标页": lambda: _advanced(AdminAction, sort_order="desc"),
+    "高级浏览-用户首页": lambda: _advanced(User, cursor=None),
+    "高级浏览-求片总数": lambda: advanced_count_query(MovieRequest, [MovieRequest.status == "pending"]),
+    # 反馈
+    "我的反馈": lambda: user_feedback_query(1),
+    "全部反馈": all_feedback_query,
+    # 代发消息（sent_messages.py）
+    "匹配用户回复": lambda: latest_sent_message_query(1),
+    "未读回复": unread_replies_query,
+    "管理员未读回复": lambda: unread_replies_query(1),
+    "管理员发送记录": lambda: sent_messages_by_admin_query(1),
+    # 随机图片池（image_library.py）
+    "启用图片列表": pool_images_query,
+    # 频道同步发件箱（channel_outbox.py）
+    "频道待投递": lambda: claim_due_posts_query(_NOW, 20),
+}
+
+# 游标查询：必须由索引直接定位到游标处（SEARCH），从索引开头逐行扫描（SCAN ... USING INDEX）同样不通过
+SEEK_QUERIES = {name for name in HOT_QUERIES if "游标页" in name or "上一页" in name or "补位" in name}
+
+
+def _explain(sync_conn, statement) -> List[str]:
+    """执行 EXPLAIN QUERY PLAN，返回每一步的描述"""
+    # 展开 IN 列表等延迟编译的参数，EXPLAIN 需要完整的 SQL
+    compiled = statement.compile(dialect=sync_conn.dialect, compile_kwargs={"render_postcompile": True})
+    params = compiled.construct_params()
+    positional = tuple(params[name] for name in compiled.positiontup) if compiled.positiontup else ()
+    rows = sync_conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", positional).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _is_full_scan(step: str, subqueries: Set[str] = frozenset()) -> bool:
+    # SQLite 中 "SCAN 表名" 且未使用索引即为全表扫描；扫描已物化的子查询结果不算
+    return step.startswith("SCAN ") and "USING" not in step and step.split()[1] not in subqueries
+
+
+def _subqueries(plan: List[str]) -> Set[str]:
+    """执行计划中物化的子查询名称"""
+    return {step.split()[1] for step in plan if step.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+
+
+def _is_seek(plan: List[str]) -> bool:
+    # 游标查询的第一步必须是带范围条件的 SEARCH
+    return bool(plan) and plan[0].startswith("SEARCH ") and ("<" in plan[0] or ">" in plan[0])
+
+
+def check_query_plans(sync_conn) -> List[Tuple[str, List[str], bool]]:
+    """
+    检查所有登记查询的执行计划（需在同步连接上调用，如 conn.run_sync）
+
+    Returns:
+        [(查询名称, 执行计划步骤, 是否通过)]
+    """
+    results = []
+    for name, build in HOT_QUERIES.items():
+        plan = _explain(sync_conn, build())
+        subqueries = _subqueries(plan)
+        ok = not any(_is_full_scan(step, subqueries) for step in plan)
+        if name in SEEK_QUERIES:
+            ok = ok and _is_seek(plan)
+        results.append((name, plan, ok))
+    return results
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, BigInteger, func, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, BigInteger, func, Text, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -10,6 +10,9 @@ class User(Base):
     """用户数据表（详细信息）。"""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),  # 用户浏览按注册时间排序
+    )
 
     # 基础信息
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -98,14 +101,22 @@ class MovieRequest(Base):
     """求片请求表。"""
     
     __tablename__ = "movie_requests"
+    __table_args__ = (
+        Index("ix_movie_requests_status_created_at", "status", "created_at"),  # 待审核列表
+        Index("ix_movie_requests_user_id_created_at", "user_id", "created_at"),  # 我的求片
+        Index("ix_movie_requests_created_at", "created_at"),  # 全部求片 / 高级浏览
+        Index("ix_movie_requests_normalized_title_status", "normalized_title", "status"),  # 重复求片分组
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)
     category_id = Column(Integer, ForeignKey('movie_categories.id'), nullable=False)  # 类型ID
     title = Column(String, nullable=False)  # 片名
+    normalized_title = Column(String, nullable=True)  # 归一化片名（查重用，见 app/database/duplicates.py）
     description = Column(Text, nullable=True)  # 描述
     file_id = Column(String, nullable=True)  # Telegram文件ID
     status = Column(String, nullable=False, server_default="pending")  # pending/approved/rejected
+    duplicate_of = Column(Integer, nullable=True)  # 随哪条求片一并审核（重复求片）
     created_at = Column(DateTime, default=datetime.now, nullable=False)
     reviewed_at = Column(DateTime, nullable=True)
     reviewed_by = Column(BigInteger, nullable=True)  # 审核人ID
@@ -118,10 +129,30 @@ class MovieRequest(Base):
         return f"<MovieRequest(id={self.id}, title={self.title}, status={self.status})>"
 
 
+class MovieTitleTrigram(Base):
+    """求片片名 trigram 索引表（相似片名查找）。"""
+    
+    __tablename__ = "movie_title_trigrams"
+    __table_args__ = (
+        Index("ix_movie_title_trigrams_trigram", "trigram", "request_id"),  # 按 trigram 找候选求片
+    )
+    
+    request_id = Column(Integer, ForeignKey('movie_requests.id', ondelete="CASCADE"), primary_key=True)
+    trigram = Column(String, primary_key=True)
+    
+    def __repr__(self):
+        return f"<MovieTitleTrigram(request_id={self.request_id}, trigram={self.trigram})>"
+
+
 class ContentSubmission(Base):
     """内容投稿表。"""
     
     __tablename__ = "content_submissions"
+    __table_args__ = (
+        Index("ix_content_submissions_status_created_at", "status", "created_at"),  # 待审核列表
+        Index("ix_content_submissions_user_id_created_at", "user_id", "created_at"),  # 我的投稿
+        Index("ix_content_submissions_created_at", "created_at"),  # 全部投稿 / 高级浏览
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)
@@ -146,6 +177,11 @@ class UserFeedback(Base):
     """用户反馈表。"""
     
     __tablename__ = "user_feedback"
+    __table_args__ = (
+        Index("ix_user_feedback_user_id_created_at", "user_id", "created_at"),  # 我的反馈
+        Index("ix_user_feedback_status_created_at", "status", "created_at"),  # 待处理反馈
+        Index("ix_user_feedback_created_at", "created_at"),  # 全部反馈 / 高级浏览
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)
@@ -165,6 +201,10 @@ class AdminAction(Base):
     """管理员操作记录表。"""
     
     __tablename__ = "admin_actions"
+    __table_args__ = (
+        Index("ix_admin_actions_admin_id_created_at", "admin_id", "created_at"),  # 按管理员查询操作记录
+        Index("ix_admin_actions_created_at", "created_at"),  # 操作记录浏览
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     admin_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)
@@ -217,6 +257,11 @@ class SentMessage(Base):
     """代发消息追踪表"""
 
     __tablename__ = "sent_messages"
+    __table_args__ = (
+        Index("ix_sent_messages_target", "target_id", "target_type", "status", "sent_at"),  # 匹配用户回复
+        Index("ix_sent_messages_admin_id_sent_at", "admin_id", "sent_at"),  # 管理员发送记录
+        Index("ix_sent_messages_status_is_read_replied_at", "status", "is_read", "replied_at"),  # 未读回复
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     admin_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)  # 发送消息的管理员ID
@@ -239,6 +284,9 @@ class ImageLibrary(Base):
     """图片库表 - 存储管理员添加的图片链接信息"""
 
     __tablename__ = "image_library"
+    __table_args__ = (
+        Index("ix_image_library_is_active_added_at", "is_active", "added_at"),  # 启用图片列表 / 随机取图
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     image_url = Column(String, nullable=False, unique=True)  # 图片URL
@@ -248,6 +296,71 @@ class ImageLibrary(Base):
     is_active = Column(Boolean, default=True, nullable=False)  # 是否启用
     usage_count = Column(Integer, default=0, nullable=False)  # 使用次数
     last_used_at = Column(DateTime, nullable=True)  # 最后使用时间
+    telegram_file_id = Column(String, nullable=True)  # 首次上传后 Telegram 返回的 file_id，之后发送直接复用
     
     def __repr__(self):
         return f"<ImageLibrary(id={self.id}, image_url='{self.image_url}', added_by={self.added_by})>"
+
+
+class FsmState(Base):
+    """FSM 状态持久化表（SQLStorage 使用）"""
+
+    __tablename__ = "fsm_states"
+
+    key = Column(String, primary_key=True)  # 存储键（bot/chat/user/destiny）
+    state = Column(String, nullable=True)  # 当前状态
+    data = Column(Text, nullable=False, default="{}")  # 状态数据（JSON）
+    updated_at = Column(DateTime, default=datetime.now, nullable=False, index=True)  # 最后写入时间（用于过期清理）
+    
+    def __repr__(self):
+        return f"<FsmState(key={self.key}, state={self.state})>"
+
+
+class BroadcastJob(Base):
+    """群发任务表（记录进度，支持崩溃后断点续发）"""
+
+    __tablename__ = "broadcast_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    admin_id = Column(BigInteger, ForeignKey('users.chat_id'), nullable=False)  # 发起群发的管理员ID
+    from_chat_id = Column(BigInteger, nullable=False)  # 源消息所在聊天
+    message_id = Column(BigInteger, nullable=False)  # 源消息ID（copy_message）
+    status = Column(String, nullable=False, server_default="running")  # running/completed/failed
+    total = Column(Integer, default=0, nullable=False)  # 创建时的用户总数
+    cursor_chat_id = Column(BigInteger, nullable=True)  # 已处理到的最大 chat_id（按 chat_id 顺序发送）
+    sent_count = Column(Integer, default=0, nullable=False)  # 成功数
+    failed_count = Column(Integer, default=0, nullable=False)  # 临时失败数（未移除）
+    removed_count = Column(Integer, default=0, nullable=False)  # 已移除用户数（拉黑/注销）
+    progress_message_id = Column(BigInteger, nullable=True)  # 管理员处的进度消息ID
+    error = Column(Text, nullable=True)  # 任务失败原因
+    created_at = Column(DateTime, default=datetime.now, nullable=False)
+    updated_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<BroadcastJob(id={self.id}, status={self.status}, sent={self.sent_count}/{self.total})>"
+
+
+class ChannelPost(Base):
+    """频道同步发件箱（审核通过时与状态变更在同一事务中写入，由后台任务投递到各频道）"""
+
+    __tablename__ = "channel_posts"
+    __table_args__ = (
+        UniqueConstraint("item_type", "item_id", "channel", name="uq_channel_posts_item_channel"),  # 同一内容在每个频道只投递一次
+        Index("ix_channel_posts_status_next_attempt_at", "status", "next_attempt_at"),  # 取出到期的待投递记录
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_type = Column(String, nullable=False)  # movie/content
+    item_id = Column(Integer, nullable=False)  # 求片或投稿ID
+    channel = Column(String, nullable=False)  # 目标频道（SYNC_CHANNELS 中的值）
+    status = Column(String, nullable=False, server_default="pending")  # pending/sending/sent/failed
+    attempts = Column(Integer, default=0, nullable=False)  # 已尝试次数
+    next_attempt_at = Column(DateTime, default=datetime.now, nullable=False)  # 下次投递时间（重试退避）
+    last_error = Column(Text, nullable=True)  # 最近一次失败原因
+    message_id = Column(BigInteger, nullable=True)  # 投递成功后频道中的消息ID
+    created_at = Column(DateTime, default=datetime.now, nullable=False)  # 写入时间（审核通过时间）
+    sent_at = Column(DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f"<ChannelPost(id={self.id}, {self.item_type}#{self.item_id} -> {self.channel}, status={self.status})>"
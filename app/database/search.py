@@ -0,0 +1,309 @@
+"""
+全文搜索模块
+对求片（标题/描述）、投稿（标题/内容）和反馈（内容）建立全文索引：
+- SQLite：FTS5 虚拟表 search_index（trigram 分词，支持中文子串匹配），由触发器与业务表保持同步
+- PostgreSQL：各表上的 to_tsvector GIN 表达式索引，随表数据自动更新
+- 其他情况（如 SQLite 未编译 FTS5）：退化为 LIKE 扫描
+
+search_index 的 rowid 编码为 id * 4 + 类型编号，触发器更新/删除时按 rowid 直接定位。
+"""
+
+import html
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select, text
+from loguru import logger
+
+from app.database.db import get_db, write_engine
+from app.database.schema import MovieRequest, ContentSubmission, UserFeedback
+
+# 搜索类型
+KIND_REQUEST = "request"
+KIND_SUBMISSION = "submission"
+KIND_FEEDBACK = "feedback"
+
+SEARCH_KINDS = {
+    KIND_REQUEST: "求片",
+    KIND_SUBMISSION: "投稿",
+    KIND_FEEDBACK: "反馈",
+}
+
+# 类型 -> (编号, 模型, 表名, 标题列, 正文列)
+_SOURCES = {
+    KIND_REQUEST: (1, MovieRequest, "movie_requests", "title", "description"),
+    KIND_SUBMISSION: (2, ContentSubmission, "content_submissions", "title", "content"),
+    KIND_FEEDBACK: (3, UserFeedback, "user_feedback", None, "content"),
+}
+_KIND_BY_CODE = {code: kind for kind, (code, *_) in _SOURCES.items()}
+
+# trigram 分词要求每个词至少 3 个字符，更短的词用 LIKE 匹配
+_TRIGRAM_MIN_LENGTH = 3
+_MAX_TERMS = 8
+
+# 当前使用的搜索后端：fts5 / tsvector / like（init_db 时确定）
+_backend = "like"
+
+
+@dataclass
+class SearchHit:
+    """单条搜索结果"""
+    kind: str
+    item_id: int
+    title: str
+    snippet: str  # 已转义的 HTML，匹配词加粗
+    status: str
+    created_at: Optional[datetime]
+    user_id: int
+
+
+def _title_sql(title_column: Optional[str], prefix: str = "") -> str:
+    return f"coalesce({prefix}{title_column}, '')" if title_column else "''"
+
+
+def _document_sql(kind: str) -> str:
+    """PostgreSQL 索引与查询共用的文档表达式（两处必须完全一致才能命中索引）"""
+    _, _, _, title_column, body_column = _SOURCES[kind]
+    return f"to_tsvector('simple', {_title_sql(title_column)} || ' ' || coalesce({body_column}, ''))"
+
+
+def _sqlite_search_ddl() -> List[str]:
+    statements = [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(title, body, tokenize = 'trigram')"
+    ]
+    for kind, (code, _, table, title_column, body_column) in _SOURCES.items():
+        insert = (
+            f"INSERT INTO search_index(rowid, title, body) VALUES "
+            f"(new.id * 4 + {code}, {_title_sql(title_column, 'new.')}, coalesce(new.{body_column}, ''));"
+        )
+        delete = f"DELETE FROM search_index WHERE rowid = old.id * 4 + {code};"
+        watched = ", ".join(column for column in (title_column, body_column) if column)
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_ai AFTER INSERT ON {table} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_ad AFTER DELETE ON {table} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS search_index_{table}_au AFTER UPDATE OF {watched} ON {table} "
+            f"BEGIN {delete} {insert} END",
+        ]
+    return statements
+
+
+def _sqlite_backfill_sql() -> List[str]:
+    return [
+        f"INSERT INTO search_index(rowid, title, body) "
+        f"SELECT id * 4 + {code}, {_title_sql(title_column)}, coalesce({body_column}, '') FROM {table}"
+        for code, _, table, title_column, body_column in _SOURCES.values()
+    ]
+
+
+def ensure_search_index(sync_conn) -> Optional[str]:
+    """
+    创建搜索索引（幂等，需在同步连接上调用，如 conn.run_sync）
+
+    Returns:
+        新建索引时返回说明文字，否则返回 None
+    """
+    global _backend
+    dialect = sync_conn.dialect.name
+
+    if dialect == "postgresql":
+        for kind, (_, _, table, _, _) in _SOURCES.items():
+            sync_conn.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{table}_search ON {table} USING GIN ({_document_sql(kind)})"
+            )
+        _backend = "tsvector"
+        return None
+
+    if dialect != "sqlite":
+        _backend = "like"
+        return None
+
+    exists = sync_conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'"
+    ).first() is not None
+    try:
+        for statement in _sqlite_search_ddl():
+            sync_conn.exec_driver_sql(statement)
+    except Exception as e:
+        logger.warning(f"SQLite 不支持 FTS5 trigram，搜索退化为 LIKE 扫描: {e}")
+        _backend = "like"
+        return None
+
+    _backend = "fts5"
+    if not exists:
+        for statement in _sqlite_backfill_sql():
+            sync_conn.exec_driver_sql(statement)
+        return "search_index（已回填现有数据）"
+    return None
+
+
+async def rebuild_search_index() -> bool:
+    """重建 SQLite 全文索引（索引与数据不一致时使用）"""
+    if _backend != "fts5":
+        return False
+    try:
+        async with write_engine.begin() as conn:
+            await conn.exec_driver_sql("DELETE FROM search_index")
+            for statement in _sqlite_backfill_sql():
+                await conn.exec_driver_sql(statement)
+            await conn.exec_driver_sql("INSERT INTO search_index(search_index) VALUES ('optimize')")
+        return True
+    except Exception as e:
+        logger.error(f"重建全文索引失败: {e}")
+        return False
+
+
+def split_terms(query: str) -> List[str]:
+    """把搜索词按空白切分，去重并限制数量"""
+    terms = []
+    for term in query.split():
+        if term and term not in terms:
+            terms.append(term)
+    return terms[:_MAX_TERMS]
+
+
+def _escape_like(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _fts5_query(terms: Sequence[str], kinds: Sequence[str]) -> Tuple[str, dict]:
+    """构建 FTS5 查询：长词走 MATCH（bm25 排序），短词在候选集上追加 LIKE 条件"""
+    params = {}
+    conditions = []
+    long_terms = [term for term in terms if len(term) >= _TRIGRAM_MIN_LENGTH]
+    if long_terms:
+        # 每个词作为短语匹配，多个词之间为 AND
+        params["match"] = " ".join('"' + term.replace('"', '""') + '"' for term in long_terms)
+        conditions.append("search_index MATCH :match")
+    for i, term in enumerate(term for term in terms if len(term) < _TRIGRAM_MIN_LENGTH):
+        params[f"t{i}"] = _escape_like(term)
+        conditions.append(f"(title LIKE :t{i} ESCAPE '\\' OR body LIKE :t{i} ESCAPE '\\')")
+    codes = ", ".join(str(_SOURCES[kind][0]) for kind in kinds)
+    conditions.append(f"rowid % 4 IN ({codes})")
+
+    score = "-bm25(search_index, 10.0, 1.0)" if long_terms else "0"
+    sql = f"SELECT rowid / 4 AS id, rowid % 4 AS code, {score} AS score FROM search_index WHERE {' AND '.join(conditions)}"
+    return sql, params
+
+
+def _tsvector_query(terms: Sequence[str], kinds: Sequence[str]) -> Tuple[str, dict]:
+    parts = [
+        f"SELECT id, {_SOURCES[kind][0]} AS code, ts_rank({_document_sql(kind)}, q) AS score "
+        f"FROM {_SOURCES[kind][2]}, websearch_to_tsquery('simple', :query) AS q "
+        f"WHERE {_document_sql(kind)} @@ q"
+        for kind in kinds
+    ]
+    return " UNION ALL ".join(parts), {"query": " ".join(terms)}
+
+
+def _like_query(terms: Sequence[str], kinds: Sequence[str]) -> Tuple[str, dict]:
+    params = {f"t{i}": _escape_like(term) for i, term in enumerate(terms)}
+    parts = []
+    for kind in kinds:
+        code, _, table, title_column, body_column = _SOURCES[kind]
+        columns = [column for column in (title_column, body_column) if column]
+        conditions = [
+            "(" + " OR ".join(f"{column} LIKE :t{i} ESCAPE '\\'" for column in columns) + ")"
+            for i in range(len(terms))
+        ]
+        parts.append(f"SELECT id, {code} AS code, 0 AS score FROM {table} WHERE {' AND '.join(conditions)}")
+    return " UNION ALL ".join(parts), params
+
+
+def build_snippet(text_value: Optional[str], terms: Sequence[str], width: int = 60) -> str:
+    """截取第一个匹配词附近的片段（无匹配时取开头），转义 HTML 并加粗匹配词"""
+    if not text_value:
+        return ""
+    lowered = text_value.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [position for position in positions if position >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    fragment = text_value[start:start + width]
+
+    escaped = html.escape(fragment)
+    if terms:
+        pattern = re.compile("|".join(re.escape(html.escape(term)) for term in terms), re.IGNORECASE)
+        escaped = pattern.sub(lambda m: f"<b>{m.group(0)}</b>", escaped)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + width < len(text_value) else ""
+    return f"{prefix}{escaped}{suffix}".replace("\n", " ")
+
+
+async def _load_hits(session, matches: List[Tuple[int, int]], terms: Sequence[str]) -> List[SearchHit]:
+    """按 (id, 类型编号) 加载业务记录，保持排序"""
+    rows: Dict[Tuple[int, int], object] = {}
+    for code in {code for _, code in matches}:
+        kind = _KIND_BY_CODE[code]
+        model = _SOURCES[kind][1]
+        ids = [item_id for item_id, item_code in matches if item_code == code]
+        result = await session.execute(select(model).where(model.id.in_(ids)))
+        for item in result.scalars().all():
+            rows[(item.id, code)] = item
+
+    hits = []
+    for item_id, code in matches:
+        item = rows.get((item_id, code))
+        if item is None:
+            continue
+        kind = _KIND_BY_CODE[code]
+        title_column, body_column = _SOURCES[kind][3], _SOURCES[kind][4]
+        title = getattr(item, title_column) if title_column else item.feedback_type
+        body = getattr(item, body_column)
+        hits.append(SearchHit(
+            kind=kind,
+            item_id=item.id,
+            title=title,
+            snippet=build_snippet(body, terms),
+            status=item.status,
+            created_at=item.created_at,
+            user_id=item.user_id,
+        ))
+    return hits
+
+
+async def search_items(
+    query: str,
+    kinds: Optional[Sequence[str]] = None,
+    offset: int = 0,
+    limit: int = 10
+) -> Tuple[List[SearchHit], int]:
+    """
+    全文搜索求片、投稿与反馈
+
+    Args:
+        query: 搜索词，多个词以空格分隔（需同时匹配）
+        kinds: 限定类型（KIND_REQUEST / KIND_SUBMISSION / KIND_FEEDBACK），默认全部
+        offset: 偏移量
+        limit: 返回条数
+
+    Returns:
+        (按相关度排序的结果, 匹配总数)
+    """
+    terms = split_terms(query)
+    kinds = [kind for kind in (kinds or SEARCH_KINDS) if kind in _SOURCES]
+    if not terms or not kinds:
+        return [], 0
+
+    if _backend == "fts5":
+        sql, params = _fts5_query(terms, kinds)
+    elif _backend == "tsvector":
+        sql, params = _tsvector_query(terms, kinds)
+    else:
+        sql, params = _like_query(terms, kinds)
+
+    async for session in get_db():
+        try:
+            total = (await session.execute(text(f"SELECT count(*) FROM ({sql}) AS matches"), params)).scalar()
+            if not total:
+                return [], 0
+            result = await session.execute(
+                text(f"SELECT id, code FROM ({sql}) AS matches ORDER BY score DESC, id DESC LIMIT :limit OFFSET :offset"),
+                {**params, "limit": limit, "offset": offset}
+            )
+            hits = await _load_hits(session, [(row.id, row.code) for row in result], terms)
+            return hits, total
+        except Exception as e:
+            logger.error(f"全文搜索失败: {e}")
+            await session.rollback()
+            return [], 0
@@ -3,10 +3,39 @@ from sqlalchemy import desc, and_, select
 from datetime import datetime
 from typing import List, Optional
 
-from app.database.db import AsyncSessionLocal
+from app.database.db import get_db
 from app.database.schema import SentMessage
 
 
+def latest_sent_message_query(target_id: int, admin_id: Optional[int] = None):
+    """最近发送给该用户且尚未回复的消息记录查询"""
+    query = select(SentMessage).filter(
+        and_(
+            SentMessage.target_id == target_id,
+            SentMessage.target_type == "user",
+            SentMessage.status == "sent"
+        )
+    )
+    if admin_id:
+        query = query.filter(SentMessage.admin_id == admin_id)
+    return query.order_by(desc(SentMessage.sent_at))
+
+
+def unread_replies_query(admin_id: Optional[int] = None):
+    """未读回复查询（不指定管理员时为全部未读回复）"""
+    conditions = [SentMessage.status == "replied", SentMessage.is_read == False]
+    if admin_id is not None:
+        conditions.insert(0, SentMessage.admin_id == admin_id)
+    return select(SentMessage).filter(and_(*conditions)).order_by(desc(SentMessage.replied_at))
+
+
+def sent_messages_by_admin_query(admin_id: int, limit: int = 20):
+    """管理员发送的消息记录查询"""
+    return select(SentMessage).filter(
+        SentMessage.admin_id == admin_id
+    ).order_by(desc(SentMessage.sent_at)).limit(limit)
+
+
 async def create_sent_message_record(
     admin_id: int,
     target_type: str,
@@ -17,7 +46,7 @@ async def create_sent_message_record(
     status: str = "sent"
 ) -> int:
     """创建代发消息记录"""
-    async with AsyncSessionLocal() as session:
+    async for session in get_db():
         sent_message = SentMessage(
             admin_id=admin_id,
             target_type=target_type,
@@ -39,21 +68,9 @@ async def update_message_reply(
     admin_id: Optional[int] = None
 ) -> bool:
     """更新消息回复内容"""
-    async with AsyncSessionLocal() as session:
+    async for session in get_db():
         # 查找最近发送给该用户的消息记录
-        query = select(SentMessage).filter(
-            and_(
-                SentMessage.target_id == target_id,
-                SentMessage.target_type == "user",
-                SentMessage.status == "sent"
-            )
-        )
-        
-        if admin_id:
-            query = query.filter(SentMessage.admin_id == admin_id)
-            
-        query = query.order_by(desc(SentMessage.sent_at))
-        result = await session.execute(query)
+        result = await session.execute(latest_sent_message_query(target_id, admin_id))
         sent_message = result.scalars().first()
         
         if sent_message:
@@ -68,34 +85,21 @@ async def update_message_reply(
 
 async def get_unread_replies(admin_id: int) -> List[SentMessage]:
     """获取管理员的未读回复"""
-    async with AsyncSessionLocal() as session:
-        query = select(SentMessage).filter(
-            and_(
-                SentMessage.admin_id == admin_id,
-                SentMessage.status == "replied",
-                SentMessage.is_read == False
-            )
-        ).order_by(desc(SentMessage.replied_at))
-        result = await session.execute(query)
+    async for session in get_db():
+        result = await session.execute(unread_replies_query(admin_id))
         return result.scalars().all()
 
 
 async def get_all_unread_replies() -> List[SentMessage]:
     """获取所有未读回复"""
-    async with AsyncSessionLocal() as session:
-        query = select(SentMessage).filter(
-            and_(
-                SentMessage.status == "replied",
-                SentMessage.is_read == False
-            )
-        ).order_by(desc(SentMessage.replied_at))
-        result = await session.execute(query)
+    async for session in get_db():
+        result = await session.execute(unread_replies_query())
         return result.scalars().all()
 
 
 async def mark_reply_as_read(message_id: int) -> bool:
     """标记回复为已读"""
-    async with AsyncSessionLocal() as session:
+    async for session in get_db():
         query = select(SentMessage).filter(SentMessage.id == message_id)
         result = await session.execute(query)
         sent_message = result.scalars().first()
@@ -109,17 +113,14 @@ async def mark_reply_as_read(message_id: int) -> bool:
 
 async def get_sent_messages_by_admin(admin_id: int, limit: int = 20) -> List[SentMessage]:
     """获取管理员发送的消息记录"""
-    async with AsyncSessionLocal() as session:
-        query = select(SentMessage).filter(
-            SentMessage.admin_id == admin_id
-        ).order_by(desc(SentMessage.sent_at)).limit(limit)
-        result = await session.execute(query)
+    async for session in get_db():
+        result = await session.execute(sent_messages_by_admin_query(admin_id, limit))
         return result.scalars().all()
 
 
 async def get_conversation_history(admin_id: int, target_id: int, limit: int = 10) -> List[SentMessage]:
     """获取与特定用户的对话历史"""
-    async with AsyncSessionLocal() as session:
+    async for session in get_db():
         query = select(SentMessage).filter(
             and_(
                 SentMessage.admin_id == admin_id,
@@ -133,7 +134,7 @@ async def get_conversation_history(admin_id: int, target_id: int, limit: int = 1
 
 async def delete_old_messages(days: int = 30) -> int:
     """删除指定天数前的消息记录"""
-    async with AsyncSessionLocal() as session:
+    async for session in get_db():
         from datetime import timedelta
         cutoff_date = datetime.now() - timedelta(days=days)
         
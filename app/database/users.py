@@ -1,11 +1,92 @@
 from sqlalchemy import select, update, func
 from datetime import datetime
+from cachetools import LRUCache, TTLCache
 from loguru import logger
 
-from app.database.db import get_db
+from app.database.db import get_db, on_commit
 from app.database.schema import User
 from app.utils.roles import ROLE_USER, ROLE_ADMIN, ROLE_SUPERADMIN
-from app.config import SUPERADMIN_ID
+from app.config import SUPERADMIN_ID, KNOWN_USER_CACHE_SIZE, ROLE_CACHE_SIZE, ROLE_CACHE_TTL
+
+
+class KnownUserCache:
+    """
+    已知用户缓存：记录已入库用户的 chat_id 及其资料指纹（姓名、用户名、Premium）。
+    命中且资料未变化的用户无需访问数据库；容量有限，按 LRU 淘汰。
+    """
+
+    def __init__(self, maxsize: int = KNOWN_USER_CACHE_SIZE):
+        self._profiles = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def profile_key(full_name: str, username: str | None, is_premium: bool) -> tuple:
+        """生成资料指纹"""
+        return (full_name, username, bool(is_premium))
+
+    def is_known(self, chat_id: int, profile: tuple) -> bool:
+        """用户已入库且资料未变化时返回 True"""
+        if self._profiles.get(chat_id) == profile:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def remember(self, chat_id: int, profile: tuple) -> None:
+        """记录用户资料指纹"""
+        self._profiles[chat_id] = profile
+
+    def forget(self, chat_id: int) -> None:
+        """移除用户（用户被删除时调用）"""
+        self._profiles.pop(chat_id, None)
+
+    def stats(self) -> dict:
+        """命中率统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    async def warm_up(self) -> int:
+        """启动时从 users 表预热最近活跃的用户，返回加载数量"""
+        async for session in get_db():
+            try:
+                result = await session.execute(
+                    select(User.chat_id, User.full_name, User.username, User.is_premium)
+                    .order_by(User.last_activity_at.desc())
+                    .limit(self._profiles.maxsize)
+                )
+                rows = result.all()
+                # 倒序写入，使最近活跃的用户处于 LRU 最新位置
+                for chat_id, full_name, username, is_premium in reversed(rows):
+                    # 无用户名的用户入库时使用 user_{chat_id} 占位
+                    if username == f"user_{chat_id}":
+                        username = None
+                    self._profiles[chat_id] = self.profile_key(full_name, username, is_premium)
+                logger.info(f"已知用户缓存预热完成: {len(rows)} 个用户")
+                return len(rows)
+            except Exception as e:
+                logger.error(f"已知用户缓存预热失败: {e}")
+                return 0
+
+
+# 全局实例
+known_user_cache = KnownUserCache()
+
+# 角色缓存：chat_id -> role。角色变更时显式失效，TTL 兜底其他进程的修改
+_role_cache = TTLCache(maxsize=ROLE_CACHE_SIZE, ttl=ROLE_CACHE_TTL)
+
+
+def invalidate_role_cache(chat_id: int | None = None) -> None:
+    """使角色缓存失效；不传 chat_id 时清空全部"""
+    if chat_id is None:
+        _role_cache.clear()
+    else:
+        _role_cache.pop(chat_id, None)
 
 
 async def add_user(
@@ -21,15 +102,18 @@ async def add_user(
 ) -> bool:
     """
     添加用户到数据库（若不存在则创建），包含详细信息。
+    用户已存在时，若姓名、用户名或 Premium 状态发生变化则同步更新。
+    返回是否新建了用户。
     """
     async for session in get_db():
         try:
+            safe_username = username if username else f"user_{chat_id}"
+
             # Check if the user already exists
             result = await session.execute(select(User).filter_by(chat_id=chat_id))
             is_exists = result.scalars().first()
 
             if not is_exists:
-                safe_username = username if username else f"user_{chat_id}"
                 new_user = User(
                     chat_id=chat_id,
                     full_name=full_name,
@@ -46,7 +130,15 @@ async def add_user(
                 )
                 session.add(new_user)
                 await session.commit()  # Commit the transaction
+                on_commit(session, lambda: known_user_cache.remember(chat_id, known_user_cache.profile_key(full_name, username, is_premium)))
                 return True
+
+            # 资料有变化时同步更新
+            profile = (full_name, safe_username, bool(is_premium))
+            if (is_exists.full_name, is_exists.username, bool(is_exists.is_premium)) != profile:
+                is_exists.full_name, is_exists.username, is_exists.is_premium = profile
+                await session.commit()
+            on_commit(session, lambda: known_user_cache.remember(chat_id, known_user_cache.profile_key(full_name, username, is_premium)))
             return False
         except Exception as e:
             logger.error(f"Error adding user: {e}")
@@ -75,6 +167,7 @@ async def set_role(chat_id: int, role: str) -> bool:
                 update(User).filter_by(chat_id=chat_id).values(role=role)
             )
             await session.commit()
+            on_commit(session, lambda: invalidate_role_cache(chat_id))
             return True
         except Exception as e:
             logger.error(f"Error setting role: {e}")
@@ -83,15 +176,21 @@ async def set_role(chat_id: int, role: str) -> bool:
 
 
 async def get_role(chat_id: int) -> str:
-    """获取用户角色，默认 user。"""
+    """获取用户角色，默认 user（优先读取角色缓存）。"""
+    # 环境层：超管唯一 ID 拥有最高权限
+    if SUPERADMIN_ID is not None and chat_id == SUPERADMIN_ID:
+        return ROLE_SUPERADMIN
+
+    role = _role_cache.get(chat_id)
+    if role is not None:
+        return role
+
     async for session in get_db():
         try:
-            # 环境层：超管唯一 ID 拥有最高权限
-            if SUPERADMIN_ID is not None and chat_id == SUPERADMIN_ID:
-                return ROLE_SUPERADMIN
-            result = await session.execute(select(User).filter_by(chat_id=chat_id))
-            user = result.scalars().first()
-            return user.role if user and user.role else ROLE_USER
+            result = await session.execute(select(User.role).filter_by(chat_id=chat_id))
+            role = result.scalar() or ROLE_USER
+            _role_cache[chat_id] = role
+            return role
         except Exception as e:
             logger.error(f"Error getting role: {e}")
             await session.rollback()
@@ -0,0 +1,116 @@
+"""
+写回缓冲（write-behind）基础模块
+高频的计数类写入先在内存中按键聚合，由后台任务定期（或积压达到阈值时）
+以一次 executemany 批量写回数据库：
+- 写回时整体换出缓冲区，写回期间的新记录进入新的缓冲区
+- 写回失败时把换出的数据合并回缓冲区，等待下次重试，计数不会丢失
+- 停止时写回剩余数据
+
+子类提供写回语句（flush_stmt）、每条记录的执行参数（_params）与记录方法，
+待写数据需实现 merge(other)，用于失败回填时合并更早的数据。
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+from loguru import logger
+
+from app.database.db import AsyncSessionLocal
+
+
+class WriteBehindAggregator(ABC):
+    """写回缓冲聚合器基类"""
+
+    # 写回语句（executemany）
+    flush_stmt = None
+    # 日志中的名称与计数单位，如 "活跃数据"、"个用户"
+    label = "缓冲数据"
+    unit = "条"
+
+    def __init__(self, flush_interval: float, max_pending: Optional[int] = None):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: Dict[Any, Any] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        """当前待写回的条数"""
+        return len(self._pending)
+
+    def _recorded(self) -> None:
+        """记录后调用：积压达到阈值时提前唤醒写回"""
+        if self.max_pending is not None and len(self._pending) >= self.max_pending:
+            self._wakeup.set()
+
+    @abstractmethod
+    def _params(self, key, entry) -> dict:
+        """单条待写数据的执行参数"""
+
+    def _flushed(self, count: int) -> None:
+        """写回成功后调用（子类按需覆盖）"""
+
+    async def flush(self) -> int:
+        """
+        将积压数据一次性写回数据库
+
+        Returns:
+            写回的条数
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            # 先整体换出，写回期间的新记录进入新的缓冲区
+            pending, self._pending = self._pending, {}
+            params = [self._params(key, entry) for key, entry in pending.items()]
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(self.flush_stmt, params)
+                    await session.commit()
+                logger.debug(f"{self.label}写回完成: {len(params)} {self.unit}")
+                self._flushed(len(params))
+                return len(params)
+            except Exception as e:
+                logger.error(f"{self.label}写回失败: {e}")
+                # 回填到缓冲区，等待下次重试，保证计数不丢失
+                for key, entry in pending.items():
+                    current = self._pending.get(key)
+                    if current is None:
+                        self._pending[key] = entry
+                    else:
+                        current.merge(entry)
+                return 0
+
+    async def _run(self) -> None:
+        """后台写回循环：按间隔或积压阈值触发"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            # 停止时取消的是等待而不是写回本身，换出的数据不会因取消而丢失
+            await asyncio.shield(self.flush())
+
+    def start(self) -> None:
+        """启动后台写回任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            threshold = f"，阈值 {self.max_pending}" if self.max_pending is not None else ""
+            logger.info(f"{self.label}写回任务已启动（间隔 {self.flush_interval}s{threshold}）")
+
+    async def stop(self) -> None:
+        """停止后台任务并写回剩余数据"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -4,12 +4,14 @@ from app.handlers.admins.review_center import review_center_router
 from app.handlers.admins.movie_review import movie_review_router
 from app.handlers.admins.content_review import content_review_router
 from app.handlers.admins.review_note import review_note_router
+from app.handlers.admins.search import search_router
 from app.handlers.admins.advanced_browse import router as advanced_browse_router
 
 admin_routers = [
     admins_router,
     superadmin_router,
     review_center_router,
+    search_router,
     movie_review_router,
     content_review_router,
     review_note_router,
@@ -5,8 +5,6 @@ from aiogram.fsm.context import FSMContext
 from app.database.admin import (
     get_count_of_users,
     get_user_data,
-    get_all_users_id,
-    remove_user,
 )
 from app.buttons.admin import admin_panel_kb
 from app.utils.states import Wait
@@ -21,6 +19,7 @@ from app.buttons.users import back_to_main_kb
 from app.database.business import is_feature_enabled
 from app.utils.panel_utils import get_user_display_link, send_feedback_reply_notification, send_admin_message_notification, DEFAULT_WELCOME_PHOTO
 from app.utils.time_utils import humanize_time
+from app.utils.broadcast_utils import broadcast_manager
 import re
 
 admins_router = Router()
@@ -145,27 +144,10 @@ async def Announce(msg: types.Message, state: FSMContext):
 
 @admins_router.message(StateFilter(Wait.waitAnnounce))
 async def ConfirmAnnounce(msg: types.Message, state: FSMContext):
-    all_users_id = await get_all_users_id()
-
-    users_len = len(all_users_id)
-
-    active_users = 0
-    inactive_users = 0
-
-    await msg.reply(f"开始向 {users_len} 位用户群发…")
-
-    for chat_id in all_users_id:
-        try:
-            await msg.bot.copy_message(chat_id, msg.from_user.id, msg.message_id)
-            active_users += 1
-        except Exception as e:
-            inactive_users += 1
-            remove_user(chat_id)
-
-    await msg.bot.send_message(
-        msg.from_user.id,
-        f"<b>发送完成</b>\n💚成功：{active_users}\n💔已移除：{inactive_users}",
-    )
+    # 群发在后台执行，进度消息会实时更新
+    job = await broadcast_manager.start(msg.bot, msg.from_user.id, msg.chat.id, msg.message_id)
+    if job is None:
+        await msg.reply("❌ 创建群发任务失败，请稍后重试")
     await state.clear()
 
 
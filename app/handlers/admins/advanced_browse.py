@@ -1,6 +1,7 @@
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
 from loguru import logger
 
 from app.utils.advanced_browser import (
@@ -8,6 +9,7 @@ from app.utils.advanced_browser import (
     BrowserConfig, 
     TimeField, 
     SortOrder,
+    decode_cursor,
     create_browser_for_reviews,
     create_browser_for_feedback,
     create_browser_for_users
@@ -19,16 +21,18 @@ from app.database.business import (
     get_users_advanced,
     get_admin_actions_advanced
 )
+from app.database.search import KIND_REQUEST, KIND_SUBMISSION, KIND_FEEDBACK
 from app.utils.filters import HasRole
+from app.utils.states import Wait
 from app.utils.roles import ROLE_ADMIN, ROLE_SUPERADMIN
 from app.config import ADMINS_ID, SUPERADMIN_ID
 
 router = Router()
 
 # 创建浏览器实例
-request_browser = create_browser_for_reviews(get_movie_requests_advanced)
-submission_browser = create_browser_for_reviews(get_content_submissions_advanced)
-feedback_browser = create_browser_for_feedback(get_user_feedback_advanced)
+request_browser = create_browser_for_reviews(get_movie_requests_advanced, KIND_REQUEST)
+submission_browser = create_browser_for_reviews(get_content_submissions_advanced, KIND_SUBMISSION)
+feedback_browser = create_browser_for_feedback(get_user_feedback_advanced, KIND_FEEDBACK)
 user_browser = create_browser_for_users(get_users_advanced)
 from app.config.config import ADVANCED_BROWSE_LARGE_PAGE_SIZE
 action_browser = AdvancedBrowser(
@@ -232,21 +236,21 @@ async def browse_users_command(message: Message):
 # ==================== 回调处理器 ====================
 
 @router.callback_query(F.data.startswith("browse_requests_"))
-async def handle_requests_browser_callback(callback: CallbackQuery):
+async def handle_requests_browser_callback(callback: CallbackQuery, state: FSMContext):
     """处理求片浏览回调"""
-    await handle_browser_callback(callback, request_browser, "求片请求浏览")
+    await handle_browser_callback(callback, request_browser, "求片请求浏览", state)
 
 
 @router.callback_query(F.data.startswith("browse_submissions_"))
-async def handle_submissions_browser_callback(callback: CallbackQuery):
+async def handle_submissions_browser_callback(callback: CallbackQuery, state: FSMContext):
     """处理投稿浏览回调"""
-    await handle_browser_callback(callback, submission_browser, "投稿内容浏览")
+    await handle_browser_callback(callback, submission_browser, "投稿内容浏览", state)
 
 
 @router.callback_query(F.data.startswith("browse_feedback_"))
-async def handle_feedback_browser_callback(callback: CallbackQuery):
+async def handle_feedback_browser_callback(callback: CallbackQuery, state: FSMContext):
     """处理反馈浏览回调"""
-    await handle_browser_callback(callback, feedback_browser, "用户反馈浏览")
+    await handle_browser_callback(callback, feedback_browser, "用户反馈浏览", state)
 
 
 @router.callback_query(F.data.startswith("browse_users_"))
@@ -255,13 +259,38 @@ async def handle_users_browser_callback(callback: CallbackQuery):
     await handle_browser_callback(callback, user_browser, "用户信息浏览")
 
 
-async def handle_browser_callback(callback: CallbackQuery, browser: AdvancedBrowser, title: str):
+async def handle_browser_callback(callback: CallbackQuery, browser: AdvancedBrowser, title: str, state: FSMContext = None):
     """通用浏览器回调处理"""
     user_id = str(callback.from_user.id)
     callback_data = callback.data
     
     try:
-        if "_set_page_size" in callback_data:
+        if callback_data.endswith("_search") and browser.search_kind and state is not None:
+            # 搜索框：等待管理员输入关键词，结果由 search 模块展示
+            await state.set_state(Wait.waitSearchKeyword)
+            await state.update_data(search_kind=browser.search_kind)
+            await callback.message.answer(f"🔍 请输入要在「{title}」中搜索的关键词（多个关键词用空格分隔）：")
+            await callback.answer()
+            return
+            
+        elif "_seek_" in callback_data:
+            # 游标翻页：{prefix}_seek_n{页码}_{游标} / {prefix}_seek_p{页码}_{游标} / {prefix}_seek_last
+            try:
+                seek = callback_data.split("_seek_")[1]
+                if seek == "last":
+                    data = await browser.get_page_data(user_id, direction="last")
+                else:
+                    position, token = seek.split("_", 1)
+                    direction = "next" if position[0] == "n" else "prev"
+                    data = await browser.get_page_data(
+                        user_id, int(position[1:]), cursor=decode_cursor(token), direction=direction
+                    )
+            except (ValueError, IndexError) as e:
+                logger.error(f"解析游标失败: {callback_data}, 错误: {e}")
+                await callback.answer("❌ 页面跳转失败")
+                return
+            
+        elif "_set_page_size" in callback_data:
             # 设置每页条数
             prefix = callback_data.split("_set_page_size")[0]
             keyboard = browser.create_page_size_keyboard(prefix)
@@ -306,8 +335,8 @@ async def handle_browser_callback(callback: CallbackQuery, browser: AdvancedBrow
             return
             
         elif "_refresh" in callback_data:
-            # 刷新当前页
-            data = await browser.get_page_data(user_id)
+            # 刷新当前页（同时重新统计总数）
+            data = await browser.get_page_data(user_id, refresh_total=True)
             
         elif "_toggle_sort_order" in callback_data:
             # 切换排序顺序
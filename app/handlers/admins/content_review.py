@@ -5,7 +5,8 @@ from loguru import logger
 from app.utils.states import Wait
 from app.database.business import (
     get_pending_content_submissions, get_all_content_submissions,
-    review_content_submission, get_content_submission_by_id
+    review_content_submission, review_content_submissions, get_content_submission_by_id,
+    pending_content_submissions_query, get_pending_content_submissions_after
 )
 from app.utils.review_config import ReviewConfig, ReviewHandler
 from app.utils.pagination import extract_page_from_callback
@@ -34,7 +35,11 @@ content_review_config = ReviewConfig(
     approve_note_media_callback_prefix='approve_content_note_media_',
     reject_note_media_callback_prefix='reject_content_note_media_',
     cleanup_callback='admin_review_content_cleanup',
-    back_to_main_cleanup_callback='back_to_main_cleanup'
+    back_to_main_cleanup_callback='back_to_main_cleanup',
+    pending_query_function=pending_content_submissions_query,
+    bulk_review_function=review_content_submissions,
+    get_pending_after_function=get_pending_content_submissions_after,
+    data_tables=('content_submissions', 'movie_categories', 'users')
 )
 
 # 投稿审核处理器
@@ -90,6 +95,31 @@ async def cb_reject_content_media(cb: types.CallbackQuery, state: FSMContext):
     await content_review_handler.handle_reject(cb, state, item_id)
 
 
+@content_review_router.callback_query(F.data.regexp(r'^content_review_select_\d+$'))
+async def cb_content_review_select(cb: types.CallbackQuery, state: FSMContext):
+    """勾选/取消勾选投稿"""
+    item_id = int(cb.data.split("_")[-1])
+    await content_review_handler.handle_toggle_select(cb, state, item_id)
+
+
+@content_review_router.callback_query(F.data == "content_review_select_page")
+async def cb_content_review_select_page(cb: types.CallbackQuery, state: FSMContext):
+    """全选本页投稿"""
+    await content_review_handler.handle_select_page(cb, state)
+
+
+@content_review_router.callback_query(F.data == "content_review_bulk_approve")
+async def cb_content_review_bulk_approve(cb: types.CallbackQuery, state: FSMContext):
+    """批量通过已勾选的投稿"""
+    await content_review_handler.handle_bulk_review(cb, state, "approved")
+
+
+@content_review_router.callback_query(F.data == "content_review_bulk_reject")
+async def cb_content_review_bulk_reject(cb: types.CallbackQuery, state: FSMContext):
+    """批量拒绝已勾选的投稿"""
+    await content_review_handler.handle_bulk_review(cb, state, "rejected")
+
+
 @content_review_router.callback_query(F.data.startswith("approve_content_note_"))
 async def cb_approve_content_note(cb: types.CallbackQuery, state: FSMContext):
     """通过投稿并留言"""
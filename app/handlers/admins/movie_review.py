@@ -5,8 +5,10 @@ from loguru import logger
 from app.utils.states import Wait
 from app.database.business import (
     get_pending_movie_requests, get_all_movie_requests,
-    review_movie_request, get_movie_request_by_id
+    review_movie_request, review_movie_requests, get_movie_request_by_id,
+    pending_movie_requests_query, get_pending_movie_requests_after
 )
+from app.database.duplicates import get_pending_duplicates
 from app.utils.review_config import ReviewConfig, ReviewHandler
 from app.utils.pagination import extract_page_from_callback
 from app.utils.permission_utils import require_admin_permission
@@ -34,7 +36,12 @@ movie_review_config = ReviewConfig(
     approve_note_media_callback_prefix='approve_movie_note_media_',
     reject_note_media_callback_prefix='reject_movie_note_media_',
     cleanup_callback='admin_review_movie_cleanup',
-    back_to_main_cleanup_callback='back_to_main_cleanup'
+    back_to_main_cleanup_callback='back_to_main_cleanup',
+    pending_query_function=pending_movie_requests_query,
+    get_duplicates_function=get_pending_duplicates,
+    bulk_review_function=review_movie_requests,
+    get_pending_after_function=get_pending_movie_requests_after,
+    data_tables=('movie_requests', 'movie_categories', 'users')
 )
 
 # 求片审核处理器
@@ -90,6 +97,31 @@ async def cb_reject_movie_media(cb: types.CallbackQuery, state: FSMContext):
     await movie_review_handler.handle_reject(cb, state, item_id)
 
 
+@movie_review_router.callback_query(F.data.regexp(r'^movie_review_select_\d+$'))
+async def cb_movie_review_select(cb: types.CallbackQuery, state: FSMContext):
+    """勾选/取消勾选求片"""
+    item_id = int(cb.data.split("_")[-1])
+    await movie_review_handler.handle_toggle_select(cb, state, item_id)
+
+
+@movie_review_router.callback_query(F.data == "movie_review_select_page")
+async def cb_movie_review_select_page(cb: types.CallbackQuery, state: FSMContext):
+    """全选本页求片"""
+    await movie_review_handler.handle_select_page(cb, state)
+
+
+@movie_review_router.callback_query(F.data == "movie_review_bulk_approve")
+async def cb_movie_review_bulk_approve(cb: types.CallbackQuery, state: FSMContext):
+    """批量通过已勾选的求片"""
+    await movie_review_handler.handle_bulk_review(cb, state, "approved")
+
+
+@movie_review_router.callback_query(F.data == "movie_review_bulk_reject")
+async def cb_movie_review_bulk_reject(cb: types.CallbackQuery, state: FSMContext):
+    """批量拒绝已勾选的求片"""
+    await movie_review_handler.handle_bulk_review(cb, state, "rejected")
+
+
 @movie_review_router.callback_query(F.data.startswith("approve_movie_note_"))
 async def cb_approve_movie_note(cb: types.CallbackQuery, state: FSMContext):
     """通过求片并留言"""
@@ -14,14 +14,15 @@ from app.config import ADMINS_ID, SUPERADMIN_ID
 from app.database.business import (
     get_pending_movie_requests, get_pending_content_submissions,
     get_all_movie_requests, get_all_content_submissions,
-    get_movie_request_by_id, get_content_submission_by_id
+    get_movie_request_by_id, get_content_submission_by_id,
+    all_movie_requests_query, all_content_submissions_query
 )
 from app.database.users import get_role
 from app.buttons.panels import get_panel_for_role
 from app.buttons.users import admin_review_center_kb, back_to_main_kb
 from app.utils.pagination import Paginator, format_page_header, extract_page_from_callback
 from app.utils.time_utils import humanize_time, get_status_text
-from app.utils.panel_utils import get_user_display_link, cleanup_sent_media_messages, create_welcome_panel_text, DEFAULT_WELCOME_PHOTO
+from app.utils.panel_utils import get_user_display_link, cleanup_sent_media_messages, delete_messages_bulk, create_welcome_panel_text, DEFAULT_WELCOME_PHOTO
 from app.utils.states import Wait
 from app.utils.browse_config import (
     MOVIE_BROWSE_CONFIG, CONTENT_BROWSE_CONFIG, BrowseHandler
@@ -31,9 +32,11 @@ review_center_router = Router()
 
 # 初始化配置
 MOVIE_BROWSE_CONFIG.get_all_items_function = get_all_movie_requests
+MOVIE_BROWSE_CONFIG.all_items_query_function = all_movie_requests_query
 MOVIE_BROWSE_CONFIG.get_item_by_id_function = get_movie_request_by_id
 
 CONTENT_BROWSE_CONFIG.get_all_items_function = get_all_content_submissions
+CONTENT_BROWSE_CONFIG.all_items_query_function = all_content_submissions_query
 CONTENT_BROWSE_CONFIG.get_item_by_id_function = get_content_submission_by_id
 
 # 创建处理器实例
@@ -295,11 +298,8 @@ async def cb_admin_review_center(cb: types.CallbackQuery, state: FSMContext):
     try:
         data = await state.get_data()
         sent_media_ids = data.get('sent_media_ids', [])
-        for message_id in sent_media_ids:
-            try:
-                await cb.message.bot.delete_message(chat_id=cb.from_user.id, message_id=message_id)
-            except Exception as e:
-                logger.warning(f"删除媒体消息失败: {e}")
+        if sent_media_ids:
+            await delete_messages_bulk(cb.bot, cb.from_user.id, sent_media_ids)
         # 清空已发送的媒体消息ID列表
         await state.update_data(sent_media_ids=[])
     except Exception as e:
@@ -321,6 +321,7 @@ async def cb_admin_review_center(cb: types.CallbackQuery, state: FSMContext):
     text += "├ /ap [类型] [ID] [留言] - 通过审核\n"
     text += "├ /rj [类型] [ID] [原因] - 拒绝审核\n"
     text += "├ /br /bs /bf /bu - 高级浏览\n"
+    text += "├ /search 关键词 - 全文搜索\n"
     text += "├ /su /sc /sg - 代发消息\n"
     text += "├ /il /ia /it /ir - 图片管理\n"
     text += "└ /h - 查看完整命令帮助"
@@ -818,9 +819,12 @@ async def help_command(message: types.Message):
         "├ /bs - 浏览投稿内容\n"
         "├ /bf - 浏览用户反馈\n"
         "└ /bu - 浏览用户信息\n\n"
+        "🔍 <b>全文搜索</b>:\n"
+        "└ /search [求片|投稿|反馈] 关键词\n\n"
         "⚡ <b>快速审核命令</b>:\n"
         "├ /ap [类型] [ID] [留言] - 通过审核\n"
-        "└ /rj [类型] [ID] [原因] - 拒绝审核\n\n"
+        "├ /rj [类型] [ID] [原因] - 拒绝审核\n"
+        "└ ID 可批量指定，如 120-125,130\n\n"
         "🤖 <b>代发消息命令</b>:\n"
         "├ /su [用户ID] [消息] - 发送给用户\n"
         "├ /sc [频道ID] [消息] - 发送到频道\n"
@@ -832,6 +836,7 @@ async def help_command(message: types.Message):
         "└ /ir [类型] [URL] - 删除图片\n\n"
         "📝 <b>使用示例</b>:\n"
         "├ /ap movie 123 内容很好\n"
+        "├ /rj content 40-45 重复投稿\n"
         "├ /su 123456789 您好！\n"
         "├ /ia welcome https://example.com/pic.jpg 新图片\n"
         "└ /br (浏览求片)\n\n"
@@ -847,15 +852,16 @@ async def help_command(message: types.Message):
 
 # ==================== 命令行审核功能 ====================
 
-@review_center_router.message(Command("approve", "ap"), HasRole(superadmin_id=SUPERADMIN_ID, admins_id=ADMINS_ID, allow_roles=[ROLE_ADMIN, ROLE_SUPERADMIN]))
-async def approve_command(message: types.Message):
-    """命令行通过审核"""
-    # 检查管理员权限
-    from app.utils.review_config import check_admin_permission
+async def _command_review(message: types.Message, status: str) -> None:
+    """命令行审核：/ap 与 /rj 共用，ID 支持区间与逗号分隔，多个ID在一个事务中批量审核"""
     from app.database.users import get_role
     from app.utils.roles import ROLE_SUPERADMIN
-    from app.database.business import is_feature_enabled
+    from app.database.business import is_feature_enabled, review_movie_requests, review_content_submissions
+    from app.utils.panel_utils import queue_review_notifications
+    from app.utils.review_utils import parse_id_list
+    from app.config.config import REVIEW_BULK_MAX_ITEMS
     
+    approve = status == "approved"
     try:
         role = await get_role(message.from_user.id)
         # 超管不受功能开关限制，普通管理员需要检查开关
@@ -864,165 +870,76 @@ async def approve_command(message: types.Message):
             return
         
         parts = message.text.strip().split()
-        if len(parts) < 3:
-            await message.reply(
-                "用法：/approve [类型] [ID] [留言] 或 /ap [类型] [ID] [留言]\n"
-                "示例：/ap movie 123 内容很好\n"
-                "类型：movie(求片) 或 content(投稿)"
-            )
+        if len(parts) < (3 if approve else 4):
+            if approve:
+                await message.reply(
+                    "用法：/approve [类型] [ID] [留言] 或 /ap [类型] [ID] [留言]\n"
+                    "示例：/ap movie 123 内容很好\n"
+                    "批量：/ap movie 120-125,130 内容很好\n"
+                    "类型：movie(求片) 或 content(投稿)"
+                )
+            else:
+                await message.reply(
+                    "用法：/reject [类型] [ID] [拒绝原因] 或 /rj [类型] [ID] [拒绝原因]\n"
+                    "示例：/rj movie 123 内容不符合要求\n"
+                    "批量：/rj movie 120-125,130 内容不符合要求\n"
+                    "类型：movie(求片) 或 content(投稿)"
+                )
             return
         
         item_type = parts[1].lower()
         try:
-            item_id = int(parts[2])
-        except ValueError:
-            await message.reply("❌ ID必须是数字")
+            item_ids = parse_id_list(parts[2], REVIEW_BULK_MAX_ITEMS)
+        except ValueError as e:
+            reason = str(e) if "最多" in str(e) else "ID必须是数字，可用 3-7,9 的形式指定多个"
+            await message.reply(f"❌ {reason}")
             return
         
-        review_note = " ".join(parts[3:]) if len(parts) > 3 else "通过审核"
+        if approve:
+            review_note = " ".join(parts[3:]) if len(parts) > 3 else "通过审核"
+        else:
+            review_note = " ".join(parts[3:])
         
         if item_type not in ['movie', 'content']:
             await message.reply("❌ 类型必须是 movie 或 content")
             return
         
-        # 执行审核
+        # 执行审核（只处理仍待审核的项目）
         if item_type == 'movie':
-            from app.database.business import review_movie_request, get_pending_movie_requests
-            success = await review_movie_request(item_id, message.from_user.id, "approved", review_note)
+            reviewed = await review_movie_requests(item_ids, message.from_user.id, status, review_note)
             type_text = "求片"
         else:
-            from app.database.business import review_content_submission, get_pending_content_submissions
-            success = await review_content_submission(item_id, message.from_user.id, "approved", review_note)
+            reviewed = await review_content_submissions(item_ids, message.from_user.id, status, review_note)
             type_text = "投稿"
         
-        if success:
-            # 发送通知
-            from app.utils.panel_utils import send_review_notification
-            from app.database.business import get_movie_requests_advanced, get_content_submissions_advanced
-            
-            # 获取项目信息用于通知
-            if item_type == 'movie':
-                data = await get_movie_requests_advanced(offset=0, limit=1000)
-                item = next((r for r in data['items'] if r.id == item_id), None)
-            else:
-                data = await get_content_submissions_advanced(offset=0, limit=1000)
-                item = next((s for s in data['items'] if s.id == item_id), None)
-            
-            if item:
-                # 通过category_id获取分类名称
-                from app.database.business import get_movie_category_by_id
-                category = await get_movie_category_by_id(item.category_id) if item.category_id else None
-                category_name = category.name if category else None
-                
-                if item_type == 'movie':
-                    await send_review_notification(
-                        message.bot, item.user_id, item_type, item.title, "approved", review_note,
-                        file_id=item.file_id, item_content=item.description, item_id=item.id,
-                        category_name=category_name
-                    )
-                else:
-                    await send_review_notification(
-                        message.bot, item.user_id, item_type, item.title, "approved", review_note,
-                        file_id=item.file_id, item_content=item.content, item_id=item.id,
-                        category_name=category_name
-                    )
-            
-            await message.reply(f"✅ 已通过{type_text} #{item_id}\n💬 留言：{review_note}")
-        else:
-            await message.reply(f"❌ 操作失败，请检查{type_text}ID是否正确")
-            
-    except Exception as e:
-        logger.error(f"命令行审核失败: {e}")
-        await message.reply("❌ 审核失败，请稍后重试")
-
-
-@review_center_router.message(Command("reject", "rj"), HasRole(superadmin_id=SUPERADMIN_ID, admins_id=ADMINS_ID, allow_roles=[ROLE_ADMIN, ROLE_SUPERADMIN]))
-async def reject_command(message: types.Message):
-    """命令行拒绝审核"""
-    # 检查管理员权限
-    from app.utils.review_config import check_admin_permission
-    from app.database.users import get_role
-    from app.utils.roles import ROLE_SUPERADMIN
-    from app.database.business import is_feature_enabled
-    
-    try:
-        role = await get_role(message.from_user.id)
-        # 超管不受功能开关限制，普通管理员需要检查开关
-        if role != ROLE_SUPERADMIN and not await is_feature_enabled("admin_panel_enabled"):
-            await message.reply("❌ 审核功能已关闭")
+        if not reviewed:
+            await message.reply(f"❌ 操作失败，请检查{type_text}ID是否正确（只能审核待审核的{type_text}）")
             return
         
-        parts = message.text.strip().split()
-        if len(parts) < 4:
-            await message.reply(
-                "用法：/reject [类型] [ID] [拒绝原因] 或 /rj [类型] [ID] [拒绝原因]\n"
-                "示例：/rj movie 123 内容不符合要求\n"
-                "类型：movie(求片) 或 content(投稿)"
-            )
-            return
-        
-        item_type = parts[1].lower()
-        try:
-            item_id = int(parts[2])
-        except ValueError:
-            await message.reply("❌ ID必须是数字")
-            return
-        
-        review_note = " ".join(parts[3:])
-        
-        if item_type not in ['movie', 'content']:
-            await message.reply("❌ 类型必须是 movie 或 content")
-            return
-        
-        # 执行审核
-        if item_type == 'movie':
-            from app.database.business import review_movie_request
-            success = await review_movie_request(item_id, message.from_user.id, "rejected", review_note)
-            type_text = "求片"
-        else:
-            from app.database.business import review_content_submission
-            success = await review_content_submission(item_id, message.from_user.id, "rejected", review_note)
-            type_text = "投稿"
+        queue_review_notifications(message.bot, item_type, reviewed, status, review_note)
         
-        if success:
-            # 发送通知
-            from app.utils.panel_utils import send_review_notification
-            from app.database.business import get_movie_requests_advanced, get_content_submissions_advanced
-            
-            # 获取项目信息用于通知
-            if item_type == 'movie':
-                data = await get_movie_requests_advanced(offset=0, limit=1000)
-                item = next((r for r in data['items'] if r.id == item_id), None)
-            else:
-                data = await get_content_submissions_advanced(offset=0, limit=1000)
-                item = next((s for s in data['items'] if s.id == item_id), None)
-            
-            if item:
-                # 通过category_id获取分类名称
-                from app.database.business import get_movie_category_by_id
-                category = await get_movie_category_by_id(item.category_id) if item.category_id else None
-                category_name = category.name if category else None
-                
-                if item_type == 'movie':
-                    await send_review_notification(
-                        message.bot, item.user_id, item_type, item.title, "rejected", review_note,
-                        file_id=item.file_id, item_content=item.description, item_id=item.id,
-                        category_name=category_name
-                    )
-                else:
-                    await send_review_notification(
-                        message.bot, item.user_id, item_type, item.title, "rejected", review_note,
-                        file_id=item.file_id, item_content=item.content, item_id=item.id,
-                        category_name=category_name
-                    )
-            
-            await message.reply(f"❌ 已拒绝{type_text} #{item_id}\n💬 原因：{review_note}")
-        else:
-            await message.reply(f"❌ 操作失败，请检查{type_text}ID是否正确")
+        reviewed_text = " ".join(f"#{item_id}" for item_id in reviewed)
+        skipped = sorted(set(item_ids) - set(reviewed))
+        text = (
+            f"{'✅ 已通过' if approve else '❌ 已拒绝'}{type_text} {reviewed_text}\n"
+            f"💬 {'留言' if approve else '原因'}：{review_note}"
+        )
+        if skipped:
+            text += f"\n⚠️ 已跳过（已审核或不存在）：{' '.join(f'#{item_id}' for item_id in skipped)}"
+        await message.reply(text)
             
     except Exception as e:
         logger.error(f"命令行审核失败: {e}")
         await message.reply("❌ 审核失败，请稍后重试")
 
 
-# 原有的投稿相关函数已被配置类统一处理，删除重复代码
\ No newline at end of file
+@review_center_router.message(Command("approve", "ap"), HasRole(superadmin_id=SUPERADMIN_ID, admins_id=ADMINS_ID, allow_roles=[ROLE_ADMIN, ROLE_SUPERADMIN]))
+async def approve_command(message: types.Message):
+    """命令行通过审核"""
+    await _command_review(message, "approved")
+
+
+@review_center_router.message(Command("reject", "rj"), HasRole(superadmin_id=SUPERADMIN_ID, admins_id=ADMINS_ID, allow_roles=[ROLE_ADMIN, ROLE_SUPERADMIN]))
+async def reject_command(message: types.Message):
+    """命令行拒绝审核"""
+    await _command_review(message, "rejected")
@@ -4,11 +4,11 @@ from aiogram.fsm.context import FSMContext
 from loguru import logger
 
 from app.utils.states import Wait
-from app.database.business import review_movie_request, review_content_submission, get_pending_movie_requests, get_pending_content_submissions
-from app.utils.panel_utils import send_review_notification, DEFAULT_WELCOME_PHOTO
+from app.database.business import review_movie_request, review_content_submission, get_movie_request_by_id, get_content_submission_by_id
+from app.utils.panel_utils import queue_review_notifications, DEFAULT_WELCOME_PHOTO
 from app.utils.debug_utils import (
     debug_log, debug_message_info, debug_state_info, debug_main_message_tracking,
-    debug_review_flow, debug_error, debug_function
+    debug_review_flow, debug_function
 )
 
 review_note_router = Router()
@@ -356,55 +356,29 @@ async def process_review_note(msg: types.Message, state: FSMContext):
 # skip_review_note 函数已删除，因为留言审核现在是必填的
 
 
-async def _update_review_center_panel(cb: types.CallbackQuery, movie_requests, content_submissions):
-    """更新审核中心主面板数据"""
-    text = "✅ <b>审核中心</b>\n\n"
-    text += f"🎬 待审核求片：{len(movie_requests)} 条\n"
-    text += f"📝 待审核投稿：{len(content_submissions)} 条\n\n"
-    text += "请选择要审核的类型："
-    
-    from app.buttons.users import admin_review_center_kb
-    
-    # 智能查找并更新主面板消息
-    current_message_id = cb.message.message_id
-    for offset in range(1, 10):
-        try:
-            potential_main_id = current_message_id - offset
-            await cb.bot.edit_message_caption(
-                chat_id=cb.message.chat.id,
-                message_id=potential_main_id,
-                caption=text,
-                reply_markup=admin_review_center_kb
-            )
-            logger.info(f"成功更新审核中心主面板消息 ID: {potential_main_id}")
-            return True
-        except Exception as e:
-            continue
-    
-    logger.warning("无法找到审核中心主面板消息进行更新")
-    return False
+# 留言流程在状态中使用的键，结束时只清除这些，保留审核列表视图与媒体消息记录
+_REVIEW_NOTE_KEYS = (
+    'review_type', 'review_id', 'review_action', 'review_note',
+    'action', 'item_id', 'item_type', 'message_id'
+)
 
 
-async def _send_current_page_media(cb: types.CallbackQuery, state: FSMContext, item_type: str, movie_requests, content_submissions):
-    """发送当前页的媒体消息"""
-    if item_type == 'movie':
-        from app.handlers.admins.review_center import _send_media_messages_for_movies
-        current_page_data = movie_requests[:5] if movie_requests else []
-        await _send_media_messages_for_movies(cb, state, current_page_data)
-    elif item_type == 'content':
-        from app.handlers.admins.review_center import _send_media_messages_for_content
-        current_page_data = content_submissions[:5] if content_submissions else []
-        await _send_media_messages_for_content(cb, state, current_page_data)
+async def _finish_review_note(state: FSMContext):
+    """结束留言流程"""
+    data = await state.get_data()
+    for key in _REVIEW_NOTE_KEYS:
+        data.pop(key, None)
+    await state.set_state(None)
+    await state.set_data(data)
 
 
-async def _return_to_review_list(cb: types.CallbackQuery, state: FSMContext, item_type: str):
-    """返回具体的审核列表"""
+def _review_handler(item_type: str):
+    """获取对应类型的审核处理器"""
     if item_type == 'movie':
         from app.handlers.admins.movie_review import movie_review_handler
-        await movie_review_handler.handle_review_list(cb, state)
-    elif item_type == 'content':
-        from app.handlers.admins.content_review import content_review_handler
-        await content_review_handler.handle_review_list(cb, state)
+        return movie_review_handler
+    from app.handlers.admins.content_review import content_review_handler
+    return content_review_handler
 
 
 @review_note_router.callback_query(F.data == "confirm_review_note")
@@ -444,13 +418,15 @@ async def cb_confirm_review_note(cb: types.CallbackQuery, state: FSMContext):
     # 先获取项目信息用于通知
     item = None
     if item_type == 'movie':
-        requests = await get_pending_movie_requests()
-        item = next((r for r in requests if r.id == item_id), None)
+        item = await get_movie_request_by_id(item_id)
+        if item and item.status != "pending":
+            item = None
         success = await review_movie_request(item_id, cb.from_user.id, review_action, review_note)
         type_text = "求片"
     elif item_type == 'content':
-        submissions = await get_pending_content_submissions()
-        item = next((s for s in submissions if s.id == item_id), None)
+        item = await get_content_submission_by_id(item_id)
+        if item and item.status != "pending":
+            item = None
         success = await review_content_submission(item_id, cb.from_user.id, review_action, review_note)
         type_text = "投稿"
     else:
@@ -461,48 +437,22 @@ async def cb_confirm_review_note(cb: types.CallbackQuery, state: FSMContext):
     if success:
         action_text = "通过" if review_action == "approved" else "拒绝"
         
-        # 发送通知给用户（包含留言）
+        # 通知用户（包含留言），交给后台队列发送
         if item:
-            # 通过category_id获取分类名称
-            from app.database.business import get_movie_category_by_id
-            category = await get_movie_category_by_id(item.category_id) if item.category_id else None
-            category_name = category.name if category else None
-            
-            if item_type == 'movie':
-                await send_review_notification(
-                    cb.bot, item.user_id, item_type, item.title, review_action, review_note,
-                    file_id=item.file_id, item_content=item.description, item_id=item.id,
-                    category_name=category_name
-                )
-            elif item_type == 'content':
-                await send_review_notification(
-                    cb.bot, item.user_id, item_type, item.title, review_action, review_note,
-                    file_id=item.file_id, item_content=item.content, item_id=item.id,
-                    category_name=category_name
-                )
-        
-        # 区分媒体消息审核和主面板审核的处理逻辑
-        note_preview = review_note[:30] + ('...' if len(review_note) > 30 else '') if review_note else "无留言"
+            queue_review_notifications(cb.bot, item_type, [item.id], review_action, review_note)
         
         # 获取主消息ID
         data = await state.get_data()
         main_message_id = data.get('main_message_id')
         current_message_id = cb.message.message_id
         
-        # 安全的媒体消息判断：必须同时满足三个条件
-        # 1. 当前消息有媒体内容
-        # 2. 当前消息ID不等于主消息ID
-        # 3. 主消息ID存在且有效
-        has_media_content = hasattr(cb.message, 'photo') or hasattr(cb.message, 'video') or hasattr(cb.message, 'document')
-        is_not_main_message = main_message_id and current_message_id != main_message_id
-        is_media_message = has_media_content and is_not_main_message
+        # 在媒体消息上留言审核时，当前消息不是主面板
+        is_media_message = bool(main_message_id) and current_message_id != main_message_id
         
         debug_review_flow(
             "消息类型判断",
             current_message_id=current_message_id,
             main_message_id=main_message_id,
-            has_media_content=has_media_content,
-            is_not_main_message=is_not_main_message,
             is_media_message=is_media_message
         )
         
@@ -510,152 +460,21 @@ async def cb_confirm_review_note(cb: types.CallbackQuery, state: FSMContext):
         await cb.answer(f"✅ 已{action_text}{type_text} {item_id}")
         
         if is_media_message:
-            # 媒体消息审核：安全删除当前媒体消息，然后刷新主面板数据
-            debug_review_flow("开始媒体消息审核流程", message_id=current_message_id)
-            
-            # 双重检查：确保不会删除主消息
-            if current_message_id == main_message_id:
-                debug_error("严重错误", "试图删除主消息！", message_id=current_message_id)
-                logger.error(f"🚨 严重错误：试图删除主消息 {current_message_id}！")
-                # 强制使用主面板处理逻辑
-                is_media_message = False
-            else:
-                # 安全删除当前媒体消息
-                try:
-                    debug_review_flow("删除媒体消息", message_id=current_message_id)
-                    await cb.message.delete()
-                    debug_review_flow("媒体消息删除成功", message_id=current_message_id)
-                except Exception as e:
-                    logger.warning(f"删除媒体消息失败 {current_message_id}: {e}")
-                
-                # 删除其他已发送的媒体消息
-                from app.utils.panel_utils import cleanup_sent_media_messages
-                await cleanup_sent_media_messages(cb.bot, state)
+            # 删除当前媒体消息（此时显示的是留言确认），并从已发送记录中移除
+            debug_review_flow("删除媒体消息", message_id=current_message_id)
+            try:
+                await cb.message.delete()
+            except Exception as e:
+                logger.warning(f"删除媒体消息失败 {current_message_id}: {e}")
+            sent_media_ids = [message_id for message_id in data.get('sent_media_ids', []) if message_id != current_message_id]
+            await state.update_data(sent_media_ids=sent_media_ids)
         
-        if is_media_message:
-            
-            # 媒体消息审核完成后，刷新主面板数据
-            # 获取状态中保存的主消息ID
-            data = await state.get_data()
-            main_message_id = data.get('main_message_id')
-            
-            if main_message_id:
-                # 直接编辑主面板消息来刷新数据
-                try:
-                    # 初始化变量
-                    items = []
-                    page_data = []
-                    text = ""
-                    keyboard = None
-                    
-                    # 导入必要的模块
-                    from app.utils.review_config import ReviewUIBuilder
-                    from app.utils.pagination import Paginator
-                    from app.config.config import REVIEW_PAGE_SIZE
-                    from app.buttons.users import admin_review_center_kb
-                    
-                    # 获取最新的待审核数据
-                    if item_type == 'movie':
-                        from app.handlers.admins.movie_review import movie_review_handler
-                        items = await get_pending_movie_requests()
-                        
-                        if items:
-                            paginator = Paginator(items, page_size=REVIEW_PAGE_SIZE)
-                            page_data = paginator.get_page_items(1)
-                            text = await ReviewUIBuilder.build_review_list_text(movie_review_handler.config, page_data, paginator, 1)
-                            keyboard = ReviewUIBuilder.build_review_list_keyboard(movie_review_handler.config, page_data, paginator, 1)
-                        else:
-                            text = f"🎬 <b>求片审核</b>\n\n暂无待审核的求片请求。"
-                            keyboard = admin_review_center_kb
-                            
-                    elif item_type == 'content':
-                        from app.handlers.admins.content_review import content_review_handler
-                        items = await get_pending_content_submissions()
-                        
-                        if items:
-                            paginator = Paginator(items, page_size=REVIEW_PAGE_SIZE)
-                            page_data = paginator.get_page_items(1)
-                            text = await ReviewUIBuilder.build_review_list_text(content_review_handler.config, page_data, paginator, 1)
-                            keyboard = ReviewUIBuilder.build_review_list_keyboard(content_review_handler.config, page_data, paginator, 1)
-                        else:
-                            text = f"📝 <b>投稿审核</b>\n\n暂无待审核的投稿请求。"
-                            keyboard = admin_review_center_kb
-                    
-                    # 尝试编辑主面板消息，如果失败则发送新消息
-                    try:
-                        await cb.bot.edit_message_caption(
-                            chat_id=cb.message.chat.id,
-                            message_id=main_message_id,
-                            caption=text,
-                            reply_markup=keyboard,
-                            parse_mode="HTML"
-                        )
-                        debug_review_flow("主面板消息编辑成功", message_id=main_message_id)
-                    except Exception as edit_error:
-                        debug_error("主面板消息编辑失败", str(edit_error), message_id=main_message_id)
-                        logger.warning(f"编辑主面板消息失败，发送新消息: {edit_error}")
-                        
-                        # 发送新的主面板消息
-                        new_main_message = await cb.bot.send_photo(
-                            chat_id=cb.message.chat.id,
-                            photo=DEFAULT_WELCOME_PHOTO,
-                            caption=text,
-                            reply_markup=keyboard,
-                            parse_mode="HTML"
-                        )
-                        
-                        # 更新主消息ID
-                        new_main_id = new_main_message.message_id
-                        await state.update_data(main_message_id=new_main_id)
-                        
-                        debug_main_message_tracking(
-                            "创建新主消息",
-                            old_id=main_message_id,
-                            new_id=new_main_id,
-                            reason="原主消息不存在"
-                        )
-                        debug_review_flow("新主面板消息创建成功", message_id=new_main_id)
-                    
-                    # 发送新的媒体消息（如果有待审核项目）
-                    if items and page_data:
-                        # 确保sent_media_ids列表是干净的，不包含主消息ID
-                        await state.update_data(sent_media_ids=[])
-                        
-                        if item_type == 'movie':
-                            await movie_review_handler._send_media_messages(cb, state, page_data)
-                        elif item_type == 'content':
-                            await content_review_handler._send_media_messages(cb, state, page_data)
-                        
-                except Exception as e:
-                    logger.error(f"刷新主面板失败: {e}")
-                    # 如果编辑失败，回退到原有逻辑
-                    await _return_to_review_list(cb, state, item_type)
-            else:
-                # 如果没有主消息ID，回退到原有逻辑
-                await _return_to_review_list(cb, state, item_type)
-        else:
-            # 主面板审核：安全处理主消息审核
-            debug_review_flow("开始主面板审核流程", message_id=current_message_id)
-            
-            # 确保当前消息是主消息
-            if current_message_id == main_message_id:
-                debug_review_flow("确认为主消息审核", message_id=current_message_id)
-            else:
-                debug_review_flow("非主消息的主面板审核", 
-                                current_id=current_message_id, 
-                                main_id=main_message_id)
-            
-            # 删除媒体消息，但保护主消息
-            from app.utils.panel_utils import cleanup_sent_media_messages
-            await cleanup_sent_media_messages(cb.bot, state)
-            
-            # 返回审核列表（可以直接编辑主面板消息）
-            await _return_to_review_list(cb, state, item_type)
+        # 主面板只移除这一项并补位，其余媒体消息保持不动
+        await _finish_review_note(state)
+        await _review_handler(item_type).refresh_after_review(cb, state, [item_id], review_action)
     else:
         await cb.answer("❌ 审核失败，请重试")
-    
-    await state.clear()
-    await cb.answer()
+        await _finish_review_note(state)
 
 
 @review_note_router.callback_query(F.data == "edit_review_note")
@@ -0,0 +1,182 @@
+from aiogram import types, F, Router
+from aiogram.filters import Command, StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from cachetools import TTLCache
+from loguru import logger
+import html
+
+from app.database.search import search_items, SEARCH_KINDS
+from app.utils.filters import HasRole
+from app.utils.roles import ROLE_ADMIN, ROLE_SUPERADMIN
+from app.utils.states import Wait
+from app.utils.time_utils import humanize_time, get_status_text
+from app.config import ADMINS_ID, SUPERADMIN_ID
+from app.config.config import SEARCH_PAGE_SIZE
+
+search_router = Router()
+
+# 每个管理员最近一次搜索：user_id -> (关键词, 类型或 None)，翻页与切换类型时复用
+_search_sessions = TTLCache(maxsize=1000, ttl=3600)
+
+# /search 首个参数可指定类型
+_KIND_ALIASES = {
+    "求片": "request", "request": "request", "movie": "request",
+    "投稿": "submission", "submission": "submission", "content": "submission",
+    "反馈": "feedback", "feedback": "feedback",
+}
+
+SEARCH_USAGE = (
+    "🔍 <b>全文搜索</b>\n\n"
+    "用法：/search [类型] 关键词\n"
+    "├ 类型可选：求片 / 投稿 / 反馈（默认全部）\n"
+    "├ 多个关键词用空格分隔，需同时匹配\n"
+    "└ 示例：/search 求片 流浪地球"
+)
+
+
+def parse_search_args(args: str) -> tuple[str, str | None]:
+    """解析 /search 参数，返回 (关键词, 类型)"""
+    parts = args.split(maxsplit=1)
+    if len(parts) == 2 and parts[0].lower() in _KIND_ALIASES:
+        return parts[1].strip(), _KIND_ALIASES[parts[0].lower()]
+    return args.strip(), None
+
+
+def build_search_keyboard(kind: str | None, page: int, total_pages: int) -> InlineKeyboardMarkup:
+    """构建搜索结果键盘：翻页 + 类型筛选"""
+    keyboard = []
+
+    nav_buttons = []
+    if page > 1:
+        nav_buttons.append(InlineKeyboardButton(text="◀️ 上页", callback_data=f"search_page_{page - 1}"))
+    nav_buttons.append(InlineKeyboardButton(text=f"📄 {page}/{max(total_pages, 1)}", callback_data="search_page_current"))
+    if page < total_pages:
+        nav_buttons.append(InlineKeyboardButton(text="▶️ 下页", callback_data=f"search_page_{page + 1}"))
+    keyboard.append(nav_buttons)
+
+    kind_buttons = [InlineKeyboardButton(text="✅ 全部" if kind is None else "全部", callback_data="search_kind_all")]
+    for value, label in SEARCH_KINDS.items():
+        kind_buttons.append(InlineKeyboardButton(
+            text=f"✅ {label}" if kind == value else label,
+            callback_data=f"search_kind_{value}"
+        ))
+    keyboard.append(kind_buttons)
+
+    keyboard.append([
+        InlineKeyboardButton(text="⬅️ 返回审核中心", callback_data="admin_review_center"),
+        InlineKeyboardButton(text="🔙 返回主菜单", callback_data="back_to_main")
+    ])
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+
+async def render_search_page(user_id: int, page: int = 1) -> tuple[str, InlineKeyboardMarkup] | None:
+    """执行当前管理员的搜索并渲染指定页，没有进行中的搜索时返回 None"""
+    session = _search_sessions.get(user_id)
+    if session is None:
+        return None
+    query, kind = session
+
+    page = max(page, 1)
+    hits, total = await search_items(
+        query, [kind] if kind else None, offset=(page - 1) * SEARCH_PAGE_SIZE, limit=SEARCH_PAGE_SIZE
+    )
+    total_pages = (total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+    if not hits and page > 1 and total_pages:
+        # 结果变少导致页码越界时回到最后一页
+        return await render_search_page(user_id, total_pages)
+
+    scope = SEARCH_KINDS.get(kind, "全部")
+    text = f"🔍 <b>搜索：</b>{html.escape(query)}（{scope}）\n"
+    text += f"共 {total} 条结果\n\n"
+    if not hits:
+        text += "没有找到匹配的内容，试试更换关键词。"
+
+    for i, hit in enumerate(hits, (page - 1) * SEARCH_PAGE_SIZE + 1):
+        title = html.escape(hit.title or "")
+        created = humanize_time(hit.created_at) if hit.created_at else "-"
+        text += f"{i}. [{SEARCH_KINDS[hit.kind]} #{hit.item_id}] <b>{title}</b>\n"
+        if hit.snippet:
+            text += f"   {hit.snippet}\n"
+        text += f"   {get_status_text(hit.status)} · 用户 {hit.user_id} · {created}\n\n"
+
+    return text, build_search_keyboard(kind, page, total_pages)
+
+
+async def start_search(message: types.Message, user_id: int, query: str, kind: str | None) -> None:
+    """记录搜索条件并发送第一页结果"""
+    _search_sessions[user_id] = (query, kind)
+    text, keyboard = await render_search_page(user_id, 1)
+    await message.answer(text, reply_markup=keyboard, parse_mode="HTML")
+
+
+@search_router.message(Command("search"), HasRole(superadmin_id=SUPERADMIN_ID, admins_id=ADMINS_ID, allow_roles=[ROLE_ADMIN, ROLE_SUPERADMIN]))
+async def search_command(message: types.Message):
+    """全文搜索求片、投稿与反馈"""
+    parts = (message.text or "").split(maxsplit=1)
+    query, kind = parse_search_args(parts[1]) if len(parts) > 1 else ("", None)
+    if not query:
+        await message.reply(SEARCH_USAGE, parse_mode="HTML")
+        return
+
+    try:
+        await start_search(message, message.from_user.id, query, kind)
+    except Exception as e:
+        logger.error(f"全文搜索失败: {e}")
+        await message.reply("❌ 搜索失败，请稍后重试")
+
+
+@search_router.message(StateFilter(Wait.waitSearchKeyword), ~F.text.startswith("/"))
+async def search_keyword_input(message: types.Message, state: FSMContext):
+    """高级浏览中点击“搜索”后输入的关键词（命令消息交给对应的命令处理器）"""
+    data = await state.get_data()
+    await state.clear()
+    query = (message.text or "").strip()
+    if not query:
+        await message.reply("❌ 请输入文字关键词")
+        return
+
+    try:
+        await start_search(message, message.from_user.id, query, data.get("search_kind"))
+    except Exception as e:
+        logger.error(f"全文搜索失败: {e}")
+        await message.reply("❌ 搜索失败，请稍后重试")
+
+
+@search_router.callback_query(F.data.startswith("search_page_"))
+async def cb_search_page(cb: types.CallbackQuery):
+    """搜索结果翻页"""
+    value = cb.data.removeprefix("search_page_")
+    if not value.isdigit():
+        await cb.answer()
+        return
+    await _show_search_page(cb, int(value))
+
+
+@search_router.callback_query(F.data.startswith("search_kind_"))
+async def cb_search_kind(cb: types.CallbackQuery):
+    """切换搜索类型"""
+    session = _search_sessions.get(cb.from_user.id)
+    if session is None:
+        await cb.answer("搜索已过期，请重新使用 /search", show_alert=True)
+        return
+    kind = cb.data.removeprefix("search_kind_")
+    _search_sessions[cb.from_user.id] = (session[0], kind if kind in SEARCH_KINDS else None)
+    await _show_search_page(cb, 1)
+
+
+async def _show_search_page(cb: types.CallbackQuery, page: int) -> None:
+    try:
+        rendered = await render_search_page(cb.from_user.id, page)
+        if rendered is None:
+            await cb.answer("搜索已过期，请重新使用 /search", show_alert=True)
+            return
+        text, keyboard = rendered
+        await cb.message.edit_text(text, reply_markup=keyboard, parse_mode="HTML")
+        await cb.answer()
+    except Exception as e:
+        if "message is not modified" in str(e):
+            await cb.answer()
+            return
+        logger.error(f"搜索翻页失败: {e}")
+        await cb.answer("❌ 加载失败，请稍后重试")
@@ -928,14 +928,14 @@ async def cb_image_view_all(cb: types.CallbackQuery):
         return
     
     from app.database.image_library import get_all_images
-    from app.config.image_config import IMAGE_LIST
+    from app.config.image_config import get_image_info
     
     try:
         # 获取数据库中的图片
         db_images = await get_all_images(limit=50)
         
         # 获取随机池中的图片
-        pool_images = IMAGE_LIST.copy()
+        pool_images = get_image_info()['image_list']
         
         # 创建数据库图片URL集合，用于检查重复
         db_urls = {img.image_url for img in db_images}
@@ -966,7 +966,7 @@ async def cb_image_view_all(cb: types.CallbackQuery):
             for i, url in enumerate(pool_only[:10], 1):
                 display_url = url[:45] + "..." if len(url) > 45 else url
                 text += f"{i}. 🎯 {display_url}\n"
-                text += "   📝 随机池图片（未保存到数据库）\n\n"
+                text += "   📝 内置图片（图片库中没有启用的图片时使用）\n\n"
             
             if len(pool_only) > 10:
                 text += f"... 还有 {len(pool_only) - 10} 张随机池图片\n\n"
@@ -1170,7 +1170,7 @@ async def img_info_command(msg: types.Message):
         await msg.reply("❌ 仅超管可使用此命令")
         return
     
-    from app.config.image_config import get_image_info, IMAGE_LIST
+    from app.config.image_config import get_image_info
     
     info = get_image_info()
     
@@ -1180,7 +1180,7 @@ async def img_info_command(msg: types.Message):
     text += f"📝 <b>说明</b>：{info['description']}\n\n"
     
     text += "🎯 <b>图片列表</b>：\n"
-    for i, img_url in enumerate(IMAGE_LIST, 1):
+    for i, img_url in enumerate(info['image_list'], 1):
         text += f"{i}. {img_url}\n\n"
     
     await msg.reply(text, parse_mode="HTML")
@@ -1188,7 +1188,7 @@ async def img_info_command(msg: types.Message):
 
 @superadmin_router.message(Command("img_add", "ia"))
 async def img_add_command(msg: types.Message):
-    """添加图片到随机池并保存到数据库"""
+    """添加图片到图片库（随机池随之重新加载）"""
     role = await get_role(msg.from_user.id)
     if role != ROLE_SUPERADMIN:
         await msg.reply("❌ 仅超管可使用此命令")
@@ -1204,31 +1204,19 @@ async def img_add_command(msg: types.Message):
     
     image_url = parts[1]
     
-    from app.config.image_config import add_image
     from app.database.image_library import save_image_url
     
     try:
-        # 添加到随机池
-        pool_success = add_image(image_url)
-        
-        # 保存到数据库
+        # 保存到图片库，提交后随机池自动重新加载
         db_record = await save_image_url(
             image_url=image_url,
             added_by=msg.from_user.id,
             description=f"通过命令添加到随机图片池"
         )
         
-        if pool_success or db_record:
-            status_text = ""
-            if pool_success and db_record:
-                status_text = "✅ 图片已添加到随机池并保存到数据库"
-            elif pool_success:
-                status_text = "✅ 图片已添加到随机池（数据库中已存在）"
-            elif db_record:
-                status_text = "✅ 图片已保存到数据库（随机池中已存在）"
-            
+        if db_record:
             await msg.reply(
-                f"<b>{status_text}</b>\n\n"
+                f"<b>✅ 图片已添加到图片库并加入随机池</b>\n\n"
                 f"🎯 <b>图片URL</b>：\n{image_url}\n\n"
                 f"⏰ <b>添加时间</b>：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
                 f"💡 <b>提示</b>：图片已加入系统，用户下次/start时可能随机到此图片",
@@ -1244,7 +1232,7 @@ async def img_add_command(msg: types.Message):
 
 @superadmin_router.message(Command("img_remove", "ir"))
 async def img_remove_command(msg: types.Message):
-    """从随机池和数据库中移除图片"""
+    """从图片库中删除图片（随机池随之重新加载）"""
     role = await get_role(msg.from_user.id)
     if role != ROLE_SUPERADMIN:
         await msg.reply("❌ 仅超管可使用此命令")
@@ -1260,34 +1248,22 @@ async def img_remove_command(msg: types.Message):
     
     image_url = parts[1]
     
-    from app.config.image_config import remove_image
     from app.database.image_library import delete_image_by_url
     
     try:
-        # 从随机池中移除
-        pool_success = remove_image(image_url)
-        
-        # 从数据库中删除
+        # 从图片库中删除，提交后随机池自动重新加载
         db_success = await delete_image_by_url(image_url)
         
-        if pool_success or db_success:
-            status_text = ""
-            if pool_success and db_success:
-                status_text = "✅ 图片已从随机池和数据库中移除"
-            elif pool_success:
-                status_text = "✅ 图片已从随机池中移除（数据库中不存在）"
-            elif db_success:
-                status_text = "✅ 图片已从数据库中删除（随机池中不存在）"
-            
+        if db_success:
             await msg.reply(
-                f"🗑️ <b>{status_text}</b>\n\n"
+                f"🗑️ <b>图片已从图片库和随机池中移除</b>\n\n"
                 f"🎯 <b>移除的图片</b>：\n{image_url}\n\n"
                 f"⏰ <b>移除时间</b>：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
                 f"💡 <b>提示</b>：使用该图片的用户会话已自动切换到其他图片",
                 parse_mode="HTML"
             )
         else:
-            await msg.reply("⚠️ 图片不存在或无法移除（随机池至少需要保留一张图片）")
+            await msg.reply("⚠️ 图片库中不存在该图片（内置图片无法移除）")
         
     except Exception as e:
         logger.error(f"移除图片失败: {e}")
@@ -11,11 +11,12 @@ from app.buttons.users import (
 )
 from app.buttons.panels import get_panel_for_role
 from app.database.business import get_server_stats
-from app.utils.group_utils import get_group_member_count, user_in_group_filter
+from app.utils.group_utils import user_in_group_filter, group_membership_cache, is_configured_group, MEMBER_STATUSES
 from app.utils.commands_catalog import build_commands_help
 from app.config.config import GROUP, BOT_NICKNAME
 from app.utils.panel_utils import create_welcome_panel_text, create_info_panel_text, DEFAULT_WELCOME_PHOTO
 from app.config.image_config import refresh_user_session_image, get_welcome_image
+from app.database.image_usage import image_usage_aggregator
 
 basic_router = Router()
 
@@ -61,6 +62,7 @@ async def start(msg: types.Message):
         reply_markup=kb,
         parse_mode="HTML"
     )
+    image_usage_aggregator.record(welcome_photo)
 
 
 @basic_router.callback_query(F.data == "user_toggle_busy")
@@ -127,7 +129,6 @@ async def cb_common_server_info(cb: types.CallbackQuery):
     """服务器信息"""
     try:
         stats = await get_server_stats()
-        member_count = await get_group_member_count(cb.bot)
         
         info_text = (
             f"🖥️ <b>服务信息</b> 🖥️\n\n"
@@ -298,4 +299,16 @@ async def handle_user_feedback_reply(msg: types.Message):
     except Exception as e:
         logger.error(f"处理用户反馈回复失败: {e}")
         await msg.reply("❌ 处理回复失败，请稍后重试或联系管理员")
-    
\ No newline at end of file
+    
+
+
+# 群组成员变动：机器人为 GROUP 管理员时可收到该更新，用于刷新成员验证缓存
+@basic_router.chat_member()
+async def on_group_member_updated(event: types.ChatMemberUpdated):
+    if not is_configured_group(event.chat):
+        return
+    
+    user_id = event.new_chat_member.user.id
+    is_member = event.new_chat_member.status in MEMBER_STATUSES
+    group_membership_cache.set(user_id, is_member)
+    logger.debug(f"群组成员状态更新: {user_id} -> {event.new_chat_member.status}")
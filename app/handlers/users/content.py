@@ -4,7 +4,7 @@ from aiogram.fsm.context import FSMContext
 from loguru import logger
 
 from app.utils.states import Wait
-from app.database.business import create_content_submission, get_user_content_submissions
+from app.database.business import create_content_submission, get_user_content_submissions, user_content_submissions_query
 from app.utils.submission_utils import SubmissionConfig, SubmissionHandler
 from app.utils.pagination import extract_page_from_callback
 
@@ -19,13 +19,15 @@ content_config = SubmissionConfig(
     feature_key='content_submit_enabled',
     create_function=create_content_submission,
     get_user_items_function=get_user_content_submissions,
+    user_items_query_function=user_content_submissions_query,
     title_state=Wait.waitContentTitle,
     content_state=Wait.waitContentBody,
     title_field='标题',
     content_field='body',
     content_label='内容',
     new_callback='content_submit_new',
-    my_callback='content_submit_my'
+    my_callback='content_submit_my',
+    data_tables=('content_submissions', 'movie_categories')
 )
 
 # 投稿处理器
@@ -4,7 +4,8 @@ from aiogram.fsm.context import FSMContext
 from loguru import logger
 
 from app.utils.states import Wait
-from app.database.business import create_movie_request, get_user_movie_requests
+from app.database.business import create_movie_request, get_user_movie_requests, user_movie_requests_query
+from app.database.duplicates import find_similar_requests
 from app.utils.submission_utils import SubmissionConfig, SubmissionHandler
 from app.utils.pagination import extract_page_from_callback
 
@@ -19,11 +20,14 @@ movie_config = SubmissionConfig(
     feature_key='movie_request_enabled',
     create_function=create_movie_request,
     get_user_items_function=get_user_movie_requests,
+    user_items_query_function=user_movie_requests_query,
     title_state=Wait.waitMovieTitle,
     content_state=Wait.waitMovieDescription,
     title_field='片名',
     content_field='description',
-    content_label='描述'
+    content_label='描述',
+    find_duplicates_function=find_similar_requests,
+    data_tables=('movie_requests', 'movie_categories')
 )
 
 # 求片处理器
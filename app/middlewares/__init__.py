@@ -1,2 +1,4 @@
 from .middlewares import *
 from .users import *
+from .outgoing import *
+from .database import *
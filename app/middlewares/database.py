@@ -0,0 +1,42 @@
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import Response, TelegramMethod
+from aiogram.types import TelegramObject
+
+from app.database.db import unit_of_work, commit_unit_of_work
+
+
+class UnitOfWorkMiddleware(BaseMiddleware):
+    """
+    工作单元中间件（挂载在 dp.update 的 outer_middleware 上）：
+    - 每个 update 只打开一个数据库会话，期间所有 helper 共用。
+    - helper 的写入在处理结束时统一提交一次。
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        async with unit_of_work():
+            return await handler(event, data)
+
+
+class CommitBeforeRequestMiddleware(BaseRequestMiddleware):
+    """
+    出站请求前结束工作单元的事务（挂载在 bot.session 上，需位于限速中间件之前）：
+    - 避免在等待 Telegram 响应（及限速排队）期间占用读写连接，只读的工作单元同样归还连接。
+    - 保证回复用户“成功”之前数据已经落库。
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot,
+        method: TelegramMethod,
+    ) -> Response:
+        await commit_unit_of_work()
+        return await make_request(bot, method)
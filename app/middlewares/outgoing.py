@@ -0,0 +1,114 @@
+import asyncio
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter, TelegramBadRequest
+from aiogram.methods import Response, TelegramMethod, SendPhoto, EditMessageMedia
+from aiogram.types import InputMediaPhoto, Message
+from loguru import logger
+
+from app.config.config import (
+    OUTGOING_GLOBAL_RATE, OUTGOING_PRIVATE_RATE, OUTGOING_PRIVATE_BURST,
+    OUTGOING_GROUP_RATE_PER_MINUTE, OUTGOING_GROUP_BURST, OUTGOING_MAX_RETRIES
+)
+from app.utils.rate_limiter import OutgoingScheduler, get_request_priority
+from app.utils.image_assets import image_asset_cache, is_remote_url
+
+# 需要计入全局速率的方法前缀（发送、编辑、删除类）
+_LIMITED_PREFIXES = ("send", "copy", "forward", "edit", "delete")
+# 需要计入单聊天速率的方法前缀（产生新消息的方法）
+_CHAT_LIMITED_PREFIXES = ("send", "copy", "forward")
+# file_id 失效时 Telegram 返回的错误信息片段
+_INVALID_FILE_ID_MARKERS = ("file identifier", "file_id", "file reference")
+
+
+class OutgoingRateLimitMiddleware(BaseRequestMiddleware):
+    """
+    出站请求限速中间件（挂载在 bot.session 上）：
+    - 发送类请求统一经过 OutgoingScheduler 排队，遵守全局与单聊天速率。
+    - 优先级来自上下文：交互响应 > 通知 > 群发。
+    - 收到 429 时暂停对应聊天并透明重试，业务代码无需处理。
+    """
+
+    def __init__(self, scheduler: OutgoingScheduler | None = None, max_retries: int = OUTGOING_MAX_RETRIES):
+        self.scheduler = scheduler or OutgoingScheduler(
+            global_rate=OUTGOING_GLOBAL_RATE,
+            private_rate=OUTGOING_PRIVATE_RATE,
+            private_burst=OUTGOING_PRIVATE_BURST,
+            group_rate_per_minute=OUTGOING_GROUP_RATE_PER_MINUTE,
+            group_burst=OUTGOING_GROUP_BURST,
+        )
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot,
+        method: TelegramMethod,
+    ) -> Response:
+        api_method = method.__api_method__
+        if not api_method.startswith(_LIMITED_PREFIXES):
+            return await make_request(bot, method)
+
+        target_chat = getattr(method, "chat_id", None)
+        chat_id = target_chat if api_method.startswith(_CHAT_LIMITED_PREFIXES) else None
+        priority = get_request_priority()
+
+        for attempt in range(self.max_retries + 1):
+            await self.scheduler.acquire(chat_id, priority)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"{api_method} 触发限流（chat={target_chat}），{e.retry_after} 秒后重试")
+                # 同一聊天的其他发送一并暂停
+                self.scheduler.pause(target_chat, e.retry_after)
+                await asyncio.sleep(e.retry_after)
+
+
+class ImageFileIdMiddleware(BaseRequestMiddleware):
+    """
+    图片 file_id 复用中间件（挂载在 bot.session 上）：
+    - send_photo / edit_media 的图片为外链 URL 且已有缓存时，改用 file_id 发送，Telegram 无需重新下载。
+    - 按 URL 发送成功后记录返回的 file_id。
+    - file_id 失效时清除缓存并透明地改用 URL 重发。
+    """
+
+    @staticmethod
+    def _photo_url(method: TelegramMethod):
+        if isinstance(method, SendPhoto):
+            return method.photo
+        if isinstance(method, EditMessageMedia) and isinstance(method.media, InputMediaPhoto):
+            return method.media.media
+        return None
+
+    @staticmethod
+    def _with_photo(method: TelegramMethod, photo: str) -> TelegramMethod:
+        if isinstance(method, SendPhoto):
+            return method.model_copy(update={"photo": photo})
+        return method.model_copy(update={"media": method.media.model_copy(update={"media": photo})})
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot,
+        method: TelegramMethod,
+    ) -> Response:
+        url = self._photo_url(method)
+        if not is_remote_url(url):
+            return await make_request(bot, method)
+
+        file_id = image_asset_cache.get(url)
+        if file_id is not None:
+            try:
+                return await make_request(bot, self._with_photo(method, file_id))
+            except TelegramBadRequest as e:
+                if not any(marker in e.message.lower() for marker in _INVALID_FILE_ID_MARKERS):
+                    raise
+                await image_asset_cache.forget(url)
+
+        response = await make_request(bot, method)
+        result = response.result
+        if isinstance(result, Message) and result.photo:
+            await image_asset_cache.remember(url, result.photo[-1].file_id)
+        return response
@@ -2,7 +2,8 @@ from typing import Any, Awaitable, Callable, Dict
 
 from aiogram import BaseMiddleware
 from aiogram.types import Message
-from app.database.users import add_user, update_last_acitivity, update_user_stats, update_user_behavior
+from app.database.users import add_user
+from app.database.activity import activity_aggregator
 from app.utils.user_info_collector import collect_and_store_user_info
 
 
@@ -43,9 +44,10 @@ class AddUser(BaseMiddleware):
 class UpdateLastAcivity(BaseMiddleware):
     """
     活跃时间更新中间件：
-    - 每次消息到达时更新用户的最近活跃时间。
-    - 更新用户统计信息（消息数、命令数）。
-    - 分析用户行为模式。
+    - 每次消息到达时记录用户的最近活跃时间。
+    - 累计用户统计信息（消息数、命令数）。
+    - 记录用户行为模式（最后命令、活跃时段）。
+    数据先在内存中聚合，由 activity_aggregator 后台批量写回数据库。
     """
 
     async def __call__(
@@ -54,25 +56,11 @@ class UpdateLastAcivity(BaseMiddleware):
         event: Message,
         data: Dict[str, Any],
     ) -> Any:
-        from datetime import datetime
-        
-        # 更新最后活动时间
-        await update_last_acitivity(event.chat.id)
-        
-        # 更新消息统计
-        await update_user_stats(event.chat.id, 'messages')
-        
-        # 如果是命令消息，更新命令统计
+        # 如果是命令消息，记录命令名
+        command = None
         if event.text and event.text.startswith('/'):
-            await update_user_stats(event.chat.id, 'commands')
-            
-            # 更新最后使用的命令
-            command = event.text.split()[0] if event.text else None
-            if command:
-                await update_user_behavior(event.chat.id, {'last_command': command})
-        
-        # 更新最活跃时间
-        current_hour = datetime.now().hour
-        await update_user_behavior(event.chat.id, {'most_active_hour': current_hour})
+            command = event.text.split()[0]
+
+        activity_aggregator.record(event.chat.id, command)
 
         return await handler(event, data)
@@ -1,6 +1,6 @@
-from typing import List, Any, Dict, Optional, Callable
+from typing import List, Any, Dict, Optional, Callable, Tuple
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from dataclasses import dataclass
 from loguru import logger
@@ -37,25 +37,67 @@ class BrowserState:
     current_page: int = 1
     config: BrowserConfig = None
     total_items: int = 0
+    # 加载当前页所用的游标与方向（刷新时原样重放，无需 OFFSET）
+    anchor_cursor: Optional[Tuple[Any, int]] = None
+    anchor_direction: str = "next"
     
     def __post_init__(self):
         if self.config is None:
             self.config = BrowserConfig()
 
 
+# ==================== 游标编码 ====================
+# 游标为 (排序字段值, id)，编码后放入回调数据（Telegram 限制 64 字节）：
+# 时间值编码为自 1970-01-01 起的微秒数（36 进制），NULL 编码为 "n"。
+
+_EPOCH = datetime(1970, 1, 1)
+_BASE36 = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _to_base36(number: int) -> str:
+    if number == 0:
+        return "0"
+    sign = "-" if number < 0 else ""
+    number = abs(number)
+    digits = []
+    while number:
+        number, remainder = divmod(number, 36)
+        digits.append(_BASE36[remainder])
+    return sign + "".join(reversed(digits))
+
+
+def encode_cursor(cursor: Tuple[Any, int]) -> str:
+    """将游标编码为回调数据片段"""
+    value, item_id = cursor
+    if value is None:
+        encoded_value = "n"
+    else:
+        encoded_value = _to_base36((value.replace(tzinfo=None) - _EPOCH) // timedelta(microseconds=1))
+    return f"{encoded_value}.{_to_base36(item_id)}"
+
+
+def decode_cursor(token: str) -> Tuple[Optional[datetime], int]:
+    """解析回调数据中的游标"""
+    encoded_value, encoded_id = token.split(".")
+    value = None if encoded_value == "n" else _EPOCH + timedelta(microseconds=int(encoded_value, 36))
+    return value, int(encoded_id, 36)
+
+
 class AdvancedBrowser:
     """高级数据浏览器"""
     
-    def __init__(self, data_source: Callable, default_config: BrowserConfig = None):
+    def __init__(self, data_source: Callable, default_config: BrowserConfig = None, search_kind: Optional[str] = None):
         """
         初始化高级浏览器
         
         Args:
             data_source: 数据源函数，接受 (offset, limit, sort_field, sort_order) 参数
             default_config: 默认配置
+            search_kind: 全文搜索类型（见 app.database.search），设置后导航键盘显示搜索按钮
         """
         self.data_source = data_source
         self.default_config = default_config or BrowserConfig()
+        self.search_kind = search_kind
         self.states: Dict[str, BrowserState] = {}  # 用户状态存储
     
     def get_user_state(self, user_id: str) -> BrowserState:
@@ -77,15 +119,34 @@ class AdvancedBrowser:
                 setattr(state.config, key, value)
         # 重置到第一页
         state.current_page = 1
+        state.anchor_cursor, state.anchor_direction = None, "next"
     
-    async def get_page_data(self, user_id: str, page: int = None) -> Dict[str, Any]:
-        """获取页面数据"""
+    async def get_page_data(
+        self,
+        user_id: str,
+        page: int = None,
+        cursor: Tuple[Any, int] = None,
+        direction: str = "next",
+        refresh_total: bool = False
+    ) -> Dict[str, Any]:
+        """
+        获取页面数据
+
+        Args:
+            page: 目标页码。配合 cursor 使用时仅用于显示；单独使用时按 offset 定位
+            cursor: 游标 (排序字段值, id)；direction 为 "next" 时取其后一页，"prev" 时取其前一页
+            direction: "next" / "prev" / "last"（最后一页，无需游标）
+            refresh_total: 是否重新统计总数（否则使用缓存）
+        """
         state = self.get_user_state(user_id)
         
-        if page is not None:
+        if page is None and cursor is None and direction == "next":
+            # 刷新：重放加载当前页所用的游标
+            cursor, direction = state.anchor_cursor, state.anchor_direction
+        elif page is not None:
             state.current_page = max(1, page)
         
-        # 计算偏移量
+        # 计算偏移量（仅在无游标时使用）
         offset = (state.current_page - 1) * state.config.page_size
         
         try:
@@ -94,32 +155,52 @@ class AdvancedBrowser:
                 offset=offset,
                 limit=state.config.page_size,
                 sort_field=state.config.sort_field.value,
-                sort_order=state.config.sort_order.value
+                sort_order=state.config.sort_order.value,
+                cursor=cursor,
+                direction=direction,
+                fresh_total=refresh_total
             )
             
             items = result.get('items', [])
             total_count = result.get('total', 0)
+            has_more = result.get('has_more', False)
             state.total_items = total_count
             
             # 计算页面信息
             total_pages = (total_count + state.config.page_size - 1) // state.config.page_size if total_count > 0 else 1
             
-            # 确保当前页面有效
-            if state.current_page > total_pages:
+            if direction == "last":
                 state.current_page = total_pages
-                return await self.get_page_data(user_id, state.current_page)
             
+            if direction in ("prev", "last"):
+                has_prev = has_more
+                has_next = direction == "prev"
+                if not has_prev:
+                    # 已回到开头（总数缓存可能略有偏差），页码以实际为准
+                    state.current_page = 1
+            else:
+                has_prev = state.current_page > 1
+                has_next = has_more
+                if not items and state.current_page > 1:
+                    # 当前页已无数据（被删除或页码越界），回到最后一页
+                    return await self.get_page_data(user_id, direction="last", refresh_total=True)
+            
+            state.anchor_cursor, state.anchor_direction = cursor, direction
+            
+            offset = (state.current_page - 1) * state.config.page_size
             return {
                 'items': items,
                 'page_info': {
                     'current_page': state.current_page,
-                    'total_pages': total_pages,
+                    'total_pages': max(total_pages, state.current_page),
                     'total_items': total_count,
                     'page_size': state.config.page_size,
-                    'has_prev': state.current_page > 1,
-                    'has_next': state.current_page < total_pages,
-                    'start_item': offset + 1 if total_count > 0 else 0,
-                    'end_item': min(offset + state.config.page_size, total_count)
+                    'has_prev': has_prev,
+                    'has_next': has_next,
+                    'start_item': offset + 1 if items else 0,
+                    'end_item': offset + len(items),
+                    'first_cursor': result.get('first_cursor'),
+                    'last_cursor': result.get('last_cursor')
                 },
                 'config': state.config
             }
@@ -136,7 +217,9 @@ class AdvancedBrowser:
                     'has_prev': False,
                     'has_next': False,
                     'start_item': 0,
-                    'end_item': 0
+                    'end_item': 0,
+                    'first_cursor': None,
+                    'last_cursor': None
                 },
                 'config': state.config
             }
@@ -161,12 +244,13 @@ class AdvancedBrowser:
                 callback_data=f"{callback_prefix}_page_1"
             ))
         
-        # 上一页按钮
+        # 上一页按钮（游标分页：以本页第一条为界向前取）
         if page_info['has_prev']:
-            nav_buttons.append(InlineKeyboardButton(
-                text="◀️ 上页",
-                callback_data=f"{callback_prefix}_page_{page_info['current_page'] - 1}"
-            ))
+            if page_info.get('first_cursor'):
+                prev_data = f"{callback_prefix}_seek_p{page_info['current_page'] - 1}_{encode_cursor(page_info['first_cursor'])}"
+            else:
+                prev_data = f"{callback_prefix}_page_{page_info['current_page'] - 1}"
+            nav_buttons.append(InlineKeyboardButton(text="◀️ 上页", callback_data=prev_data))
         
         # 页面信息按钮（可点击跳转）
         nav_buttons.append(InlineKeyboardButton(
@@ -174,18 +258,19 @@ class AdvancedBrowser:
             callback_data=f"{callback_prefix}_goto_page"
         ))
         
-        # 下一页按钮
+        # 下一页按钮（游标分页：以本页最后一条为界向后取）
         if page_info['has_next']:
-            nav_buttons.append(InlineKeyboardButton(
-                text="▶️ 下页",
-                callback_data=f"{callback_prefix}_page_{page_info['current_page'] + 1}"
-            ))
+            if page_info.get('last_cursor'):
+                next_data = f"{callback_prefix}_seek_n{page_info['current_page'] + 1}_{encode_cursor(page_info['last_cursor'])}"
+            else:
+                next_data = f"{callback_prefix}_page_{page_info['current_page'] + 1}"
+            nav_buttons.append(InlineKeyboardButton(text="▶️ 下页", callback_data=next_data))
         
-        # 末页按钮
+        # 末页按钮（反向扫描取最后一页，无需 OFFSET）
         if page_info['current_page'] < page_info['total_pages'] - 1:
             nav_buttons.append(InlineKeyboardButton(
                 text="⏭️ 末页",
-                callback_data=f"{callback_prefix}_page_{page_info['total_pages']}"
+                callback_data=f"{callback_prefix}_seek_last"
             ))
         
         if nav_buttons:
@@ -203,6 +288,11 @@ class AdvancedBrowser:
                     callback_data=f"{callback_prefix}_refresh"
                 )
             ]
+            if self.search_kind:
+                settings_buttons.append(InlineKeyboardButton(
+                    text="🔍 搜索",
+                    callback_data=f"{callback_prefix}_search"
+                ))
             keyboard.append(settings_buttons)
         
         # 返回按钮行
@@ -500,7 +590,7 @@ class AdvancedBrowser:
 
 
 # 便捷函数
-def create_browser_for_reviews(data_source_func: Callable) -> AdvancedBrowser:
+def create_browser_for_reviews(data_source_func: Callable, search_kind: Optional[str] = None) -> AdvancedBrowser:
     """为审核数据创建浏览器"""
     from app.config.config import ADVANCED_BROWSE_PAGE_SIZE
     default_config = BrowserConfig(
@@ -509,10 +599,10 @@ def create_browser_for_reviews(data_source_func: Callable) -> AdvancedBrowser:
         sort_order=SortOrder.ASC,
         visible_fields=['id', 'title', 'status', 'created_at', 'user_id']
     )
-    return AdvancedBrowser(data_source_func, default_config)
+    return AdvancedBrowser(data_source_func, default_config, search_kind)
 
 
-def create_browser_for_feedback(data_source_func: Callable) -> AdvancedBrowser:
+def create_browser_for_feedback(data_source_func: Callable, search_kind: Optional[str] = None) -> AdvancedBrowser:
     """为反馈数据创建浏览器"""
     from app.config.config import ADVANCED_BROWSE_PAGE_SIZE
     default_config = BrowserConfig(
@@ -521,7 +611,7 @@ def create_browser_for_feedback(data_source_func: Callable) -> AdvancedBrowser:
         sort_order=SortOrder.ASC,
         visible_fields=['id', 'feedback_type', 'status', 'created_at', 'user_id']
     )
-    return AdvancedBrowser(data_source_func, default_config)
+    return AdvancedBrowser(data_source_func, default_config, search_kind)
 
 
 def create_browser_for_users(data_source_func: Callable) -> AdvancedBrowser:
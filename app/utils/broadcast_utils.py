@@ -0,0 +1,233 @@
+"""
+群发引擎模块
+在后台按批次向所有用户复制公告消息：
+- 有界并发；限速与 429 retry_after 由出站限速中间件统一处理（群发优先级最低）
+- 网络/服务端错误退避重试
+- 仅移除已拉黑机器人或已注销的用户（批量删除）
+- 每批完成后持久化游标，崩溃重启后从断点继续
+- 定期编辑管理员处的进度消息
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramBadRequest, TelegramForbiddenError, TelegramNetworkError, TelegramServerError
+)
+from loguru import logger
+
+from app.database.admin import get_count_of_users, get_users_id_batch, remove_users
+from app.database.broadcast import create_broadcast_job, get_running_broadcast_jobs, update_broadcast_job
+from app.database.schema import BroadcastJob
+from app.utils.rate_limiter import set_request_priority, PRIORITY_BROADCAST
+from app.config.config import (
+    BROADCAST_CONCURRENCY, BROADCAST_BATCH_SIZE, BROADCAST_MAX_RETRIES, BROADCAST_PROGRESS_INTERVAL
+)
+
+# 单个用户的发送结果
+SENT = "sent"
+FAILED = "failed"
+REMOVE = "removed"
+RETRY = "retry"
+ABORT = "abort"
+
+# 表示用户已不可达、应当移除的错误描述
+_UNREACHABLE_MARKERS = ("chat not found", "user is deactivated", "peer_id_invalid", "user not found")
+
+
+def classify_send_error(error: Exception) -> str:
+    """
+    对发送异常分类
+
+    Returns:
+        REMOVE: 用户拉黑/注销，应移除
+        RETRY: 网络或服务端临时错误，可重试
+        ABORT: 源消息不可用，整个任务无法继续
+        FAILED: 其他错误，记为失败但保留用户
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return REMOVE
+    if isinstance(error, TelegramBadRequest):
+        message = str(error).lower()
+        if "message to copy not found" in message:
+            return ABORT
+        if any(marker in message for marker in _UNREACHABLE_MARKERS):
+            return REMOVE
+        return FAILED
+    if isinstance(error, (TelegramNetworkError, TelegramServerError)):
+        return RETRY
+    return FAILED
+
+
+def build_broadcast_progress_text(job_id: int, total: int, counts: Dict[str, int], status: str = "running") -> str:
+    """构建群发进度文本"""
+    processed = counts[SENT] + counts[FAILED] + counts[REMOVE]
+    percent = processed * 100 // total if total else 100
+    title = {
+        "running": "📢 <b>群发进行中</b>",
+        "completed": "✅ <b>发送完成</b>",
+        "failed": "❌ <b>群发已中止</b>",
+    }.get(status, "📢 <b>群发</b>")
+
+    return (
+        f"{title}（任务 #{job_id}）\n\n"
+        f"📊 进度：{processed}/{total}（{percent}%）\n"
+        f"💚成功：{counts[SENT]}\n"
+        f"⚠️失败：{counts[FAILED]}\n"
+        f"💔已移除：{counts[REMOVE]}"
+    )
+
+
+class BroadcastManager:
+    """群发任务管理器"""
+
+    def __init__(
+        self,
+        concurrency: int = BROADCAST_CONCURRENCY,
+        batch_size: int = BROADCAST_BATCH_SIZE,
+        max_retries: int = BROADCAST_MAX_RETRIES,
+        progress_interval: float = BROADCAST_PROGRESS_INTERVAL,
+    ):
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self._tasks: Dict[int, asyncio.Task] = {}
+
+    async def start(self, bot: Bot, admin_id: int, from_chat_id: int, message_id: int) -> Optional[BroadcastJob]:
+        """创建群发任务并在后台执行，立即返回"""
+        total = await get_count_of_users()
+        job = await create_broadcast_job(admin_id, from_chat_id, message_id, total)
+        if job is None:
+            return None
+
+        try:
+            progress = await bot.send_message(admin_id, f"开始向 {total} 位用户群发…（任务 #{job.id}）")
+            job.progress_message_id = progress.message_id
+            await update_broadcast_job(job.id, progress_message_id=progress.message_id)
+        except Exception as e:
+            logger.warning(f"发送群发进度消息失败: {e}")
+
+        self._spawn(bot, job)
+        return job
+
+    async def resume_unfinished(self, bot: Bot) -> int:
+        """恢复上次进程退出时未完成的群发任务"""
+        jobs = await get_running_broadcast_jobs()
+        for job in jobs:
+            if job.id not in self._tasks:
+                logger.info(f"恢复群发任务 #{job.id}，游标 {job.cursor_chat_id}")
+                self._spawn(bot, job)
+        return len(jobs)
+
+    def _spawn(self, bot: Bot, job: BroadcastJob) -> None:
+        task = asyncio.create_task(self._run(bot, job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+
+    async def _send(self, bot: Bot, job: BroadcastJob, chat_id: int, abort: asyncio.Event) -> str:
+        """向单个用户发送，临时错误退避重试（限速与 429 已由出站限速中间件处理）"""
+        for attempt in range(self.max_retries + 1):
+            if abort.is_set():
+                return FAILED
+            try:
+                await bot.copy_message(chat_id, job.from_chat_id, job.message_id)
+                return SENT
+            except Exception as e:
+                outcome = classify_send_error(e)
+                if outcome == ABORT:
+                    logger.error(f"群发任务 #{job.id} 源消息不可用: {e}")
+                    abort.set()
+                    return FAILED
+                if outcome == RETRY and attempt < self.max_retries:
+                    await asyncio.sleep(2 ** attempt)
+                    continue
+                if outcome != REMOVE:
+                    logger.warning(f"群发给 {chat_id} 失败: {e}")
+                return REMOVE if outcome == REMOVE else FAILED
+        return FAILED
+
+    async def _report(self, bot: Bot, job: BroadcastJob, counts: Dict[str, int], status: str = "running") -> None:
+        """编辑管理员处的进度消息"""
+        text = build_broadcast_progress_text(job.id, job.total, counts, status)
+        try:
+            if job.progress_message_id:
+                await bot.edit_message_text(text, chat_id=job.admin_id, message_id=job.progress_message_id)
+            elif status != "running":
+                await bot.send_message(job.admin_id, text)
+        except Exception as e:
+            if "message is not modified" not in str(e):
+                logger.warning(f"更新群发进度失败: {e}")
+
+    async def _run(self, bot: Bot, job: BroadcastJob) -> None:
+        """按批次执行群发"""
+        # 群发请求在出站调度中让位于交互响应与通知（仅作用于本任务）
+        set_request_priority(PRIORITY_BROADCAST)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        abort = asyncio.Event()
+        counts = {SENT: job.sent_count, FAILED: job.failed_count, REMOVE: job.removed_count}
+        cursor = job.cursor_chat_id
+        last_report = time.monotonic()
+
+        async def deliver(chat_id: int) -> tuple[int, str]:
+            async with semaphore:
+                return chat_id, await self._send(bot, job, chat_id, abort)
+
+        try:
+            while not abort.is_set():
+                chat_ids = await get_users_id_batch(cursor, self.batch_size)
+                if not chat_ids:
+                    break
+
+                results = await asyncio.gather(*(deliver(chat_id) for chat_id in chat_ids))
+                to_remove = [chat_id for chat_id, outcome in results if outcome == REMOVE]
+                counts[SENT] += sum(1 for _, outcome in results if outcome == SENT)
+                counts[FAILED] += sum(1 for _, outcome in results if outcome == FAILED)
+                counts[REMOVE] += len(to_remove)
+                await remove_users(to_remove)
+
+                # 整批完成后再推进游标：崩溃时最多重发一批
+                cursor = chat_ids[-1]
+                await update_broadcast_job(
+                    job.id,
+                    cursor_chat_id=cursor,
+                    sent_count=counts[SENT],
+                    failed_count=counts[FAILED],
+                    removed_count=counts[REMOVE]
+                )
+
+                if time.monotonic() - last_report >= self.progress_interval:
+                    await self._report(bot, job, counts)
+                    last_report = time.monotonic()
+
+            status = "failed" if abort.is_set() else "completed"
+            await update_broadcast_job(
+                job.id,
+                status=status,
+                error="源消息不可用" if abort.is_set() else None,
+                finished_at=datetime.now()
+            )
+            await self._report(bot, job, counts, status)
+            logger.info(f"群发任务 #{job.id} 结束（{status}）：{counts}")
+        except asyncio.CancelledError:
+            # 进程退出：任务保持 running，下次启动时从游标继续
+            logger.info(f"群发任务 #{job.id} 已暂停，游标 {cursor}")
+            raise
+        except Exception as e:
+            logger.error(f"群发任务 #{job.id} 异常: {e}")
+            await update_broadcast_job(job.id, status="failed", error=str(e), finished_at=datetime.now())
+            await self._report(bot, job, counts, "failed")
+
+    async def stop(self) -> None:
+        """停止所有进行中的任务（进度已持久化，可在重启后恢复）"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 全局实例
+broadcast_manager = BroadcastManager()
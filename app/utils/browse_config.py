@@ -1,11 +1,12 @@
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from dataclasses import dataclass
 
-from app.utils.pagination import Paginator, format_page_header
+from app.utils.pagination import QueryPaginator, format_page_header
 from app.utils.time_utils import humanize_time, get_status_text
-from app.utils.panel_utils import get_user_display_link, cleanup_sent_media_messages
+from app.utils.panel_utils import get_user_display_link, cleanup_sent_media_messages, send_photo_album
+from app.utils.render_cache import render_cache
 from loguru import logger
 
 
@@ -19,6 +20,8 @@ class BrowseConfig:
     get_all_items_function: Callable  # 获取所有项目的函数
     get_item_by_id_function: Callable  # 根据ID获取项目的函数
     page_callback_prefix: str  # 分页回调前缀
+    all_items_query_function: Callable = None  # 返回全部项目查询（select）的函数，用于数据库分页
+    data_tables: tuple = ()  # 列表内容依赖的表，用作渲染缓存的数据版本；为空时不缓存
     
 
 class BrowseUIBuilder:
@@ -172,10 +175,28 @@ class BrowseHandler:
         # 清理媒体消息
         await cleanup_sent_media_messages(cb.bot, state)
         
-        # 获取所有项目
-        items = await self.config.get_all_items_function()
+        # 只查询当前页；数据未变化时直接使用缓存的文本与附件，不查询数据库
+        from app.config.config import BROWSE_PAGE_SIZE
         
-        if not items:
+        async def render():
+            paginator = QueryPaginator(self.config.all_items_query_function(), page_size=BROWSE_PAGE_SIZE)
+            loaded_page = await paginator.load(page)
+            if paginator.total_items == 0:
+                return {'total': 0}
+            page_data = paginator.get_page_items(loaded_page)
+            page_info = paginator.get_page_info(loaded_page)
+            return {
+                'total': paginator.total_items,
+                'page_info': page_info,
+                'text': await BrowseUIBuilder.build_item_display_text_async(self.config, page_data, page_info),
+                'photos': await self._build_photos(page_data),
+            }
+        
+        rendered = await render_cache.get_or_render(
+            f"browse_{self.config.page_callback_prefix}", page, None, self.config.data_tables, render
+        )
+        
+        if rendered['total'] == 0:
             await cb.message.edit_caption(
                 caption=f"{self.config.emoji} <b>所有{self.config.name}</b>\n\n{self.config.emoji} 暂无{self.config.name}记录",
                 reply_markup=types.InlineKeyboardMarkup(
@@ -187,14 +208,8 @@ class BrowseHandler:
             await cb.answer()
             return
         
-        # 创建分页器
-        from app.config.config import BROWSE_PAGE_SIZE
-        paginator = Paginator(items, page_size=BROWSE_PAGE_SIZE)
-        page_data = paginator.get_page_items(page)
-        page_info = paginator.get_page_info(page)
-        
-        # 构建显示文本
-        text = await BrowseUIBuilder.build_item_display_text_async(self.config, page_data, page_info)
+        page_info = rendered['page_info']
+        text = rendered['text']
         
         # 构建键盘
         keyboard = BrowseUIBuilder.build_navigation_keyboard(self.config, page_info)
@@ -207,66 +222,60 @@ class BrowseHandler:
         )
         
         # 发送有媒体的项目
-        await self._send_media_messages(cb, state, page_data)
+        await self._send_media_messages(cb, state, rendered['photos'])
         
         await cb.answer()
     
-    async def _send_media_messages(self, cb: types.CallbackQuery, state: FSMContext, items: List[Any]):
-        """发送有媒体的项目消息"""
-        data = await state.get_data()
-        sent_media_ids = data.get('sent_media_ids', [])
-        
+    async def _build_photos(self, items: List[Any]) -> List[Tuple[str, str]]:
+        """构建本页有媒体的项目的相册内容：(图片 file_id, 说明文字)"""
+        photos = []
         for item in items:
             if hasattr(item, 'file_id') and item.file_id:
-                try:
-                    # 构建媒体消息文本（与审核界面保持一致）
-                    user_display = await get_user_display_link(item.user_id)
-                    status_text = get_status_text(item.status)
-                    
-                    # 获取类型信息
-                    category_name = "未知类型"
-                    if hasattr(item, 'category') and item.category:
-                        category_name = item.category.name
-                    
-                    title = getattr(item, self.config.title_field)
-                    media_text = (
-                        f"{self.config.emoji} <b>【{category_name}】{title}</b>\n\n"
-                        f"🆔 <b>{self.config.name}ID</b>：<code>{item.id}</code>\n"
-                        f"👤 <b>用户</b>：{user_display}\n"
-                        f"⏰ <b>时间</b>：<i>{humanize_time(item.created_at)}</i>\n"
-                        f"🏷️ <b>状态</b>：<code>{status_text}</code>\n"
-                    )
-                    
-                    # 添加内容信息
-                    content = getattr(item, self.config.content_field, None)
-                    if content:
-                        preview = content[:100] + "..." if len(content) > 100 else content
-                        if self.config.name == "求片":
-                            media_text += f"📝 <b>描述</b>：{preview}\n\n"
-                        else:
-                            media_text += f"📄 <b>内容</b>：{preview}\n\n"
+                # 构建媒体消息文本（与审核界面保持一致）
+                user_display = await get_user_display_link(item.user_id)
+                status_text = get_status_text(item.status)
+                
+                # 获取类型信息
+                category_name = "未知类型"
+                if hasattr(item, 'category') and item.category:
+                    category_name = item.category.name
+                
+                title = getattr(item, self.config.title_field)
+                media_text = (
+                    f"{self.config.emoji} <b>【{category_name}】{title}</b>\n\n"
+                    f"🆔 <b>{self.config.name}ID</b>：<code>{item.id}</code>\n"
+                    f"👤 <b>用户</b>：{user_display}\n"
+                    f"⏰ <b>时间</b>：<i>{humanize_time(item.created_at)}</i>\n"
+                    f"🏷️ <b>状态</b>：<code>{status_text}</code>\n"
+                )
+                
+                # 添加内容信息
+                content = getattr(item, self.config.content_field, None)
+                if content:
+                    preview = content[:100] + "..." if len(content) > 100 else content
+                    if self.config.name == "求片":
+                        media_text += f"📝 <b>描述</b>：{preview}\n\n"
                     else:
-                        if self.config.name == "求片":
-                            media_text += f"📝 <b>描述</b>：无\n\n"
-                        else:
-                            media_text += f"📄 <b>内容</b>：无\n\n"
-                    
-                    media_text += f"📎 <b>附件内容</b> ⬇️"
-                    
-                    # 发送媒体消息
-                    media_msg = await cb.message.answer_photo(
-                        photo=item.file_id,
-                        caption=media_text,
-                        parse_mode="HTML"
-                    )
-                    
-                    # 保存媒体消息ID
-                    sent_media_ids.append(media_msg.message_id)
-                    
-                except Exception as e:
-                    logger.error(f"发送{self.config.name}媒体消息失败: {e}")
+                        media_text += f"📄 <b>内容</b>：{preview}\n\n"
+                else:
+                    if self.config.name == "求片":
+                        media_text += f"📝 <b>描述</b>：无\n\n"
+                    else:
+                        media_text += f"📄 <b>内容</b>：无\n\n"
+                
+                media_text += f"📎 <b>附件内容</b> ⬇️"
+                photos.append((item.file_id, media_text))
+        return photos
+    
+    async def _send_media_messages(self, cb: types.CallbackQuery, state: FSMContext, photos: List[Tuple[str, str]]):
+        """把本页有媒体的项目作为一个相册发送"""
+        if not photos:
+            return
         
-        # 更新状态中的媒体消息ID列表
+        # 一个相册发送（失败时逐张发送），媒体消息ID一次写入状态
+        message_ids = await send_photo_album(cb.bot, cb.message.chat.id, photos)
+        data = await state.get_data()
+        sent_media_ids = data.get('sent_media_ids', []) + [message_id for message_id in message_ids if message_id]
         await state.update_data(sent_media_ids=sent_media_ids, chat_id=cb.from_user.id)
 
 
@@ -278,7 +287,8 @@ MOVIE_BROWSE_CONFIG = BrowseConfig(
     content_field="description",
     get_all_items_function=None,  # 将在使用时设置
     get_item_by_id_function=None,  # 将在使用时设置
-    page_callback_prefix="all_movie"
+    page_callback_prefix="all_movie",
+    data_tables=("movie_requests", "movie_categories", "users")
 )
 
 CONTENT_BROWSE_CONFIG = BrowseConfig(
@@ -288,5 +298,6 @@ CONTENT_BROWSE_CONFIG = BrowseConfig(
     content_field="content",
     get_all_items_function=None,  # 将在使用时设置
     get_item_by_id_function=None,  # 将在使用时设置
-    page_callback_prefix="all_content"
+    page_callback_prefix="all_content",
+    data_tables=("content_submissions", "movie_categories", "users")
 )
\ No newline at end of file
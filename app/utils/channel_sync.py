@@ -0,0 +1,191 @@
+"""
+频道同步投递模块
+后台任务从发件箱（channel_posts）领取到期的记录，每条内容只渲染一次，并发投递到各个频道：
+- 出站请求经过 OutgoingRateLimitMiddleware，遵守全局与单频道速率，429 由中间件透明重试
+- 投递失败按指数退避重试，超过最大次数后标记为失败
+- 投递成功后记录频道中的消息ID
+
+审核事务提交后立即唤醒；没有新记录时休眠到最早一条重试到期。
+停止时等待已领取的一批投递完成，不会留下发送结果未知的记录。
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from app.database.business import get_movie_requests_by_ids, get_content_submissions_by_ids
+from app.database.channel_outbox import (
+    add_outbox_listener, claim_due_posts, get_next_due_time,
+    mark_post_sent, mark_post_retry, mark_post_failed, recover_interrupted_posts
+)
+from app.database.schema import ChannelPost
+from app.database.users import get_user
+from app.utils.panel_utils import build_channel_post_text, format_channel_contributor
+from app.utils.rate_limiter import set_request_priority, PRIORITY_NOTIFICATION
+from app.config.config import (
+    CHANNEL_SYNC_MAX_ATTEMPTS, CHANNEL_SYNC_RETRY_BASE, CHANNEL_SYNC_RETRY_MAX,
+    CHANNEL_SYNC_BATCH_SIZE, CHANNEL_SYNC_POLL_INTERVAL
+)
+
+# 各类型的批量加载函数
+_ITEM_LOADERS = {
+    'movie': get_movie_requests_by_ids,
+    'content': get_content_submissions_by_ids,
+}
+
+
+class ChannelSyncWorker:
+    """频道同步投递任务"""
+
+    def __init__(
+        self,
+        batch_size: int = CHANNEL_SYNC_BATCH_SIZE,
+        max_attempts: int = CHANNEL_SYNC_MAX_ATTEMPTS,
+        retry_base: float = CHANNEL_SYNC_RETRY_BASE,
+        retry_max: float = CHANNEL_SYNC_RETRY_MAX,
+        poll_interval: float = CHANNEL_SYNC_POLL_INTERVAL,
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.poll_interval = poll_interval
+        self._bot = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.sent = 0
+        self.failed = 0
+        add_outbox_listener(self.notify)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def notify(self) -> None:
+        """有新的待投递记录（审核事务提交后调用）"""
+        self._wakeup.set()
+
+    def retry_delay(self, attempts: int) -> float:
+        """第 attempts 次失败后的等待时间（秒）"""
+        return min(self.retry_base * 2 ** max(attempts - 1, 0), self.retry_max)
+
+    async def _render(self, posts) -> Dict[Tuple[str, int], Tuple[str, Optional[str]]]:
+        """按内容渲染频道消息：(类型, ID) -> (文本, 图片 file_id)；内容不存在或已不是通过状态时不包含"""
+        ids_by_type: Dict[str, set] = {}
+        for post in posts:
+            ids_by_type.setdefault(post.item_type, set()).add(post.item_id)
+
+        rendered = {}
+        for item_type, item_ids in ids_by_type.items():
+            loader = _ITEM_LOADERS.get(item_type)
+            if loader is None:
+                continue
+            for item in await loader(sorted(item_ids)):
+                if item.status != "approved":
+                    continue
+                user = await get_user(item.user_id)
+                text = build_channel_post_text(
+                    item_type, item.title, format_channel_contributor(user, item.user_id),
+                    item.category.name if item.category else None, item.reviewed_at
+                )
+                rendered[(item_type, item.id)] = (text, item.file_id)
+        return rendered
+
+    async def _deliver(self, post: ChannelPost, rendered: Optional[Tuple[str, Optional[str]]]) -> None:
+        """投递一条记录并写回结果"""
+        if rendered is None:
+            self.failed += 1
+            await mark_post_failed(post.id, "内容不存在或已不是通过状态")
+            return
+
+        text, file_id = rendered
+        try:
+            if file_id:
+                message = await self._bot.send_photo(chat_id=post.channel, photo=file_id, caption=text, parse_mode="HTML")
+            else:
+                message = await self._bot.send_message(chat_id=post.channel, text=text, parse_mode="HTML")
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if post.attempts >= self.max_attempts:
+                self.failed += 1
+                logger.error(f"同步 {post.item_type}#{post.item_id} 到频道 {post.channel} 失败，已尝试 {post.attempts} 次，不再重试: {e}")
+                await mark_post_failed(post.id, error)
+                return
+            # 429 已由出站限速中间件暂停并重试，到这里的都按普通失败退避
+            delay = self.retry_delay(post.attempts)
+            logger.warning(f"同步 {post.item_type}#{post.item_id} 到频道 {post.channel} 失败，{delay:.0f} 秒后重试: {e}")
+            await mark_post_retry(post.id, error, datetime.now() + timedelta(seconds=delay))
+            return
+
+        self.sent += 1
+        await mark_post_sent(post.id, message.message_id)
+
+    async def _deliver_batch(self, posts) -> None:
+        """渲染一批记录并并发投递到各频道"""
+        try:
+            rendered = await self._render(posts)
+        except Exception as e:
+            # 渲染失败时整批稍后重试，不留下已领取未发送的记录
+            logger.error(f"渲染频道消息失败: {e}")
+            retry_at = datetime.now() + timedelta(seconds=self.retry_delay(1))
+            for post in posts:
+                await mark_post_retry(post.id, f"渲染失败: {e}", retry_at)
+            return
+
+        await asyncio.gather(
+            *(self._deliver(post, rendered.get((post.item_type, post.item_id))) for post in posts),
+            return_exceptions=True
+        )
+
+    async def _wait(self) -> None:
+        """休眠到被唤醒或最早一条重试到期"""
+        timeout = self.poll_interval
+        next_due = await get_next_due_time()
+        if next_due is not None:
+            timeout = min(timeout, max((next_due - datetime.now()).total_seconds(), 1))
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run(self) -> None:
+        # 频道同步在出站调度中让位于交互响应
+        set_request_priority(PRIORITY_NOTIFICATION)
+        await recover_interrupted_posts()
+        while not self._stopping:
+            # 先清除唤醒标记再领取，领取期间提交的新记录不会被漏掉
+            self._wakeup.clear()
+            try:
+                posts = await claim_due_posts(self.batch_size)
+                if posts:
+                    await self._deliver_batch(posts)
+                    continue
+                await self._wait()
+            except Exception as e:
+                logger.error(f"频道同步投递异常: {e}")
+                await asyncio.sleep(self.retry_base)
+
+    def start(self, bot) -> None:
+        """启动投递任务"""
+        self._bot = bot
+        if not self.running:
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+            logger.info("频道同步投递任务已启动")
+
+    async def stop(self) -> None:
+        """停止投递：等待已领取的一批投递完成，其余记录保留到下次启动"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._stopping = True
+        self._wakeup.set()
+        await task
+        logger.info(f"频道同步投递任务已停止（成功 {self.sent} / 失败 {self.failed}）")
+
+
+# 全局实例
+channel_sync = ChannelSyncWorker()
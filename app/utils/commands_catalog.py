@@ -26,6 +26,7 @@ def build_commands_help(role: str) -> str:
             "/users — 用户总数\n"
             "/info <chat_id> — 查询用户\n"
             "/announce — 群发公告\n"
+            "/search [类型] 关键词 — 全文搜索求片/投稿/反馈\n"
         )
         sections.append(admin_block)
 
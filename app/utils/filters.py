@@ -1,7 +1,7 @@
 from typing import Union
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
-from app.database.users import get_busy
+from app.database.users import get_busy, get_role
 from app.utils.roles import ROLE_ADMIN, ROLE_SUPERADMIN
 
 
@@ -54,10 +54,10 @@ class IsAdmin(BaseFilter):
 class HasRole(BaseFilter):
     """角色过滤器：根据用户在环境变量名单或数据库角色进行判定。
 
-    简化实现：
+    判定顺序：
     - 如果配置了 ADMINS_ID，则仍旧兼容旧逻辑用于管理员与超管。
     - 对于超管，仅允许唯一的 ID（ENV: SUPERADMIN_ID）。
-    - 未来可扩展为从数据库读取用户角色。
+    - 最后读取数据库角色（经角色缓存，不会每次更新都查询数据库）。
     """
 
     def __init__(self, superadmin_id: int | None = None, admins_id: list[int] | None = None, allow_roles: list[str] | None = None) -> None:
@@ -82,4 +82,5 @@ class HasRole(BaseFilter):
         if not self.allow_roles or "user" in self.allow_roles:
             return True
 
-        return False
+        # 数据库角色（如通过 /add_admin 提升的管理员）
+        return await get_role(user_id) in self.allow_roles
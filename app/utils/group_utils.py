@@ -1,45 +1,141 @@
+import asyncio
 from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from cachetools import TTLCache
 from loguru import logger
-from app.config.config import GROUP
+from app.config.config import GROUP, GROUP_MEMBER_CACHE_TTL, GROUP_NONMEMBER_CACHE_TTL
 
+# 视为群组成员的状态
+MEMBER_STATUSES = {"member", "administrator", "creator"}
 
-async def user_in_group_filter(bot: Bot, user_id: int) -> bool:
+
+class GroupMembershipCache:
     """
-    检查用户是否在指定群组中
-    :param bot: aiogram 的 Bot 实例
-    :param user_id: 用户 ID
-    :return: bool
+    群组成员验证缓存：
+    - 成员与非成员分别使用不同的 TTL（非成员较短，便于刚加群的用户尽快通过）。
+    - 同一用户的并发查询合并为一次 get_chat_member 请求（single-flight）。
+    - 收到群组 chat_member 更新时直接写入最新状态。
     """
-    if not GROUP:
-        # 如果没有设置群组，则默认通过验证
-        return True
-        
+
+    def __init__(self, positive_ttl: float = GROUP_MEMBER_CACHE_TTL, negative_ttl: float = GROUP_NONMEMBER_CACHE_TTL, maxsize: int = 50_000):
+        self._members = TTLCache(maxsize=maxsize, ttl=positive_ttl)
+        self._non_members = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+        self._inflight: dict[int, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, user_id: int) -> bool | None:
+        """读取缓存结果，未命中返回 None"""
+        if user_id in self._members:
+            return True
+        if user_id in self._non_members:
+            return False
+        return None
+
+    def set(self, user_id: int, is_member: bool) -> None:
+        """写入成员状态"""
+        if is_member:
+            self._non_members.pop(user_id, None)
+            self._members[user_id] = True
+        else:
+            self._members.pop(user_id, None)
+            self._non_members[user_id] = True
+
+    def invalidate(self, user_id: int) -> None:
+        """移除用户的缓存状态"""
+        self._members.pop(user_id, None)
+        self._non_members.pop(user_id, None)
+
+    def stats(self) -> dict:
+        """命中率统计"""
+        total = self.hits + self.misses
+        return {
+            "members": len(self._members),
+            "non_members": len(self._non_members),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+    async def check(self, bot: Bot, user_id: int) -> bool:
+        """查询用户是否在群组中（优先读取缓存）"""
+        cached = self.get(user_id)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        # 已有相同用户的查询在进行中，等待其结果
+        inflight = self._inflight.get(user_id)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[user_id] = future
+        try:
+            is_member = await _fetch_membership(bot, user_id, self)
+            future.set_result(is_member)
+            return is_member
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 避免无人等待时出现 "exception was never retrieved" 警告
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(user_id, None)
+
+
+async def _fetch_membership(bot: Bot, user_id: int, cache: GroupMembershipCache) -> bool:
+    """向 Telegram 查询成员状态并写入缓存"""
     try:
         # 支持群组用户名（@开头）和群组ID（数字）
         chat_id = GROUP if GROUP.startswith('@') else f'@{GROUP}'
         member = await bot.get_chat_member(chat_id, user_id)
-        # 如果能拿到状态就说明在群里
-        return member.status in {"member", "administrator", "creator"}
+    except TelegramBadRequest as e:
+        # 用户不在群里或群不存在，按非成员缓存
+        logger.warning(f"⚠️ 检查群组成员失败: {e}")
+        cache.set(user_id, False)
+        return False
     except Exception as e:
-        # 如果报错，大多数情况是用户不在群里或者群不存在
+        # 网络等临时错误不写入缓存，下次重新查询
         logger.warning(f"⚠️ 检查群组成员失败: {e}")
         return False
 
+    # 如果能拿到状态就说明在群里
+    is_member = member.status in MEMBER_STATUSES
+    cache.set(user_id, is_member)
+    return is_member
+
+
+# 全局实例
+group_membership_cache = GroupMembershipCache()
+
+
+def is_configured_group(chat) -> bool:
+    """判断聊天是否为配置的 GROUP 群组"""
+    if not GROUP:
+        return False
+    name = GROUP.lstrip('@')
+    if chat.username and chat.username.lower() == name.lower():
+        return True
+    return str(chat.id) == name
+
 
-async def get_group_member_count(bot: Bot) -> int:
+async def user_in_group_filter(bot: Bot, user_id: int) -> bool:
     """
-    获取群组成员数量
+    检查用户是否在指定群组中（带缓存）
     :param bot: aiogram 的 Bot 实例
-    :return: 成员数量，失败返回0
+    :param user_id: 用户 ID
+    :return: bool
     """
     if not GROUP:
-        return 0
+        # 如果没有设置群组，则默认通过验证
+        return True
         
-    try:
-        chat_id = GROUP if GROUP.startswith('@') else f'@{GROUP}'
-        # 使用get_chat_member_count方法获取成员数量
-        member_count = await bot.get_chat_member_count(chat_id)
-        return member_count or 0
-    except Exception as e:
-        logger.warning(f"⚠️ 获取群组成员数量失败: {e}")
-        return 0
\ No newline at end of file
+    return await group_membership_cache.check(bot, user_id)
\ No newline at end of file
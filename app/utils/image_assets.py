@@ -0,0 +1,121 @@
+"""
+图片 file_id 缓存模块
+面板图片配置的是外链 URL，每次按 URL 发送时 Telegram 都要重新下载一次远程图片，既慢又受图床稳定性影响。
+首次上传后记录 Telegram 返回的 file_id（图片库中的图片持久化到 image_library），之后的发送直接复用：
+- 出站请求经过 ImageFileIdMiddleware，send_photo / edit_media 中的 URL 自动替换为缓存的 file_id
+- file_id 失效时清除缓存并改用 URL 重发，重发成功后记录新的 file_id
+- 启动时在后台把图片池中的图片预先上传一遍（发到预热聊天后立即删除），用户首次 /start 也不用等图床
+"""
+
+import asyncio
+from typing import Dict, Optional
+
+from loguru import logger
+
+from app.database.image_library import get_cached_file_ids, save_image_file_id
+from app.utils.rate_limiter import set_request_priority, PRIORITY_BROADCAST
+from app.config.config import IMAGE_WARM_UP_CHAT_ID
+
+
+def is_remote_url(value) -> bool:
+    """是否为需要 Telegram 下载的外链地址"""
+    return isinstance(value, str) and value.startswith(("http://", "https://"))
+
+
+class ImageAssetCache:
+    """图片 URL -> Telegram file_id 缓存"""
+
+    def __init__(self, warm_up_chat_id=IMAGE_WARM_UP_CHAT_ID):
+        self.warm_up_chat_id = warm_up_chat_id
+        self._file_ids: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.uploads = 0
+        self.invalidated = 0
+
+    def get(self, url: str) -> Optional[str]:
+        """已缓存的 file_id，没有时返回 None"""
+        file_id = self._file_ids.get(url)
+        if file_id is not None:
+            self.hits += 1
+        return file_id
+
+    async def remember(self, url: str, file_id: str) -> None:
+        """记录上传后得到的 file_id"""
+        if self._file_ids.get(url) == file_id:
+            return
+        self._file_ids[url] = file_id
+        self.uploads += 1
+        await save_image_file_id(url, file_id)
+
+    async def forget(self, url: str) -> None:
+        """清除失效的 file_id，下次发送改用 URL"""
+        if self._file_ids.pop(url, None) is None:
+            return
+        self.invalidated += 1
+        logger.warning(f"图片 file_id 已失效，改用 URL 重新上传: {url}")
+        await save_image_file_id(url, None)
+
+    async def load(self) -> None:
+        """从图片库加载已持久化的 file_id"""
+        self._file_ids.update(await get_cached_file_ids())
+        logger.info(f"已加载 {len(self._file_ids)} 个图片 file_id")
+
+    async def warm_up(self, bot) -> int:
+        """
+        把图片池中尚未缓存 file_id 的图片逐个上传到预热聊天并立即删除
+
+        只预热图片池当前使用的图片：内置图片已写入图片库，file_id 会持久化；
+        图片库为空、回退到内置图片时，其 file_id 只在内存中，每次启动都会重新预热。
+        """
+        from app.utils.image_pool import image_pool
+
+        # 预热在出站调度中让位于交互响应
+        set_request_priority(PRIORITY_BROADCAST)
+        urls = list(dict.fromkeys(image_pool.urls()))
+        pending = [url for url in urls if url not in self._file_ids]
+        warmed = 0
+        for url in pending:
+            try:
+                # 上传结果由 ImageFileIdMiddleware 记录
+                message = await bot.send_photo(chat_id=self.warm_up_chat_id, photo=url, disable_notification=True)
+                warmed += 1
+            except Exception as e:
+                logger.warning(f"预热图片失败: {url}: {e}")
+                continue
+            try:
+                await bot.delete_message(chat_id=self.warm_up_chat_id, message_id=message.message_id)
+            except Exception as e:
+                logger.debug(f"删除预热图片消息失败: {e}")
+        if pending:
+            logger.info(f"图片预热完成：{warmed}/{len(pending)} 张")
+        return warmed
+
+    async def start(self, bot) -> None:
+        """加载已缓存的 file_id，并在后台预热其余图片"""
+        await self.load()
+        if self.warm_up_chat_id is None:
+            logger.info("未配置图片预热聊天，跳过图片预热")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.warm_up(bot))
+
+    async def stop(self) -> None:
+        """停止仍在进行的预热"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "cached": len(self._file_ids),
+            "hits": self.hits,
+            "uploads": self.uploads,
+            "invalidated": self.invalidated,
+        }
+
+
+# 全局实例
+image_asset_cache = ImageAssetCache()
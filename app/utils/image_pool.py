@@ -0,0 +1,170 @@
+"""
+随机图片池模块
+面板图片统一来自图片库（image_library）中启用的图片，启动时整体加载到内存：
+- 随机取图 O(1)：均匀抽样直接按下标取，加权抽样使用别名表（Alias Method）
+- 图片增删、启用/禁用提交后自动重新加载；按使用次数加权时，使用次数每次写回后也重新加载以更新权重
+- 用户会话图片（同一会话内面板保持同一张图）存放在容量有限的 LRU 中
+
+内置图片（image_config.IMAGE_LIST）在 init_db 时写入图片库，图片库中没有启用的图片时也用它兜底。
+"""
+
+import asyncio
+import math
+import random
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+from cachetools import LRUCache
+from loguru import logger
+
+from app.database.image_library import get_pool_images, add_image_library_listener
+from app.database.image_usage import image_usage_aggregator
+from app.config.image_config import IMAGE_LIST
+from app.config.config import IMAGE_POOL_WEIGHTING, IMAGE_POOL_RECENT_HALF_LIFE_DAYS, IMAGE_SESSION_CACHE_SIZE
+
+# 支持的抽样方式
+WEIGHTING_UNIFORM = "uniform"  # 均匀随机
+WEIGHTING_LEAST_USED = "least_used"  # 使用次数越少越容易被选中
+WEIGHTING_RECENT = "recent"  # 越新添加越容易被选中（按半衰期衰减）
+
+
+def build_alias_table(weights: Sequence[float]):
+    """构建别名表（Vose），返回 (prob, alias)，之后每次抽样 O(1)"""
+    n = len(weights)
+    total = sum(weights)
+    scaled = [w * n / total for w in weights]
+    prob = [1.0] * n
+    alias = list(range(n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        prob[s] = scaled[s]
+        alias[s] = l
+        scaled[l] -= 1.0 - scaled[s]
+        (small if scaled[l] < 1.0 else large).append(l)
+    return prob, alias
+
+
+class ImagePool:
+    """面板随机图片池"""
+
+    def __init__(
+        self,
+        weighting: str = IMAGE_POOL_WEIGHTING,
+        recent_half_life_days: float = IMAGE_POOL_RECENT_HALF_LIFE_DAYS,
+        session_cache_size: int = IMAGE_SESSION_CACHE_SIZE,
+    ):
+        self.weighting = weighting
+        self.recent_half_life_days = recent_half_life_days
+        self._fallback: List[str] = list(IMAGE_LIST)
+        self._urls: List[str] = []
+        self._url_set: set = set()
+        self._prob: Optional[List[float]] = None
+        self._alias: Optional[List[int]] = None
+        self._sessions = LRUCache(maxsize=session_cache_size)
+        self._reload_task: Optional[asyncio.Task] = None
+        self._reload_again = False
+        self.loaded_at: Optional[datetime] = None
+        add_image_library_listener(self.schedule_reload)
+        if weighting == WEIGHTING_LEAST_USED:
+            image_usage_aggregator.add_flush_listener(self.schedule_reload)
+
+    @property
+    def from_library(self) -> bool:
+        """当前是否使用图片库中的图片（否则为内置图片）"""
+        return bool(self._urls)
+
+    def urls(self) -> List[str]:
+        """当前参与随机的图片"""
+        return list(self._urls or self._fallback)
+
+    def _weights(self, images) -> Optional[List[float]]:
+        if self.weighting == WEIGHTING_LEAST_USED:
+            return [1.0 / (1 + image.usage_count) for image in images]
+        if self.weighting == WEIGHTING_RECENT:
+            now = datetime.now()
+            return [
+                math.pow(0.5, max((now - image.added_at).total_seconds(), 0) / 86400 / self.recent_half_life_days)
+                for image in images
+            ]
+        return None
+
+    def _apply(self, images) -> None:
+        """用新的图片列表替换当前池（整体替换，读取方不会看到中间状态）"""
+        urls = [image.image_url for image in images]
+        weights = self._weights(images) if urls else None
+        prob, alias = build_alias_table(weights) if weights and sum(weights) > 0 else (None, None)
+        self._urls, self._url_set, self._prob, self._alias = urls, set(urls), prob, alias
+        self.loaded_at = datetime.now()
+
+    async def load(self) -> int:
+        """从图片库加载启用的图片，返回图片数"""
+        images = await get_pool_images()
+        if images is None:
+            # 读取失败时保留当前池
+            return len(self._urls)
+        self._apply(images)
+        source = "图片库" if self._urls else "内置图片（图片库中没有启用的图片）"
+        logger.info(f"随机图片池已加载 {len(self.urls())} 张，来源：{source}")
+        return len(self._urls)
+
+    async def _reload_loop(self) -> None:
+        # 加载期间又有修改时再加载一次，保证最终与数据库一致
+        while True:
+            self._reload_again = False
+            await self.load()
+            if not self._reload_again:
+                break
+
+    def schedule_reload(self) -> None:
+        """图片库或使用次数有修改（提交、写回后调用）：在后台重新加载"""
+        if self._reload_task is not None and not self._reload_task.done():
+            self._reload_again = True
+            return
+        try:
+            self._reload_task = asyncio.get_running_loop().create_task(self._reload_loop())
+        except RuntimeError:
+            # 没有事件循环（如同步脚本中），下次启动时加载
+            pass
+
+    def random(self) -> str:
+        """随机选择一张图片"""
+        urls = self._urls
+        if not urls:
+            return random.choice(self._fallback)
+        prob, alias = self._prob, self._alias
+        i = random.randrange(len(urls))
+        if prob is not None and random.random() >= prob[i]:
+            i = alias[i]
+        return urls[i]
+
+    def session_image(self, user_id: int) -> str:
+        """用户会话的图片（没有或已不在池中时重新随机选择）"""
+        url = self._sessions.get(user_id)
+        if url is None or not self._contains(url):
+            url = self.refresh_session(user_id)
+        return url
+
+    def refresh_session(self, user_id: int) -> str:
+        """为用户重新随机选择会话图片"""
+        url = self.random()
+        self._sessions[user_id] = url
+        return url
+
+    def _contains(self, url: str) -> bool:
+        return url in self._url_set if self._urls else url in self._fallback
+
+    def clear_sessions(self) -> int:
+        """清除所有会话图片，返回清除数量"""
+        count = len(self._sessions)
+        self._sessions.clear()
+        return count
+
+    @property
+    def session_count(self) -> int:
+        return len(self._sessions)
+
+
+# 全局实例
+image_pool = ImagePool()
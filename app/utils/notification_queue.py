@@ -0,0 +1,83 @@
+"""
+审核通知后台队列
+审核结果通知与频道同步放到后台任务中逐条发送，审核操作本身不等待 Telegram 请求；
+批量审核时几十条通知也不会阻塞管理员的面板刷新。
+
+处于工作单元中时，任务在事务提交后才入队，后台任务读到的一定是已提交的审核结果。
+"""
+
+import asyncio
+from typing import Optional
+
+from loguru import logger
+
+from app.database.db import current_unit_of_work, on_commit
+
+
+class NotificationQueue:
+    """通知发送队列（单个后台任务按顺序执行）"""
+
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        self._detached: set = set()
+        self.sent = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, func, *args, **kwargs) -> None:
+        """提交一个发送任务：func(*args, **kwargs) 为协程函数"""
+        session = current_unit_of_work()
+        if session is not None:
+            on_commit(session, lambda: self._put((func, args, kwargs)))
+        else:
+            self._put((func, args, kwargs))
+
+    def _put(self, job) -> None:
+        if self.running:
+            self._queue.put_nowait(job)
+            return
+        # 队列未启动（如脚本中调用）时直接在后台执行
+        task = asyncio.get_running_loop().create_task(self._execute(job))
+        self._detached.add(task)
+        task.add_done_callback(self._detached.discard)
+
+    async def _execute(self, job) -> None:
+        func, args, kwargs = job
+        try:
+            await func(*args, **kwargs)
+            self.sent += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"后台通知发送失败: {e}")
+
+    async def _run(self) -> None:
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                break
+            await self._execute(job)
+
+    def start(self) -> None:
+        """启动后台发送任务"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            logger.info("审核通知队列已启动")
+
+    async def stop(self) -> None:
+        """停止队列：先发送完仍在排队的通知"""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        self._queue.put_nowait(None)
+        await task
+        if self._detached:
+            await asyncio.gather(*self._detached, return_exceptions=True)
+        logger.info(f"审核通知队列已停止（成功 {self.sent} / 失败 {self.failed}）")
+
+
+# 全局实例
+notification_queue = NotificationQueue()
@@ -1,7 +1,11 @@
 from typing import List, Any, Callable
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from sqlalchemy import select, func
 from loguru import logger
 
+from app.database.db import get_db
+from app.database.count_cache import count_cache
+
 class Paginator:
     """分页工具类"""
     
@@ -81,6 +85,81 @@ class Paginator:
         return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
 
+class QueryPaginator(Paginator):
+    """
+    数据库分页工具类
+
+    接收一个 SQLAlchemy select，只查询当前页的数据和（缓存的）总数，
+    内存和耗时不再随表大小增长。使用前需先 await load(page)，
+    之后 get_page_items / get_page_info / create_pagination_keyboard 与 Paginator 用法一致。
+    """
+    
+    def __init__(self, query, page_size: int = 5):
+        self.query = query
+        self.page_size = page_size
+        self.total_items = 0
+        self.total_pages = 1
+        self.items = []
+        self.loaded_page = None
+    
+    def count_query(self):
+        """总数查询"""
+        return select(func.count()).select_from(self.query.order_by(None).subquery())
+    
+    def page_query(self, page: int):
+        """指定页的数据查询"""
+        return self.query.offset((page - 1) * self.page_size).limit(self.page_size)
+    
+    async def _count(self, session, fresh: bool = False) -> int:
+        return await count_cache.count(session, self.count_query(), fresh=fresh)
+    
+    def _set_total(self, total: int) -> None:
+        self.total_items = total
+        self.total_pages = (total + self.page_size - 1) // self.page_size if total > 0 else 1
+    
+    async def load(self, page: int) -> int:
+        """
+        加载指定页数据
+
+        Returns:
+            实际加载的页码（超出范围时修正为最后一页）
+        """
+        page = max(1, page)
+        async for session in get_db():
+            try:
+                self._set_total(await self._count(session))
+                page = min(page, self.total_pages)
+                result = await session.execute(self.page_query(page))
+                self.items = list(result.scalars().all())
+                
+                if not self.items and page > 1:
+                    # 缓存的总数已过期（数据被审核/删除），重新统计后取最后一页
+                    self._set_total(await self._count(session, fresh=True))
+                    page = self.total_pages
+                    result = await session.execute(self.page_query(page))
+                    self.items = list(result.scalars().all())
+            except Exception as e:
+                logger.error(f"分页查询失败: {e}")
+                self.items = []
+                self._set_total(0)
+                page = 1
+        
+        self.loaded_page = page
+        return page
+    
+    def restore(self, page: int, items: List[Any], total: int) -> None:
+        """用已知的当前页数据与总数恢复分页状态（不查询数据库）"""
+        self._set_total(total)
+        self.items = items
+        self.loaded_page = page
+    
+    def get_page_items(self, page: int) -> List[Any]:
+        """获取指定页面的数据（需已通过 load 加载）"""
+        if page != self.loaded_page:
+            return []
+        return self.items
+
+
 def format_page_header(title: str, page_info: dict) -> str:
     """格式化页面标题"""
     if page_info['total_items'] == 0:
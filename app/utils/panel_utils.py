@@ -1,6 +1,8 @@
 from aiogram import types
 from app.config.config import BOT_NICKNAME
 from app.database.users import get_user
+from app.database.image_usage import image_usage_aggregator
+from app.utils.rate_limiter import with_request_priority, PRIORITY_NOTIFICATION
 
 
 def create_welcome_panel_text(title: str, role: str = None) -> str:
@@ -46,9 +48,13 @@ def create_info_panel_text(user_info: dict) -> str:
 # 这样可以保持代码的一致性和可维护性
 
 
-async def send_review_notification(bot, user_id: int, item_type: str, item_title: str, status: str, review_note: str = None, file_id: str = None, item_content: str = None, item_id: int = None, category_name: str = None):
+@with_request_priority(PRIORITY_NOTIFICATION)
+async def send_review_notification(bot, user_id: int, item_type: str, item_title: str, status: str, review_note: str = None, file_id: str = None, item_content: str = None, item_id: int = None, category_name: str = None, merged_into: int = None):
     """
     发送审核结果通知给用户
+
+    求片审核通过时，随其一并通过的重复求片的用户也会收到通知；
+    频道同步不在这里进行，见 app/utils/channel_sync.py
     
     Args:
         bot: 机器人实例
@@ -58,9 +64,10 @@ async def send_review_notification(bot, user_id: int, item_type: str, item_title
         status: 审核状态 ('approved', 'rejected')
         review_note: 审核备注（可选）
         file_id: 图片文件ID（可选）
-        item_content: 项目内容（可选，用于频道同步）
-        item_id: 项目ID（可选，用于频道同步）
+        item_content: 项目内容（可选）
+        item_id: 项目ID（可选）
         category_name: 分类名称（可选，如电影、剧集、国产等）
+        merged_into: 作为重复求片随哪条求片一并审核（可选）
     """
     from loguru import logger
     logger.info(f"开始发送审核通知: user_id={user_id}, item_type={item_type}, title={item_title}, status={status}")
@@ -125,6 +132,8 @@ async def send_review_notification(bot, user_id: int, item_type: str, item_title
         # 添加项目ID（如果有）
         if item_id:
             notification_text += f"🆔 <b>项目编号</b>：#{item_id}\n"
+        if merged_into:
+            notification_text += f"🔁 <b>合并处理</b>：与相同求片 #{merged_into} 一并审核\n"
         
         notification_text += f"\n{result_bg}\n"
         
@@ -167,132 +176,122 @@ async def send_review_notification(bot, user_id: int, item_type: str, item_title
             )
             logger.info(f"已发送文本通知给用户 {user_id}")
         
-        # 如果审核通过，同步到频道
-        if status == 'approved' and item_type in ['movie', 'content']:
-            logger.info(f"准备同步到频道: {item_type} - {item_title}")
-            await sync_to_channel(bot, item_type, item_title, item_content, file_id, user_id, item_id, category_name)
-        else:
-            logger.info(f"跳过频道同步: status={status}, item_type={item_type}")
+        # 重复求片只通知用户
+        if merged_into:
+            return
+        
+        # 频道同步已在审核事务中写入发件箱，由 channel_sync 后台投递
+        
+        # 通知随本求片一并通过的重复求片的用户
+        if status == 'approved' and item_type == 'movie' and item_id:
+            from app.database.business import get_merged_movie_requests
+            for request in await get_merged_movie_requests(item_id):
+                await send_review_notification(
+                    bot, request.user_id, item_type, request.title, status, review_note,
+                    file_id=request.file_id, item_content=request.description, item_id=request.id,
+                    category_name=category_name, merged_into=item_id
+                )
         
     except Exception as e:
         from loguru import logger
         logger.error(f"发送审核通知失败: {e}")
 
 
-async def sync_to_channel(bot, item_type: str, item_title: str, item_content: str = None, file_id: str = None, user_id: int = None, item_id: int = None, category_name: str = None):
+async def send_review_notifications(bot, item_type: str, item_ids: list, status: str, review_note: str = None):
+    """按ID加载项目并逐条发送审核通知（在通知队列中执行，读取的是已提交的审核结果）"""
+    from app.database.business import get_movie_requests_by_ids, get_content_submissions_by_ids
+    
+    if item_type == 'movie':
+        items, content_field = await get_movie_requests_by_ids(item_ids), 'description'
+    else:
+        items, content_field = await get_content_submissions_by_ids(item_ids), 'content'
+    
+    for item in items:
+        await send_review_notification(
+            bot, item.user_id, item_type, item.title, status, review_note,
+            file_id=item.file_id, item_content=getattr(item, content_field, None), item_id=item.id,
+            category_name=item.category.name if item.category else None
+        )
+
+
+def queue_review_notifications(bot, item_type: str, item_ids: list, status: str, review_note: str = None):
+    """把审核通知交给后台通知队列，审核操作不等待发送完成"""
+    from app.utils.notification_queue import notification_queue
+    
+    if item_ids:
+        notification_queue.submit(send_review_notifications, bot, item_type, list(item_ids), status, review_note)
+
+
+def format_channel_contributor(user, user_id: int = None) -> str:
+    """频道消息中的贡献者显示（不显示ID）"""
+    if user and user.username:
+        return f"@{user.username}"
+    if user and user.full_name:
+        return user.full_name
+    return f"用户{user_id}" if user_id else "匿名用户"
+
+
+def build_channel_post_text(item_type: str, item_title: str, user_display: str, category_name: str = None, published_at=None) -> str:
     """
-    同步审核通过的内容到频道
+    构建同步到频道的消息文本
     
     Args:
-        bot: 机器人实例
         item_type: 项目类型 ('movie', 'content')
         item_title: 项目标题
-        item_content: 项目内容（可选）
-        file_id: 图片文件ID（可选）
-        user_id: 用户ID（可选）
-        item_id: 项目ID（可选）
+        user_display: 贡献者显示（见 format_channel_contributor）
         category_name: 分类名称（可选，如电影、剧集、国产等）
+        published_at: 发布时间（默认当前时间）
     """
-    try:
-        from app.config.config import SYNC_CHANNELS
-        
-        if not SYNC_CHANNELS:
-            return  # 如果没有配置频道，则不同步
-        
-        # 获取用户信息（不显示ID）
-        user_display = "匿名用户"
-        if user_id:
-            try:
-                user = await get_user(user_id)
-                if user and user.username:
-                    user_display = f"@{user.username}"
-                elif user and user.full_name:
-                    user_display = user.full_name
-                else:
-                    user_display = f"用户{user_id}"
-            except Exception:
-                user_display = f"用户{user_id}"
-        
-        # 根据类型生成美化的频道消息
-        type_config = {
-            'movie': {
-                'emoji': '🎬',
-                'name': '求片',
-                'icon': '🎭',
-                'category': '影视内容',
-                'bg_emoji': '🎪',
-                'title_decoration': '🌟🎬🌟'
-            },
-            'content': {
-                'emoji': '📝',
-                'name': '投稿',
-                'icon': '✍️',
-                'category': '原创内容',
-                'bg_emoji': '📚',
-                'title_decoration': '✨📝✨'
-            }
+    # 根据类型生成美化的频道消息
+    type_config = {
+        'movie': {
+            'emoji': '🎬',
+            'name': '求片',
+            'icon': '🎭',
+            'category': '影视内容',
+            'bg_emoji': '🎪',
+            'title_decoration': '🌟🎬🌟'
+        },
+        'content': {
+            'emoji': '📝',
+            'name': '投稿',
+            'icon': '✍️',
+            'category': '原创内容',
+            'bg_emoji': '📚',
+            'title_decoration': '✨📝✨'
         }
-        
-        config = type_config.get(item_type, {
-            'emoji': '📋',
-            'name': '内容',
-            'icon': '📄',
-            'category': '其他内容',
-            'bg_emoji': '📋',
-            'title_decoration': '⭐📋⭐'
-        })
-        
-        # 构建美化的频道消息
-        title_text = f"{config['title_decoration']} <b>{config['name']}上新</b> {config['title_decoration']}"
-        
-        # 如果有分类名称，显示具体分类；否则显示默认类别
-        category_display = f"{category_name}"
-        
-        channel_text = (
-            f"{title_text}\n\n"
-            f"{config['bg_emoji']} <b>类型</b>：{category_display}\n"
-            f"{config['emoji']} <b>标题</b>：{item_title}\n"
-        )
-        
-        # 添加项目信息
-        current_time = __import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M')
-        channel_text += (
-            f"👤 <b>贡献者</b>：{user_display}\n"
-            f"🎯 <b>审核状态</b>：✅ 已通过审核\n"
-            f"📅 <b>发布时间</b>：{current_time}\n"
-        )
-        
-        # 发送到所有配置的频道（带图片或纯文本）
-        success_count = 0
-        for channel in SYNC_CHANNELS:
-            try:
-                if file_id:
-                    await bot.send_photo(
-                        chat_id=channel,
-                        photo=file_id,
-                        caption=channel_text,
-                        parse_mode="HTML"
-                    )
-                else:
-                    await bot.send_message(
-                        chat_id=channel,
-                        text=channel_text,
-                        parse_mode="HTML"
-                    )
-                success_count += 1
-            except Exception as e:
-                from loguru import logger
-                logger.error(f"同步到频道 {channel} 失败: {e}")
-        
-        from loguru import logger
-        if success_count > 0:
-            logger.info(f"已同步{config['name']}到 {success_count}/{len(SYNC_CHANNELS)} 个频道: {item_title}")
-        else:
-            logger.warning(f"同步{config['name']}到所有频道都失败: {item_title}")
-        
-    except Exception as e:
-        from loguru import logger
-        logger.error(f"同步到频道失败: {e}")
+    }
+    
+    config = type_config.get(item_type, {
+        'emoji': '📋',
+        'name': '内容',
+        'icon': '📄',
+        'category': '其他内容',
+        'bg_emoji': '📋',
+        'title_decoration': '⭐📋⭐'
+    })
+    
+    # 构建美化的频道消息
+    title_text = f"{config['title_decoration']} <b>{config['name']}上新</b> {config['title_decoration']}"
+    
+    # 如果有分类名称，显示具体分类；否则显示默认类别
+    category_display = f"{category_name}"
+    
+    channel_text = (
+        f"{title_text}\n\n"
+        f"{config['bg_emoji']} <b>类型</b>：{category_display}\n"
+        f"{config['emoji']} <b>标题</b>：{item_title}\n"
+    )
+    
+    # 添加项目信息
+    current_time = (published_at or __import__('datetime').datetime.now()).strftime('%Y-%m-%d %H:%M')
+    channel_text += (
+        f"👤 <b>贡献者</b>：{user_display}\n"
+        f"🎯 <b>审核状态</b>：✅ 已通过审核\n"
+        f"📅 <b>发布时间</b>：{current_time}\n"
+    )
+    
+    return channel_text
 
 
 async def get_user_display_link(user_id: int) -> str:
@@ -319,6 +318,76 @@ async def get_user_display_link(user_id: int) -> str:
         return f"用户{user_id}"
 
 
+# Telegram 单次批量删除与单个相册的数量上限
+DELETE_MESSAGES_LIMIT = 100
+MEDIA_GROUP_LIMIT = 10
+
+
+async def delete_messages_bulk(bot, chat_id: int, message_ids: list) -> None:
+    """
+    批量删除消息（每 100 条一次 delete_messages），批量删除失败时逐条删除
+    
+    Args:
+        bot: 机器人实例
+        chat_id: 聊天ID
+        message_ids: 要删除的消息ID列表
+    """
+    from loguru import logger
+    
+    for start in range(0, len(message_ids), DELETE_MESSAGES_LIMIT):
+        chunk = message_ids[start:start + DELETE_MESSAGES_LIMIT]
+        try:
+            await bot.delete_messages(chat_id=chat_id, message_ids=chunk)
+            continue
+        except Exception as e:
+            logger.warning(f"批量删除消息失败，改为逐条删除 {chunk}: {e}")
+        for message_id in chunk:
+            try:
+                await bot.delete_message(chat_id=chat_id, message_id=message_id)
+            except Exception as e:
+                logger.warning(f"删除消息失败 {message_id}: {e}")
+
+
+async def send_photo_album(bot, chat_id: int, photos: list) -> list:
+    """
+    以相册形式发送多张图片（每 10 张一个相册，单张时直接发送），相册发送失败时逐张发送
+    
+    Args:
+        bot: 机器人实例
+        chat_id: 聊天ID
+        photos: [(file_id, caption), ...]，caption 为 HTML
+    
+    Returns:
+        与 photos 一一对应的消息ID列表，发送失败的位置为 None
+    """
+    from loguru import logger
+    
+    message_ids = []
+    for start in range(0, len(photos), MEDIA_GROUP_LIMIT):
+        chunk = photos[start:start + MEDIA_GROUP_LIMIT]
+        if len(chunk) > 1:
+            try:
+                messages = await bot.send_media_group(
+                    chat_id=chat_id,
+                    media=[
+                        types.InputMediaPhoto(media=file_id, caption=caption, parse_mode="HTML")
+                        for file_id, caption in chunk
+                    ]
+                )
+                message_ids.extend(message.message_id for message in messages)
+                continue
+            except Exception as e:
+                logger.warning(f"相册发送失败，改为逐张发送: {e}")
+        for file_id, caption in chunk:
+            try:
+                message = await bot.send_photo(chat_id=chat_id, photo=file_id, caption=caption, parse_mode="HTML")
+                message_ids.append(message.message_id)
+            except Exception as e:
+                logger.error(f"发送图片失败: {e}")
+                message_ids.append(None)
+    return message_ids
+
+
 async def cleanup_sent_media_messages(bot, state):
     """
     清理已发送的媒体消息
@@ -341,22 +410,11 @@ async def cleanup_sent_media_messages(bot, state):
             logger.error(f"🚨 发现BUG：主消息ID {main_message_id} 在媒体消息列表中！")
             logger.error(f"这会导致主消息被删除！sent_media_ids: {sent_media_ids}")
         
-        for index, message_id in enumerate(sent_media_ids):
-            try:
-                # 检查是否要删除主消息
-                if message_id == main_message_id:
-                    from loguru import logger
-                    logger.error(f"⚠️ 警告：试图删除主消息 {message_id}！这是一个BUG！")
-                    logger.error(f"主消息ID: {main_message_id}, 媒体消息列表: {sent_media_ids}")
-                    logger.error(f"主消息在列表中的位置: {index} (第{index+1}个)")
-                    continue  # 跳过删除主消息
-                
-                logger.info(f"🗑️ 正在删除第{index+1}个媒体消息: {message_id}")
-                await bot.delete_message(chat_id=data.get('chat_id'), message_id=message_id)
-                logger.info(f"✅ 成功删除媒体消息: {message_id}")
-            except Exception as e:
-                from loguru import logger
-                logger.warning(f"删除媒体消息失败 {message_id}: {e}")
+        # 跳过主消息，其余一次批量删除
+        to_delete = [message_id for message_id in sent_media_ids if message_id != main_message_id]
+        if to_delete:
+            await delete_messages_bulk(bot, data.get('chat_id'), to_delete)
+            logger.info(f"✅ 已删除 {len(to_delete)} 条媒体消息")
         
         # 清空已发送的媒体消息记录
         await state.update_data(sent_media_ids=[])
@@ -366,6 +424,7 @@ async def cleanup_sent_media_messages(bot, state):
         logger.error(f"清理媒体消息失败: {e}")
 
 
+@with_request_priority(PRIORITY_NOTIFICATION)
 async def send_feedback_reply_notification(bot, user_id: int, feedback_id: int, reply_content: str, original_feedback: str = None):
     """
     发送反馈回复通知给用户
@@ -404,6 +463,7 @@ async def send_feedback_reply_notification(bot, user_id: int, feedback_id: int,
         logger.error(f"发送反馈回复通知失败: {e}")
 
 
+@with_request_priority(PRIORITY_NOTIFICATION)
 async def send_admin_message_notification(bot, user_id: int, item_type: str, item_title: str, item_id: int, message_content: str):
     """
     发送管理员消息通知给用户
@@ -497,6 +557,7 @@ async def return_to_main_menu(cb, additional_logic_func=None):
                         ),
                         reply_markup=kb
                     )
+                    image_usage_aggregator.record(welcome_photo)
                 except Exception:
                     # 如果编辑失败，删除当前消息并发送新的带图片消息
                     try:
@@ -511,6 +572,7 @@ async def return_to_main_menu(cb, additional_logic_func=None):
                         reply_markup=kb,
                         parse_mode="HTML"
                     )
+                    image_usage_aggregator.record(welcome_photo)
         except Exception as edit_error:
             # 如果所有编辑方式都失败，发送新消息
             await cb.bot.send_photo(
@@ -520,6 +582,7 @@ async def return_to_main_menu(cb, additional_logic_func=None):
                 reply_markup=kb,
                 parse_mode="HTML"
             )
+            image_usage_aggregator.record(welcome_photo)
         
         await cb.answer()
         
@@ -0,0 +1,191 @@
+"""
+限速工具模块
+提供异步令牌桶与出站请求调度器，用于控制对 Telegram API 的发送速率。
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from cachetools import TTLCache
+
+
+class TokenBucket:
+    """
+    异步令牌桶限速器
+
+    Args:
+        rate: 每秒补充的令牌数
+        capacity: 桶容量（允许的突发量），默认等于 rate
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """等待直到取得指定数量的令牌（按调用顺序排队）"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    async def take(self, tokens: float = 1) -> None:
+        """
+        不排队直接取走令牌：只等待 pause 暂停结束，令牌不足时透支，
+        之后排队的 acquire 相应顺延
+        """
+        now = time.monotonic()
+        if now < self._blocked_until:
+            await asyncio.sleep(self._blocked_until - now)
+            now = time.monotonic()
+        self._refill(now)
+        self._tokens -= tokens
+
+    def pause(self, seconds: float) -> None:
+        """暂停发放令牌（收到 429 retry_after 时调用）"""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0
+        # 从暂停结束时开始补充令牌，否则暂停期间也计入补充时间，恢复后立即放出整桶突发
+        self._updated_at = self._blocked_until
+
+
+# ==================== 出站请求调度 ====================
+
+# 出站请求优先级（数值越小越优先）
+PRIORITY_INTERACTIVE = 0  # 对用户操作的直接响应
+PRIORITY_NOTIFICATION = 1  # 审核通知、频道同步等
+PRIORITY_BROADCAST = 2  # 群发
+
+_request_priority: ContextVar[int] = ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+
+def set_request_priority(priority: int) -> None:
+    """设置当前任务后续出站请求的优先级（如群发任务启动时调用）"""
+    _request_priority.set(priority)
+
+
+def get_request_priority() -> int:
+    """获取当前上下文的出站请求优先级"""
+    return _request_priority.get()
+
+
+@contextmanager
+def request_priority(priority: int):
+    """在代码块内临时使用指定的出站请求优先级"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def with_request_priority(priority: int):
+    """装饰器：被装饰的异步函数内的出站请求使用指定优先级"""
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with request_priority(priority):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class OutgoingScheduler:
+    """
+    出站请求调度器：
+    - 全局令牌桶（约 30 条/秒），等待者按优先级、先来先得的顺序获得令牌。
+    - 每个聊天单独限速：私聊约 1 条/秒，群组/频道约 20 条/分钟（均允许少量突发）。
+    - 私聊中对用户操作的直接响应不在该聊天的令牌桶中排队（不会排在发给同一用户的通知、群发之后），
+      但同样扣除令牌，之后的通知与群发相应顺延。
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        private_rate: float,
+        private_burst: float,
+        group_rate_per_minute: float,
+        group_burst: float,
+    ):
+        self.global_bucket = TokenBucket(global_rate)
+        self.private_rate = private_rate
+        self.private_burst = private_burst
+        self.group_rate = group_rate_per_minute / 60
+        self.group_burst = group_burst
+        # 长时间不活跃的聊天自动回收限速状态
+        self._chat_buckets = TTLCache(maxsize=50_000, ttl=600)
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def _is_private(chat_id) -> bool:
+        # 私聊 ID 为正数；群组/频道为负数或 @username
+        return isinstance(chat_id, int) and chat_id > 0
+
+    def chat_bucket(self, chat_id) -> TokenBucket:
+        """获取聊天对应的令牌桶"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if self._is_private(chat_id):
+                bucket = TokenBucket(self.private_rate, self.private_burst)
+            else:
+                bucket = TokenBucket(self.group_rate, self.group_burst)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id=None, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """等待发送许可：先满足聊天限速，再按优先级排队获取全局令牌"""
+        if chat_id is not None:
+            if priority == PRIORITY_INTERACTIVE and self._is_private(chat_id):
+                await self.chat_bucket(chat_id).take()
+            else:
+                await self.chat_bucket(chat_id).acquire()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        await future
+
+    async def _dispatch(self) -> None:
+        """按全局速率依次放行优先级最高的等待者"""
+        while True:
+            while not self._waiters:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            await self.global_bucket.acquire()
+            while self._waiters:
+                _, _, future = heapq.heappop(self._waiters)
+                if not future.done():
+                    future.set_result(None)
+                    break
+
+    def pause(self, chat_id, seconds: float) -> None:
+        """收到 429 时暂停对应聊天（无聊天时暂停全局）"""
+        if chat_id is not None:
+            self.chat_bucket(chat_id).pause(seconds)
+        else:
+            self.global_bucket.pause(seconds)
@@ -0,0 +1,77 @@
+"""
+列表页渲染缓存模块
+审核列表、数据浏览、我的求片/投稿等分页界面渲染时要查询当前页、总数并逐条查询用户信息。
+渲染结果按 (视图, 页码, 筛选条件, 相关表的数据版本) 缓存在内存中：
+数据没有变化时翻页直接使用缓存，任何相关表提交写入后版本变化，旧缓存自然失效。
+
+缓存带有效期，列表中“x 分钟前”之类的相对时间最多滞后一个有效期。
+缓存内容应为普通数据（文本、字典、列表），取出时返回副本，调用方可以放心修改。
+"""
+
+import copy
+from typing import Any, Awaitable, Callable, Hashable, Sequence
+
+from cachetools import TTLCache
+
+from app.database.data_version import table_version
+from app.config.config import RENDER_CACHE_SIZE, RENDER_CACHE_TTL
+
+
+class RenderCache:
+    """分页界面渲染缓存"""
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE, ttl: float = RENDER_CACHE_TTL):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_render(
+        self,
+        view: str,
+        page: int,
+        filters: Hashable,
+        tables: Sequence[str],
+        render: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        获取缓存的渲染结果，没有时调用 render() 渲染并缓存
+
+        Args:
+            view: 视图名称
+            page: 请求的页码
+            filters: 筛选条件（如用户ID），需可哈希
+            tables: 渲染结果依赖的表，任一表有写入后缓存失效；为空时不缓存
+            render: 渲染函数（协程函数）
+        """
+        if not tables:
+            return await render()
+
+        # 渲染前取版本：渲染期间有写入时，结果按旧版本存入，之后的读取会重新渲染
+        key = (view, page, filters, table_version(*tables))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return copy.deepcopy(cached)
+
+        self.misses += 1
+        value = await render()
+        self._cache[key] = value
+        return copy.deepcopy(value)
+
+    def clear(self) -> None:
+        """清空缓存"""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """命中率统计"""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 全局实例
+render_cache = RenderCache()
@@ -1,14 +1,16 @@
-from typing import Optional, Dict, Any, Callable, List
+from typing import Optional, Dict, Any, Callable, List, Set, Tuple
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from app.utils.time_utils import humanize_time, get_status_text
-from app.utils.pagination import Paginator, format_page_header
-from app.utils.panel_utils import get_user_display_link, send_review_notification, cleanup_sent_media_messages
+from app.utils.pagination import Paginator, QueryPaginator, format_page_header
+from app.utils.advanced_browser import encode_cursor, decode_cursor
+from app.utils.panel_utils import get_user_display_link, queue_review_notifications, cleanup_sent_media_messages, delete_messages_bulk
+from app.utils.render_cache import render_cache
 from app.config.config import REVIEW_PAGE_SIZE
 from loguru import logger
 from app.utils.debug_utils import (
     debug_log, debug_message_info, debug_state_info, debug_main_message_tracking,
-    debug_review_flow, debug_media_message_tracking, debug_function
+    debug_review_flow, debug_media_message_tracking, debug_error, debug_function
 )
 
 
@@ -48,7 +50,12 @@ class ReviewConfig:
                  approve_note_media_callback_prefix: str,
                  reject_note_media_callback_prefix: str,
                  cleanup_callback: str,
-                 back_to_main_cleanup_callback: str):
+                 back_to_main_cleanup_callback: str,
+                 pending_query_function: Callable = None,
+                 get_duplicates_function: Callable = None,
+                 bulk_review_function: Callable = None,
+                 get_pending_after_function: Callable = None,
+                 data_tables: tuple = ()):
         self.item_type = item_type
         self.emoji = emoji
         self.name = name
@@ -69,77 +76,141 @@ class ReviewConfig:
         self.reject_note_media_callback_prefix = reject_note_media_callback_prefix
         self.cleanup_callback = cleanup_callback
         self.back_to_main_cleanup_callback = back_to_main_cleanup_callback
+        # 返回待审核项目查询（select）的函数，用于数据库分页
+        self.pending_query_function = pending_query_function
+        # 返回当前页项目的重复项（项目ID -> 重复项列表）的函数，通过审核时重复项一并处理
+        self.get_duplicates_function = get_duplicates_function
+        # 批量审核函数 (ids, reviewer_id, status, note) -> 实际审核的ID列表；提供时列表支持多选
+        self.bulk_review_function = bulk_review_function
+        # 取游标 (created_at, id) 之后的待审核项目的函数 (cursor, limit) -> 列表；提供时审核后增量刷新当前页
+        self.get_pending_after_function = get_pending_after_function
+        # 列表内容依赖的表，用作渲染缓存的数据版本；为空时不缓存
+        self.data_tables = data_tables
+        # 多选相关的回调数据与状态键
+        self.select_callback_prefix = f"{item_type}_review_select_"
+        self.select_page_callback = f"{item_type}_review_select_page"
+        self.bulk_approve_callback = f"{item_type}_review_bulk_approve"
+        self.bulk_reject_callback = f"{item_type}_review_bulk_reject"
+        self.selected_state_key = f"review_selected_{item_type}"
+        # 审核列表视图（当前页、总数、游标、各项目卡片与媒体消息），审核后据此增量刷新
+        self.view_state_key = f"review_view_{item_type}"
 
 
 class ReviewUIBuilder:
     """审核界面构建器"""
     
     @staticmethod
-    async def build_review_list_text(config: ReviewConfig, items: List, paginator: Paginator, page: int) -> str:
-        """构建审核列表文本"""
+    async def build_review_card(config: ReviewConfig, item: Any, duplicates: List = None) -> str:
+        """构建列表中单个项目的卡片文本（不含序号，拼接列表时再加上）"""
+        # 获取类型信息
+        category_name = "未知类型"
+        if hasattr(item, 'category') and item.category:
+            category_name = item.category.name
+        
+        # 状态显示
+        status_text = get_status_text(item.status)
+        
+        # 获取用户显示链接
+        user_display = await get_user_display_link(item.user_id)
+        
+        # 美化的卡片式布局
+        title = getattr(item, config.title_field)
+        card = f"{config.emoji} <b>【{category_name}】{title}</b>\n"
+        card += f"├ 🆔 ID：<code>{item.id}</code>\n"
+        card += f"├ 👤 用户：{user_display}\n"
+        card += f"├ ⏰ 时间：<i>{humanize_time(item.created_at)}</i>\n"
+        card += f"├ 🏷️ 状态：<code>{status_text}</code>\n"
+        
+        # 重复项（通过时一并处理）
+        if duplicates:
+            duplicate_ids = " ".join(f"#{duplicate.id}" for duplicate in duplicates)
+            card += f"├ 🔁 重复：{duplicate_ids}（通过时一并处理）\n"
+        
+        # 内容预览
+        content = getattr(item, config.content_field, None)
+        if content:
+            content_preview = content[:60] + ('...' if len(content) > 60 else '')
+            card += f"├ 📝 描述：{content_preview}\n"
+        
+        # 媒体信息
+        if hasattr(item, 'file_id') and item.file_id:
+            card += f"└ 📎 <b>附件已发送</b> ✅\n"
+        else:
+            card += f"└─────────────────\n"
+        
+        return card
+    
+    @staticmethod
+    def format_review_list_text(config: ReviewConfig, cards: List[str], paginator: Paginator, page: int) -> str:
+        """用已构建的卡片拼接审核列表文本"""
         page_info = paginator.get_page_info(page)
         text = format_page_header(f"{config.emoji} <b>{config.name}审核</b>", page_info)
         
-        if not items:
+        if not cards:
             text += f"\n\n{config.emoji} 暂无待审核的{config.name}请求。"
             return text
         
         start_num = (page - 1) * paginator.page_size + 1
-        for i, item in enumerate(items, start_num):
-            # 获取类型信息
-            category_name = "未知类型"
-            if hasattr(item, 'category') and item.category:
-                category_name = item.category.name
-            
-            # 状态显示
-            status_text = get_status_text(item.status)
-            
-            # 获取用户显示链接
-            user_display = await get_user_display_link(item.user_id)
-            
-            # 美化的卡片式布局
-            title = getattr(item, config.title_field)
-            text += f"\n┌─ {i}. {config.emoji} <b>【{category_name}】{title}</b>\n"
-            text += f"├ 🆔 ID：<code>{item.id}</code>\n"
-            text += f"├ 👤 用户：{user_display}\n"
-            text += f"├ ⏰ 时间：<i>{humanize_time(item.created_at)}</i>\n"
-            text += f"├ 🏷️ 状态：<code>{status_text}</code>\n"
-            
-            # 内容预览
-            content = getattr(item, config.content_field, None)
-            if content:
-                content_preview = content[:60] + ('...' if len(content) > 60 else '')
-                text += f"├ 📝 描述：{content_preview}\n"
-            
-            # 媒体信息
-            if hasattr(item, 'file_id') and item.file_id:
-                text += f"└ 📎 <b>附件已发送</b> ✅\n"
-            else:
-                text += f"└─────────────────\n"
+        for i, card in enumerate(cards, start_num):
+            text += f"\n┌─ {i}. {card}"
         
         return text
     
     @staticmethod
-    def build_review_list_keyboard(config: ReviewConfig, items: List, paginator: Paginator, page: int) -> types.InlineKeyboardMarkup:
+    async def build_review_list_text(config: ReviewConfig, items: List, paginator: Paginator, page: int) -> str:
+        """构建审核列表文本"""
+        duplicates = await config.get_duplicates_function(items) if config.get_duplicates_function and items else {}
+        cards = [await ReviewUIBuilder.build_review_card(config, item, duplicates.get(item.id)) for item in items]
+        return ReviewUIBuilder.format_review_list_text(config, cards, paginator, page)
+    
+    @staticmethod
+    def select_button_text(item_id: int, selected: bool) -> str:
+        """多选按钮文本"""
+        return f"{'☑️' if selected else '⬜'} #{item_id}"
+    
+    @staticmethod
+    def bulk_button_texts(count: int) -> Dict[str, str]:
+        """批量操作按钮文本（动作 -> 文本）"""
+        return {
+            "approve": f"✅ 批量通过（{count}）",
+            "reject": f"❌ 批量拒绝（{count}）",
+        }
+    
+    @staticmethod
+    def build_review_list_keyboard(config: ReviewConfig, item_ids: List[int], paginator: Paginator, page: int, selected: Set[int] = frozenset()) -> types.InlineKeyboardMarkup:
         """构建审核列表键盘"""
         extra_buttons = []
         
         # 为当前页面的每个项目添加快速操作按钮
-        if items:
-            for item in items:
-                extra_buttons.append([
-                    types.InlineKeyboardButton(text=f"✅ 通过 #{item.id}", callback_data=f"{config.approve_callback_prefix}{item.id}"),
-                    types.InlineKeyboardButton(text=f"❌ 拒绝 #{item.id}", callback_data=f"{config.reject_callback_prefix}{item.id}")
-                ])
-                extra_buttons.append([
-                    types.InlineKeyboardButton(text=f"💬 留言通过 #{item.id}", callback_data=f"approve_{config.item_type}_note_{item.id}"),
-                    types.InlineKeyboardButton(text=f"💬 留言拒绝 #{item.id}", callback_data=f"reject_{config.item_type}_note_{item.id}")
-                ])
+        for item_id in item_ids:
+            row = [
+                types.InlineKeyboardButton(text=f"✅ 通过 #{item_id}", callback_data=f"{config.approve_callback_prefix}{item_id}"),
+                types.InlineKeyboardButton(text=f"❌ 拒绝 #{item_id}", callback_data=f"{config.reject_callback_prefix}{item_id}")
+            ]
+            if config.bulk_review_function:
+                row.insert(0, types.InlineKeyboardButton(
+                    text=ReviewUIBuilder.select_button_text(item_id, item_id in selected),
+                    callback_data=f"{config.select_callback_prefix}{item_id}"
+                ))
+            extra_buttons.append(row)
+            extra_buttons.append([
+                types.InlineKeyboardButton(text=f"💬 留言通过 #{item_id}", callback_data=f"approve_{config.item_type}_note_{item_id}"),
+                types.InlineKeyboardButton(text=f"💬 留言拒绝 #{item_id}", callback_data=f"reject_{config.item_type}_note_{item_id}")
+            ])
+        
+        # 批量操作
+        if item_ids and config.bulk_review_function:
+            bulk_texts = ReviewUIBuilder.bulk_button_texts(len(selected))
+            extra_buttons.append([
+                types.InlineKeyboardButton(text="☑️ 全选本页", callback_data=config.select_page_callback),
+                types.InlineKeyboardButton(text=bulk_texts["approve"], callback_data=config.bulk_approve_callback),
+                types.InlineKeyboardButton(text=bulk_texts["reject"], callback_data=config.bulk_reject_callback)
+            ])
         
         # 添加其他功能按钮
         extra_buttons.extend([
             [
-                types.InlineKeyboardButton(text="📋 查看详情", callback_data=f"{config.detail_callback_prefix}{items[0].id}" if items else config.cleanup_callback),
+                types.InlineKeyboardButton(text="📋 查看详情", callback_data=f"{config.detail_callback_prefix}{item_ids[0]}" if item_ids else config.cleanup_callback),
                 types.InlineKeyboardButton(text="🔄 刷新", callback_data=config.cleanup_callback)
             ],
             [
@@ -155,6 +226,39 @@ class ReviewUIBuilder:
         
         return keyboard
     
+    @staticmethod
+    def apply_selection(config: ReviewConfig, markup: types.InlineKeyboardMarkup, selected: Set[int]) -> types.InlineKeyboardMarkup:
+        """在现有列表键盘上更新勾选状态与批量按钮计数（不重新查询列表）"""
+        bulk_texts = ReviewUIBuilder.bulk_button_texts(len(selected))
+        bulk_callbacks = {
+            config.bulk_approve_callback: bulk_texts["approve"],
+            config.bulk_reject_callback: bulk_texts["reject"],
+        }
+        rows = []
+        for row in markup.inline_keyboard:
+            new_row = []
+            for button in row:
+                data = button.callback_data or ""
+                if data.startswith(config.select_callback_prefix) and data != config.select_page_callback:
+                    item_id = int(data.removeprefix(config.select_callback_prefix))
+                    button = button.model_copy(update={"text": ReviewUIBuilder.select_button_text(item_id, item_id in selected)})
+                elif data in bulk_callbacks:
+                    button = button.model_copy(update={"text": bulk_callbacks[data]})
+                new_row.append(button)
+            rows.append(new_row)
+        return types.InlineKeyboardMarkup(inline_keyboard=rows)
+    
+    @staticmethod
+    def page_item_ids(config: ReviewConfig, markup: Optional[types.InlineKeyboardMarkup]) -> List[int]:
+        """从列表键盘中取出当前页的项目ID"""
+        ids = []
+        for row in (markup.inline_keyboard if markup else []):
+            for button in row:
+                data = button.callback_data or ""
+                if data.startswith(config.select_callback_prefix) and data != config.select_page_callback:
+                    ids.append(int(data.removeprefix(config.select_callback_prefix)))
+        return ids
+    
     @staticmethod
     async def build_detail_text(config: ReviewConfig, item: Any) -> str:
         """构建详情文本"""
@@ -229,6 +333,11 @@ class ReviewHandler:
     @debug_function("处理审核列表")
     async def handle_review_list(self, cb: types.CallbackQuery, state: FSMContext, page: int = 1):
         """处理审核列表"""
+        await self._show_page(cb, state, page)
+        await cb.answer()
+    
+    async def _show_page(self, cb: types.CallbackQuery, state: FSMContext, page: int, panel_message_id: int = None):
+        """重新加载并显示审核列表的指定页（panel_message_id 为列表主消息，默认是当前回调所在的消息）"""
         debug_review_flow(
             f"开始处理{self.config.name}审核列表",
             page=page,
@@ -236,6 +345,7 @@ class ReviewHandler:
         )
         debug_message_info(cb, "审核列表回调")
         await debug_state_info(state, "进入前")
+        panel_message_id = panel_message_id or cb.message.message_id
         
         # 清理之前发送的媒体消息
         data = await state.get_data()
@@ -248,160 +358,311 @@ class ReviewHandler:
         await state.update_data(sent_media_ids=[])
         debug_media_message_tracking("清空媒体消息记录")
         
-        # 获取待审核的项目
-        debug_review_flow("获取待审核项目")
-        items = await self.config.get_pending_items_function()
-        debug_review_flow("获取到待审核项目", count=len(items))
+        # 获取待审核的项目（只查询当前页）；数据未变化时直接使用缓存的视图，不查询数据库
+        async def render():
+            debug_review_flow("获取待审核项目")
+            paginator = QueryPaginator(self.config.pending_query_function(), page_size=REVIEW_PAGE_SIZE)
+            loaded_page = await paginator.load(page)
+            debug_review_flow("获取到待审核项目", count=paginator.total_items)
+            page_data = paginator.get_page_items(loaded_page)
+            return {
+                'page': loaded_page,
+                'total': paginator.total_items,
+                'cursor': self._cursor_of(page_data[-1]) if page_data else None,
+                'items': await self._build_view_items(page_data),
+                'media': await self._build_media(page_data),
+            }
+        
+        view = await render_cache.get_or_render(
+            f"review_{self.config.item_type}", page, None, self.config.data_tables, render
+        )
+        page = view['page']
         
-        if not items:
+        if view['total'] == 0:
             from app.buttons.users import admin_review_center_kb
-            await cb.message.edit_caption(
-                caption=f"{self.config.emoji} <b>{self.config.name}审核</b>\n\n暂无待审核的{self.config.name}请求。",
-                reply_markup=admin_review_center_kb
+            await state.update_data({self.config.view_state_key: None})
+            await self._edit_panel(
+                cb, panel_message_id,
+                f"{self.config.emoji} <b>{self.config.name}审核</b>\n\n暂无待审核的{self.config.name}请求。",
+                admin_review_center_kb
             )
-            await cb.answer()
             return
         
-        # 创建分页器
-        paginator = Paginator(items, page_size=REVIEW_PAGE_SIZE)
-        page_data = paginator.get_page_items(page)
+        data = await state.get_data()
+        selected = set(data.get(self.config.selected_state_key, []))
         
-        # 构建界面
-        text = await ReviewUIBuilder.build_review_list_text(self.config, page_data, paginator, page)
-        keyboard = ReviewUIBuilder.build_review_list_keyboard(self.config, page_data, paginator, page)
+        # 记录当前页的视图，审核操作后只替换变化的项目
+        media_list = view.pop('media')
+        text, keyboard = self._render_view(view, selected)
         
         # 优先处理主消息：先编辑主消息，再处理媒体消息
         debug_review_flow(
             "准备编辑主消息显示审核列表",
-            target_message_id=cb.message.message_id,
+            target_message_id=panel_message_id,
             page=page,
-            total_pages=paginator.total_pages
-        )
-        
-        from app.utils.message_utils import safe_edit_message
-        await safe_edit_message(
-            cb.message,
-            caption=text,
-            reply_markup=keyboard
+            total=view['total']
         )
+        await self._edit_panel(cb, panel_message_id, text, keyboard)
         
         # 保存主消息ID，确保后续操作能正确编辑这个消息
-        old_main_id = (await state.get_data()).get('main_message_id')
-        new_main_id = cb.message.message_id
+        old_main_id = data.get('main_message_id')
         
         debug_main_message_tracking(
             f"{self.config.name}审核列表设置主消息ID",
             old_id=old_main_id,
-            new_id=new_main_id,
+            new_id=panel_message_id,
             source=f"{self.config.name}审核列表"
         )
         
-        await state.update_data(main_message_id=new_main_id)
+        await state.update_data(main_message_id=panel_message_id)
         await debug_state_info(state, "主消息ID设置后")
         
         # 主消息处理完成后，再处理媒体消息
-        debug_review_flow("开始发送媒体消息", page_items=len(page_data))
-        await self._send_media_messages(cb, state, page_data)
+        debug_review_flow("开始发送媒体消息", page_items=len(view['items']))
+        media = await self._send_media_messages(cb, state, media_list)
+        for entry in view['items']:
+            entry['media'] = media.get(entry['id'])
+        await state.update_data({self.config.view_state_key: view})
         
         debug_review_flow(f"{self.config.name}审核列表处理完成")
-        await cb.answer()
     
-    async def _send_media_messages(self, cb: types.CallbackQuery, state: FSMContext, items: List):
-        """发送媒体消息"""
+    async def refresh_after_review(self, cb: types.CallbackQuery, state: FSMContext, reviewed_ids: List[int], status: str):
+        """
+        审核后增量刷新当前页
+
+        从视图中移除已审核的项目，按游标只补取空出来的条数，
+        只删除已审核项目的媒体消息、只为补位的项目发送媒体消息。
+        视图缺失或与实际不一致时退回整页重新加载。
+        """
+        data = await state.get_data()
+        view = data.get(self.config.view_state_key)
+        panel_message_id = data.get('main_message_id') or cb.message.message_id
+        reviewed = set(reviewed_ids)
+        selected = set(data.get(self.config.selected_state_key, [])) - reviewed
+        await state.update_data({self.config.selected_state_key: sorted(selected)})
+        
+        entries = view['items'] if view else []
+        removed = [entry for entry in entries if entry['id'] in reviewed]
+        kept = [entry for entry in entries if entry['id'] not in reviewed]
+        
+        # 已发送的媒体消息应与视图中的一一对应（查看详情等操作会清理或额外发送媒体消息）
+        removed_media = [entry['media'] for entry in removed if entry['media']]
+        sent_media_ids = set(data.get('sent_media_ids', [])) - set(removed_media)
+        kept_media = {entry['media'] for entry in kept if entry['media']}
+        
+        full_reload = (
+            not view
+            or not view.get('cursor')
+            or self.config.get_pending_after_function is None
+            # 审核了不在当前页的项目，前面各页的位置已变化
+            or len(removed) != len(reviewed)
+            # 拒绝带重复项的求片后，下一条重复项成为新的列表项，位置可能在游标之前
+            or (status == "rejected" and any(entry['dup'] for entry in removed))
+            or sent_media_ids != kept_media
+        )
+        page = view['page'] if view else 1
+        if full_reload:
+            debug_review_flow("审核列表视图不可增量刷新，重新加载当前页", page=page)
+            await self._show_page(cb, state, page, panel_message_id)
+            return
+        
+        # 只补取空出来的条数（单条审核时只查询一行）
+        need = REVIEW_PAGE_SIZE - len(kept)
+        new_items = await self.config.get_pending_after_function(decode_cursor(view['cursor']), need) if need > 0 else []
+        if not kept and not new_items:
+            # 当前页已全部审核且后面没有数据：回到上一页（或显示空列表）
+            await self._show_page(cb, state, max(page - 1, 1), panel_message_id)
+            return
+        
+        await self._delete_media_messages(cb.bot, state, removed_media)
+        
+        new_entries = await self._build_view_items(new_items)
+        view['items'] = kept + new_entries
+        if new_items:
+            view['cursor'] = self._cursor_of(new_items[-1])
+        # 补位的项目可能是新提交的，总数至少要覆盖到当前页末尾
+        view['total'] = max(view['total'] - len(removed), (page - 1) * REVIEW_PAGE_SIZE + len(view['items']))
+        
+        text, keyboard = self._render_view(view, selected)
+        await self._edit_panel(cb, panel_message_id, text, keyboard)
+        
+        media = await self._send_media_messages(cb, state, await self._build_media(new_items))
+        for entry in new_entries:
+            entry['media'] = media.get(entry['id'])
+        await state.update_data({self.config.view_state_key: view})
+        debug_review_flow(
+            f"{self.config.name}审核列表增量刷新完成",
+            removed=len(removed),
+            added=len(new_entries),
+            total=view['total']
+        )
+    
+    @staticmethod
+    def _cursor_of(item: Any) -> str:
+        return encode_cursor((item.created_at, item.id))
+    
+    async def _build_view_items(self, items: List) -> List[Dict[str, Any]]:
+        """构建视图中的项目：ID、卡片文本、是否有重复项、媒体消息ID（发送后填入）"""
+        duplicates = await self.config.get_duplicates_function(items) if self.config.get_duplicates_function and items else {}
+        return [
+            {
+                'id': item.id,
+                'card': await ReviewUIBuilder.build_review_card(self.config, item, duplicates.get(item.id)),
+                'dup': item.id in duplicates,
+                'media': None,
+            }
+            for item in items
+        ]
+    
+    def _render_view(self, view: Dict[str, Any], selected: Set[int]):
+        """用视图中缓存的卡片渲染列表文本与键盘（不查询数据库）"""
+        item_ids = [entry['id'] for entry in view['items']]
+        paginator = QueryPaginator(self.config.pending_query_function(), page_size=REVIEW_PAGE_SIZE)
+        paginator.restore(view['page'], item_ids, view['total'])
+        text = ReviewUIBuilder.format_review_list_text(
+            self.config, [entry['card'] for entry in view['items']], paginator, view['page']
+        )
+        keyboard = ReviewUIBuilder.build_review_list_keyboard(self.config, item_ids, paginator, view['page'], selected)
+        return text, keyboard
+    
+    async def _edit_panel(self, cb: types.CallbackQuery, message_id: int, text: str, keyboard: types.InlineKeyboardMarkup):
+        """编辑列表主消息（审核可能来自媒体消息，主消息不一定是当前回调所在的消息）"""
+        if message_id == cb.message.message_id:
+            from app.utils.message_utils import safe_edit_message
+            await safe_edit_message(cb.message, caption=text, reply_markup=keyboard)
+            return
+        try:
+            await cb.bot.edit_message_caption(
+                chat_id=cb.message.chat.id,
+                message_id=message_id,
+                caption=text,
+                reply_markup=keyboard
+            )
+        except Exception as e:
+            if "message is not modified" not in str(e):
+                logger.error(f"编辑审核列表主消息失败: {e}")
+    
+    async def _delete_media_messages(self, bot, state: FSMContext, message_ids: List[int]):
+        """批量删除指定的媒体消息，并从已发送记录中移除（已不在记录中的跳过）"""
+        data = await state.get_data()
+        sent_media_ids = data.get('sent_media_ids', [])
+        to_delete = [message_id for message_id in message_ids if message_id in sent_media_ids]
+        if to_delete:
+            await delete_messages_bulk(bot, data.get('chat_id'), to_delete)
+        sent_media_ids = [message_id for message_id in sent_media_ids if message_id not in to_delete]
+        await state.update_data(sent_media_ids=sent_media_ids)
+        debug_media_message_tracking("删除已审核项目的媒体消息", message_ids=message_ids)
+    
+    async def _build_media(self, items: List) -> List[Tuple[int, str, str]]:
+        """构建有附件的项目的媒体消息：(项目ID, 图片 file_id, 说明文字)"""
+        media = []
+        for item in items:
+            if not (hasattr(item, 'file_id') and item.file_id):
+                debug_log(
+                    f"{self.config.name}项目无媒体文件",
+                    item_id=item.id
+                )
+                continue
+            # 获取类型信息
+            category_name = "未知类型"
+            if hasattr(item, 'category') and item.category:
+                category_name = item.category.name
+            
+            # 状态显示
+            status_text = get_status_text(item.status)
+            
+            # 获取用户显示链接
+            user_display = await get_user_display_link(item.user_id)
+            
+            # 美化的媒体消息说明
+            title = getattr(item, self.config.title_field)
+            media_caption = (
+                f"{self.config.emoji} <b>【{category_name}】{title}</b>\n\n"
+                f"🆔 <b>{self.config.name}ID</b>：<code>{item.id}</code>\n"
+                f"👤 <b>用户</b>：{user_display}\n"
+                f"⏰ <b>时间</b>：{humanize_time(item.created_at)}\n"
+                f"🏷️ <b>状态</b>：<code>{status_text}</code>\n\n"
+            )
+            
+            content = getattr(item, self.config.content_field, None)
+            if content:
+                media_caption += f"📝 <b>描述</b>：\n{content}\n\n"
+            
+            media_caption += "📎 <b>附件预览</b> ⬆️"
+            media.append((item.id, item.file_id, media_caption))
+        return media
+    
+    async def _send_media_messages(self, cb: types.CallbackQuery, state: FSMContext, media: List[Tuple[int, str, str]]) -> Dict[int, int]:
+        """
+        发送媒体消息（_build_media 的结果），返回 项目ID -> 媒体消息ID
+
+        每条媒体消息带有该项目的审核按钮，相册无法附带按钮，因此逐条发送；
+        发送完成后一次性记录全部媒体消息ID。
+        """
         debug_media_message_tracking(
             "开始发送媒体消息",
-            total_items=len(items),
+            total_items=len(media),
             item_type=self.config.item_type
         )
         
         sent_count = 0
-        for item in items:
-            if hasattr(item, 'file_id') and item.file_id:
-                debug_log(
-                    f"准备发送{self.config.name}媒体消息",
-                    item_id=item.id,
-                    file_id=item.file_id[:20] + "..." if len(item.file_id) > 20 else item.file_id
+        sent = {}
+        for item_id, file_id, media_caption in media:
+            debug_log(
+                f"准备发送{self.config.name}媒体消息",
+                item_id=item_id,
+                file_id=file_id[:20] + "..." if len(file_id) > 20 else file_id
+            )
+            # 创建媒体消息的审核按钮
+            media_keyboard = ReviewUIBuilder.build_media_keyboard(self.config, item_id)
+            
+            try:
+                sent_message = await cb.message.bot.send_photo(
+                    chat_id=cb.from_user.id, 
+                    photo=file_id, 
+                    caption=media_caption,
+                    parse_mode="HTML",
+                    reply_markup=media_keyboard
                 )
-                # 获取类型信息
-                category_name = "未知类型"
-                if hasattr(item, 'category') and item.category:
-                    category_name = item.category.name
-                
-                # 状态显示
-                status_text = get_status_text(item.status)
-                
-                # 获取用户显示链接
-                user_display = await get_user_display_link(item.user_id)
                 
-                # 美化的媒体消息发送
-                title = getattr(item, self.config.title_field)
-                media_caption = (
-                    f"{self.config.emoji} <b>【{category_name}】{title}</b>\n\n"
-                    f"🆔 <b>{self.config.name}ID</b>：<code>{item.id}</code>\n"
-                    f"👤 <b>用户</b>：{user_display}\n"
-                    f"⏰ <b>时间</b>：{humanize_time(item.created_at)}\n"
-                    f"🏷️ <b>状态</b>：<code>{status_text}</code>\n\n"
+                sent_count += 1
+                sent[item_id] = sent_message.message_id
+                debug_log(
+                    f"{self.config.name}媒体消息发送成功",
+                    item_id=item_id,
+                    sent_message_id=sent_message.message_id,
+                    sent_count=sent_count
                 )
                 
-                content = getattr(item, self.config.content_field, None)
-                if content:
-                    media_caption += f"📝 <b>描述</b>：\n{content}\n\n"
-                
-                media_caption += "📎 <b>附件预览</b> ⬆️"
-                
-                # 创建媒体消息的审核按钮
-                media_keyboard = ReviewUIBuilder.build_media_keyboard(self.config, item.id)
-                
-                try:
-                    sent_message = await cb.message.bot.send_photo(
-                        chat_id=cb.from_user.id, 
-                        photo=item.file_id, 
-                        caption=media_caption,
-                        parse_mode="HTML",
-                        reply_markup=media_keyboard
-                    )
-                    
-                    sent_count += 1
-                    debug_log(
-                        f"{self.config.name}媒体消息发送成功",
-                        item_id=item.id,
-                        sent_message_id=sent_message.message_id,
-                        sent_count=sent_count
-                    )
-                    
-                    # 记录发送的媒体消息ID
-                    data = await state.get_data()
-                    sent_media_ids = data.get('sent_media_ids', [])
-                    sent_media_ids.append(sent_message.message_id)
-                    await state.update_data(
-                        sent_media_ids=sent_media_ids,
-                        chat_id=cb.from_user.id
-                    )
-                    
-                    debug_media_message_tracking(
-                        "媒体消息ID已记录",
-                        message_ids=[sent_message.message_id],
-                        total_sent=len(sent_media_ids)
-                    )
-                except Exception as e:
-                    debug_error(
-                        "媒体消息发送失败",
-                        str(e),
-                        item_id=item.id,
-                        item_type=self.config.item_type
-                    )
-                    logger.error(f"发送媒体消息失败: {e}")
-            else:
-                debug_log(
-                    f"{self.config.name}项目无媒体文件",
-                    item_id=item.id
+            except Exception as e:
+                debug_error(
+                    "媒体消息发送失败",
+                    str(e),
+                    item_id=item_id,
+                    item_type=self.config.item_type
                 )
+                logger.error(f"发送媒体消息失败: {e}")
+        
+        # 记录发送的媒体消息ID
+        if sent:
+            data = await state.get_data()
+            sent_media_ids = data.get('sent_media_ids', []) + list(sent.values())
+            await state.update_data(
+                sent_media_ids=sent_media_ids,
+                chat_id=cb.from_user.id
+            )
+            debug_media_message_tracking(
+                "媒体消息ID已记录",
+                message_ids=list(sent.values()),
+                total_sent=len(sent_media_ids)
+            )
         
         debug_media_message_tracking(
             "媒体消息发送完成",
             sent_count=sent_count,
-            total_items=len(items)
+            total_items=len(media)
         )
+        return sent
     
     async def handle_detail(self, cb: types.CallbackQuery, state: FSMContext, item_id: int):
         """处理详情查看"""
@@ -462,26 +723,22 @@ class ReviewHandler:
         )
         await cb.answer()
     
+    async def _current_page(self, state: FSMContext) -> int:
+        """审核列表当前所在页"""
+        view = (await state.get_data()).get(self.config.view_state_key)
+        return view['page'] if view else 1
+    
     async def handle_approve(self, cb: types.CallbackQuery, state: FSMContext, item_id: int, note: str = None):
         """处理通过审核"""
         success = await self.config.review_function(item_id, cb.from_user.id, "approved", note)
         
         if success:
-            # 发送审核通知
-            await self._send_review_notification(cb, item_id, "approved")
+            # 审核通知交给后台队列发送
+            queue_review_notifications(cb.bot, self.config.item_type, [item_id], "approved", note)
             
-            # 如果是媒体消息审核，只显示alert并刷新主面板数据
-            if "media" in cb.data:
-                await cb.answer(f"✅ {self.config.name}已通过")
-                # 删除已发送的媒体消息并刷新主面板当前页数据
-                await cleanup_sent_media_messages(cb.bot, state)
-                await self.handle_review_list(cb, state)
-            else:
-                # 主菜单审核：显示alert，返回审核页面并刷新数据，重新发送媒体消息
-                await cb.answer(f"✅ {self.config.name}已通过")
-                # 删除之前发送的媒体消息，刷新审核列表并重新发送媒体消息
-                await cleanup_sent_media_messages(cb.bot, state)
-                await self.handle_review_list(cb, state)
+            # 无论来自主面板还是媒体消息，都只移除这一项并补位
+            await cb.answer(f"✅ {self.config.name}已通过")
+            await self.refresh_after_review(cb, state, [item_id], "approved")
         else:
             await cb.answer(f"❌ 操作失败，请检查{self.config.name}ID是否正确", show_alert=True)
     
@@ -490,21 +747,12 @@ class ReviewHandler:
         success = await self.config.review_function(item_id, cb.from_user.id, "rejected", note)
         
         if success:
-            # 发送审核通知
-            await self._send_review_notification(cb, item_id, "rejected")
+            # 审核通知交给后台队列发送
+            queue_review_notifications(cb.bot, self.config.item_type, [item_id], "rejected", note)
             
-            # 如果是媒体消息审核，只显示alert并刷新主面板数据
-            if "media" in cb.data:
-                await cb.answer(f"❌ {self.config.name}已拒绝")
-                # 删除已发送的媒体消息并刷新主面板当前页数据
-                await cleanup_sent_media_messages(cb.bot, state)
-                await self.handle_review_list(cb, state)
-            else:
-                # 主菜单审核：显示alert，返回审核页面并刷新数据，重新发送媒体消息
-                await cb.answer(f"❌ {self.config.name}已拒绝")
-                # 删除之前发送的媒体消息，刷新审核列表并重新发送媒体消息
-                await cleanup_sent_media_messages(cb.bot, state)
-                await self.handle_review_list(cb, state)
+            # 无论来自主面板还是媒体消息，都只移除这一项并补位
+            await cb.answer(f"❌ {self.config.name}已拒绝")
+            await self.refresh_after_review(cb, state, [item_id], "rejected")
         else:
             await cb.answer(f"❌ 操作失败，请检查{self.config.name}ID是否正确", show_alert=True)
     
@@ -532,30 +780,60 @@ class ReviewHandler:
         except Exception as e:
             logger.error(f"删除媒体消息失败: {e}")
             await cb.answer("❌ 删除失败")
+
+    async def handle_toggle_select(self, cb: types.CallbackQuery, state: FSMContext, item_id: int):
+        """勾选/取消勾选单个项目（只更新键盘）"""
+        data = await state.get_data()
+        selected = set(data.get(self.config.selected_state_key, []))
+        selected.symmetric_difference_update({item_id})
+        await self._update_selection(cb, state, selected)
     
-    async def _send_review_notification(self, cb: types.CallbackQuery, item_id: int, status: str):
-        """发送审核通知"""
+    async def handle_select_page(self, cb: types.CallbackQuery, state: FSMContext):
+        """全选本页；本页已全部勾选时取消勾选"""
+        page_ids = set(ReviewUIBuilder.page_item_ids(self.config, cb.message.reply_markup))
+        data = await state.get_data()
+        selected = set(data.get(self.config.selected_state_key, []))
+        if page_ids <= selected:
+            selected -= page_ids
+        else:
+            selected |= page_ids
+        await self._update_selection(cb, state, selected)
+    
+    async def _update_selection(self, cb: types.CallbackQuery, state: FSMContext, selected: Set[int]):
+        from app.config.config import REVIEW_BULK_MAX_ITEMS
+        
+        if len(selected) > REVIEW_BULK_MAX_ITEMS:
+            await cb.answer(f"❌ 一次最多选择 {REVIEW_BULK_MAX_ITEMS} 条", show_alert=True)
+            return
+        await state.update_data({self.config.selected_state_key: sorted(selected)})
         try:
-            # 获取项目信息
-            item = await self.config.get_item_by_id_function(item_id)
-            if not item:
-                return
-            
-            # 获取分类名称
-            category_name = None
-            if hasattr(item, 'category_id') and item.category_id:
-                from app.database.business import get_movie_category_by_id
-                category = await get_movie_category_by_id(item.category_id)
-                category_name = category.name if category else None
-            
-            # 发送通知
-            await send_review_notification(
-                cb.bot, item.user_id, self.config.item_type, 
-                getattr(item, self.config.title_field), status,
-                file_id=getattr(item, 'file_id', None),
-                item_content=getattr(item, self.config.content_field, None),
-                item_id=item.id,
-                category_name=category_name
+            await cb.message.edit_reply_markup(
+                reply_markup=ReviewUIBuilder.apply_selection(self.config, cb.message.reply_markup, selected)
             )
         except Exception as e:
-            logger.error(f"发送审核通知失败: {e}")
\ No newline at end of file
+            if "message is not modified" not in str(e):
+                logger.error(f"更新勾选状态失败: {e}")
+        await cb.answer(f"已选择 {len(selected)} 条")
+    
+    async def handle_bulk_review(self, cb: types.CallbackQuery, state: FSMContext, status: str, note: str = None):
+        """批量通过/拒绝已勾选的项目（一个事务），通知交给后台队列，完成后增量刷新当前页"""
+        data = await state.get_data()
+        selected = data.get(self.config.selected_state_key, [])
+        if not selected:
+            await cb.answer(f"请先勾选要审核的{self.config.name}", show_alert=True)
+            return
+        
+        reviewed = await self.config.bulk_review_function(selected, cb.from_user.id, status, note)
+        await state.update_data({self.config.selected_state_key: []})
+        if not reviewed:
+            await cb.answer(f"❌ 所选{self.config.name}均已被审核或不存在", show_alert=True)
+            await self._show_page(cb, state, await self._current_page(state))
+            return
+        
+        queue_review_notifications(cb.bot, self.config.item_type, reviewed, status, note)
+        
+        action_text = "通过" if status == "approved" else "拒绝"
+        skipped = len(selected) - len(reviewed)
+        skipped_text = f"，{skipped} 条已被审核" if skipped else ""
+        await cb.answer(f"{'✅' if status == 'approved' else '❌'} 已批量{action_text} {len(reviewed)} 条{self.config.name}{skipped_text}")
+        await self.refresh_after_review(cb, state, reviewed, status)
@@ -1,10 +1,41 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from aiogram import types
 from app.utils.time_utils import humanize_time, get_status_text
 from app.utils.panel_utils import get_user_display_link
 from loguru import logger
 
 
+def parse_id_list(text: str, max_items: int = None) -> List[int]:
+    """
+    解析审核命令中的ID列表，支持逗号分隔与区间，如 "12"、"3-7,9"、"3,5,8-10"
+
+    Returns:
+        去重后升序排列的ID列表
+
+    Raises:
+        ValueError: 格式错误或数量超过 max_items
+    """
+    ids = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(value) for value in part.split("-", 1))
+            if start > end:
+                start, end = end, start
+            if max_items is not None and end - start + 1 > max_items:
+                raise ValueError(f"一次最多处理 {max_items} 条")
+            ids.update(range(start, end + 1))
+        else:
+            ids.add(int(part))
+        if max_items is not None and len(ids) > max_items:
+            raise ValueError(f"一次最多处理 {max_items} 条")
+    if not ids:
+        raise ValueError("缺少ID")
+    return sorted(ids)
+
+
 class ReviewUIBuilder:
     """审核界面构建器"""
     
@@ -26,6 +26,9 @@ class Wait(StatesGroup):
     # 审核留言状态
     waitReviewNote = State()
     
+    # 全文搜索关键词输入状态
+    waitSearchKeyword = State()
+    
     # 回复用户状态
     waitReplyMessage = State()
     
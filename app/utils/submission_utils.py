@@ -1,8 +1,10 @@
 from typing import Optional, Dict, Any, List
+import html
 from aiogram import types
 from aiogram.fsm.context import FSMContext
 from app.utils.time_utils import humanize_time, get_status_text
-from app.utils.pagination import Paginator, format_page_header
+from app.utils.pagination import Paginator, QueryPaginator, format_page_header
+from app.utils.render_cache import render_cache
 from app.database.business import get_all_movie_categories
 from loguru import logger
 
@@ -24,7 +26,10 @@ class SubmissionConfig:
                  content_field: str,
                  content_label: str = "内容",
                  new_callback: str = None,
-                 my_callback: str = None):
+                 my_callback: str = None,
+                 user_items_query_function=None,
+                 find_duplicates_function=None,
+                 data_tables: tuple = ()):
         self.item_type = item_type
         self.emoji = emoji
         self.name = name
@@ -40,6 +45,12 @@ class SubmissionConfig:
         # 回调数据配置
         self.new_callback = new_callback or f"{item_type}_request_new"
         self.my_callback = my_callback or f"{item_type}_request_my"
+        # 返回用户项目查询（select）的函数，用于数据库分页
+        self.user_items_query_function = user_items_query_function
+        # 按标题查找已有相似项目的函数，输入标题后提示用户
+        self.find_duplicates_function = find_duplicates_function
+        # 列表内容依赖的表，用作渲染缓存的数据版本；为空时不缓存
+        self.data_tables = data_tables
 
 
 class SubmissionUIBuilder:
@@ -90,7 +101,24 @@ class SubmissionUIBuilder:
         )
     
     @staticmethod
-    def build_content_input_text(config: SubmissionConfig, category_name: str, title: str) -> str:
+    def build_duplicates_text(config: SubmissionConfig, duplicates: List) -> str:
+        """构建已有相似项目的提示文本"""
+        if not duplicates:
+            return ""
+        
+        text = f"🔁 <b>已有相似{config.name}</b>\n"
+        for i, match in enumerate(duplicates, 1):
+            prefix = "└" if i == len(duplicates) else "├"
+            text += f"{prefix} #{match.request_id} {html.escape(match.title)}（{get_status_text(match.status)}）\n"
+        
+        if any(match.status == "approved" for match in duplicates):
+            text += f"💡 <i>已通过的{config.name}无需重复提交，可直接在频道中查找</i>\n\n"
+        else:
+            text += f"💡 <i>相同的{config.name}会合并审核，通过后一并通知</i>\n\n"
+        return text
+    
+    @staticmethod
+    def build_content_input_text(config: SubmissionConfig, category_name: str, title: str, duplicates: List = None) -> str:
         """构建内容输入文本"""
         if config.item_type == 'movie':
             # 求片的提示信息
@@ -98,6 +126,7 @@ class SubmissionUIBuilder:
                 f"{config.emoji} <b>开始{config.name}</b> {config.emoji}\n\n"
                 f"📂 <b>类型</b>：{category_name}\n"
                 f"✅ <b>{config.title_field}</b>：{title}\n\n"
+                f"{SubmissionUIBuilder.build_duplicates_text(config, duplicates)}"
                 f"📝 <b>请输入{config.content_label}</b>\n"
                 f"├ 可以发送豆瓣链接或其他\n"
                 f"├ 可以描述剧情、演员、年份等信息\n"
@@ -335,6 +364,11 @@ class SubmissionHandler:
         # 保存标题
         await state.update_data(title=title)
         
+        # 提交前查找已有的相似项目
+        duplicates = []
+        if self.config.find_duplicates_function:
+            duplicates = await self.config.find_duplicates_function(title)
+        
         # 删除用户输入的消息
         try:
             await msg.delete()
@@ -349,7 +383,7 @@ class SubmissionHandler:
             await msg.bot.edit_message_caption(
                 chat_id=msg.from_user.id,
                 message_id=message_id,
-                caption=SubmissionUIBuilder.build_content_input_text(self.config, category_name, title),
+                caption=SubmissionUIBuilder.build_content_input_text(self.config, category_name, title, duplicates),
                 reply_markup=back_to_main_kb,
                 parse_mode="HTML"
             )
@@ -357,7 +391,7 @@ class SubmissionHandler:
             logger.error(f"编辑消息失败: {e}")
             # 如果编辑失败，发送新消息
             await msg.reply(
-                SubmissionUIBuilder.build_content_input_text(self.config, category_name, title),
+                SubmissionUIBuilder.build_content_input_text(self.config, category_name, title, duplicates),
                 reply_markup=back_to_main_kb
             )
     
@@ -506,17 +540,28 @@ class SubmissionHandler:
     
     async def handle_my_submissions(self, cb: types.CallbackQuery, page: int = 1):
         """处理我的提交列表"""
-        # 获取用户的提交记录
-        items = await self.config.get_user_items_function(cb.from_user.id)
-        
-        # 创建分页器
+        # 获取用户的提交记录（只查询当前页）
         from app.config.config import SUBMISSION_PAGE_SIZE
-        paginator = Paginator(items, page_size=SUBMISSION_PAGE_SIZE)
-        page_data = paginator.get_page_items(page)
+        paginator = QueryPaginator(self.config.user_items_query_function(cb.from_user.id), page_size=SUBMISSION_PAGE_SIZE)
+        
+        async def render():
+            loaded_page = await paginator.load(page)
+            page_data = paginator.get_page_items(loaded_page)
+            return {
+                'page': loaded_page,
+                'total': paginator.total_items,
+                'text': SubmissionUIBuilder.build_my_items_text(self.config, page_data, paginator, loaded_page),
+            }
+        
+        # 数据未变化时直接使用缓存的文本，只按总数恢复分页状态
+        rendered = await render_cache.get_or_render(
+            f"my_{self.config.item_type}", page, cb.from_user.id, self.config.data_tables, render
+        )
+        paginator.restore(rendered['page'], [], rendered['total'])
         
         # 构建界面
         await cb.message.edit_caption(
-            caption=SubmissionUIBuilder.build_my_items_text(self.config, page_data, paginator, page),
-            reply_markup=SubmissionUIBuilder.build_my_items_keyboard(self.config, paginator, page)
+            caption=rendered['text'],
+            reply_markup=SubmissionUIBuilder.build_my_items_keyboard(self.config, paginator, rendered['page'])
         )
         await cb.answer()
\ No newline at end of file
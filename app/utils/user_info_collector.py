@@ -173,7 +173,14 @@ async def collect_and_store_user_info(telegram_user, ip_address: str = None, use
     """
     收集并存储用户信息的便捷函数
     """
-    from app.database.users import add_user, update_user_location
+    from app.database.users import add_user, update_user_location, known_user_cache
+    
+    # 快速路径：已入库且资料未变化的用户无需访问数据库
+    profile = known_user_cache.profile_key(
+        telegram_user.full_name, telegram_user.username, getattr(telegram_user, 'is_premium', False)
+    )
+    if not ip_address and known_user_cache.is_known(telegram_user.id, profile):
+        return True
     
     try:
         # 收集用户信息
@@ -201,7 +208,7 @@ async def collect_and_store_user_info(telegram_user, ip_address: str = None, use
         if location_info:
             await update_user_location(telegram_user.id, location_info)
         
-        logger.info(f"用户信息收集完成: {telegram_user.username} ({telegram_user.id})")
+        logger.debug(f"用户信息收集完成: {telegram_user.username} ({telegram_user.id})")
         return True
         
     except Exception as e:
@@ -0,0 +1,46 @@
+"""
+测试公共配置
+- 导入 app 之前把数据库指向临时目录中的 SQLite 文件，不会碰到开发数据库
+- 数据库连接池绑定事件循环，异步代码统一通过 run 夹具在同一个事件循环中执行
+- database 夹具为每个测试重建空库
+"""
+
+import asyncio
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_DB_PATH = Path(tempfile.mkdtemp(prefix="bot-tests-")) / "test.db"
+_DB_URL = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["DATABASE_URL_ASYNC"] = _DB_URL
+
+from app.config import DATABASE_URL_ASYNC  # noqa: E402
+
+if DATABASE_URL_ASYNC != _DB_URL:
+    # 项目根目录的 .env 会覆盖环境变量，此时拒绝运行，避免测试清空真实数据库
+    pytest.exit(f".env 中的 DATABASE_URL_ASYNC 覆盖了测试数据库: {DATABASE_URL_ASYNC}", returncode=1)
+
+_loop = asyncio.new_event_loop()
+
+
+@pytest.fixture(scope="session")
+def run():
+    """在测试共用的事件循环中执行协程"""
+    return _loop.run_until_complete
+
+
+@pytest.fixture
+def database(run):
+    """已建表的空数据库"""
+    from app.database.db import engine, write_engine, init_db
+
+    async def reset():
+        await engine.dispose()
+        await write_engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{_DB_PATH}{suffix}").unlink(missing_ok=True)
+        await init_db()
+
+    run(reset())
@@ -0,0 +1,115 @@
+"""高级浏览的游标编码与游标分页"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+
+from app.database.business import advanced_browse_query, get_movie_requests_advanced
+from app.database.db import AsyncSessionLocal, engine
+from app.database.query_plans import _explain
+from app.database.schema import MovieRequest, User
+from app.utils.advanced_browser import decode_cursor, encode_cursor
+
+BASE_TIME = datetime(2024, 5, 1, 12, 0, 0)
+
+
+@pytest.mark.parametrize("cursor", [
+    (datetime(2024, 5, 1, 12, 30, 15, 123456), 42),
+    (datetime(1999, 12, 31, 23, 59, 59), 1),
+    (None, 7),
+])
+def test_cursor_round_trip(cursor):
+    token = encode_cursor(cursor)
+    assert "_" not in token  # 回调数据以下划线分隔字段
+    assert decode_cursor(token) == cursor
+
+
+def _seed_requests(run, created_at: list, reviewed_at: list = None) -> None:
+    async def seed():
+        # category_id=1 为 init_db 写入的默认类型
+        async with AsyncSessionLocal() as session:
+            session.add(User(chat_id=1, username="tester", full_name="Tester"))
+            await session.flush()
+            await session.execute(insert(MovieRequest), [
+                {
+                    "user_id": 1,
+                    "category_id": 1,
+                    "title": f"片名{index}",
+                    "created_at": value,
+                    "reviewed_at": reviewed_at[index] if reviewed_at else None,
+                }
+                for index, value in enumerate(created_at)
+            ])
+            await session.commit()
+
+    run(seed())
+
+
+def _page_through(run, limit: int, sort_field: str, sort_order: str, backwards: bool = False) -> list:
+    """按游标逐页翻完全部数据，返回按显示顺序排列的 id"""
+    pages = []
+    direction = "last" if backwards else "next"
+    cursor = None
+    while True:
+        result = run(get_movie_requests_advanced(
+            limit=limit, sort_field=sort_field, sort_order=sort_order, cursor=cursor, direction=direction
+        ))
+        pages.append([item.id for item in result['items']])
+        if not result['items'] or (cursor is not None and not result['has_more']):
+            break
+        if backwards:
+            cursor, direction = result['first_cursor'], "prev"
+        else:
+            cursor = result['last_cursor']
+    if backwards:
+        pages.reverse()
+    return [item_id for page in pages for item_id in page]
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("backwards", [False, True])
+def test_seek_with_tied_timestamps(database, run, sort_order, backwards):
+    # 每 4 条共用一个创建时间，页大小 3 保证翻页游标落在相同时间的中间
+    created_at = [BASE_TIME + timedelta(minutes=index // 4) for index in range(17)]
+    _seed_requests(run, created_at)
+    expected = sorted(range(1, 18), key=lambda item_id: (created_at[item_id - 1], item_id))
+    if sort_order == "desc":
+        expected.reverse()
+
+    assert _page_through(run, 3, "created_at", sort_order, backwards) == expected
+
+
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("backwards", [False, True])
+def test_seek_on_nullable_sort_field(database, run, sort_order, backwards):
+    # 可为空的排序字段：NULL 视为最小值，且同样存在重复值
+    reviewed_at = [None if index % 3 == 0 else BASE_TIME + timedelta(hours=index % 2) for index in range(11)]
+    _seed_requests(run, [BASE_TIME] * 11, reviewed_at)
+
+    def key(item_id):
+        value = reviewed_at[item_id - 1]
+        return (value is not None, value or BASE_TIME, item_id)
+
+    expected = sorted(range(1, 12), key=key)
+    if sort_order == "desc":
+        expected.reverse()
+
+    assert _page_through(run, 4, "reviewed_at", sort_order, backwards) == expected
+
+
+@pytest.mark.parametrize("model", [MovieRequest, User])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+@pytest.mark.parametrize("direction", ["next", "prev"])
+def test_seek_uses_index_range(database, run, model, sort_order, direction):
+    query = advanced_browse_query(
+        model, [], "created_at", sort_order, cursor=(BASE_TIME, 100), direction=direction
+    ).limit(11)
+
+    async def explain():
+        async with engine.connect() as conn:
+            return await conn.run_sync(_explain, query)
+
+    plan = run(explain())
+    assert len(plan) == 1
+    assert plan[0].startswith(f"SEARCH {model.__tablename__} USING INDEX ix_{model.__tablename__}_created_at (created_at")
@@ -0,0 +1,131 @@
+"""频道同步发件箱的重试与失败状态流转"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+from sqlalchemy import select, update
+
+from app.database.channel_outbox import claim_due_posts, recover_interrupted_posts
+from app.database.db import AsyncSessionLocal
+from app.database.schema import ChannelPost
+from app.utils.channel_sync import ChannelSyncWorker
+
+
+class FakeBot:
+    """按顺序返回预设结果的 bot：异常则抛出，否则作为发送成功的消息ID"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return SimpleNamespace(message_id=outcome)
+
+
+def _worker(*outcomes) -> ChannelSyncWorker:
+    worker = ChannelSyncWorker(max_attempts=2, retry_base=30, retry_max=3600)
+    worker._bot = FakeBot(*outcomes)
+    return worker
+
+
+def _add_post(run, item_id: int = 1) -> int:
+    async def add():
+        async with AsyncSessionLocal() as session:
+            post = ChannelPost(item_type="movie", item_id=item_id, channel="@channel", status="pending", attempts=0)
+            session.add(post)
+            await session.commit()
+            return post.id
+
+    return run(add())
+
+
+def _get_post(run, post_id: int) -> ChannelPost:
+    async def get():
+        async with AsyncSessionLocal() as session:
+            return await session.scalar(select(ChannelPost).where(ChannelPost.id == post_id))
+
+    return run(get())
+
+
+def _make_due(run, post_id: int) -> None:
+    async def due():
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(ChannelPost).where(ChannelPost.id == post_id).values(next_attempt_at=datetime.now())
+            )
+            await session.commit()
+
+    run(due())
+
+
+def test_retry_then_fail_after_max_attempts(database, run):
+    post_id = _add_post(run)
+    timeout = TelegramNetworkError(method=SendMessage(chat_id="@channel", text="text"), message="timeout")
+    worker = _worker(timeout, timeout)
+
+    [post] = run(claim_due_posts(10))
+    assert (post.status, post.attempts) == ("sending", 1)
+    run(worker._deliver(post, ("text", None)))
+
+    post = _get_post(run, post_id)
+    assert post.status == "pending"
+    assert "timeout" in post.last_error
+    assert post.next_attempt_at > datetime.now() + timedelta(seconds=25)
+    # 未到重试时间不会被领取
+    assert run(claim_due_posts(10)) == []
+
+    _make_due(run, post_id)
+    [post] = run(claim_due_posts(10))
+    assert post.attempts == 2
+    run(worker._deliver(post, ("text", None)))
+
+    post = _get_post(run, post_id)
+    assert post.status == "failed"
+    assert worker.failed == 1
+    assert run(claim_due_posts(10)) == []
+
+
+def test_retry_after_is_an_ordinary_failure(database, run):
+    # 中间件重试用尽后仍抛出的 429 按普通退避处理，不再额外等待 retry_after
+    post_id = _add_post(run)
+    error = TelegramRetryAfter(
+        method=SendMessage(chat_id="@channel", text="text"), message="Too Many Requests", retry_after=7200
+    )
+    worker = _worker(error)
+
+    [post] = run(claim_due_posts(10))
+    run(worker._deliver(post, ("text", None)))
+
+    post = _get_post(run, post_id)
+    assert post.status == "pending"
+    assert post.next_attempt_at < datetime.now() + timedelta(seconds=60)
+
+
+def test_sent_and_missing_content(database, run):
+    post_id = _add_post(run)
+    worker = _worker(1234)
+
+    [post] = run(claim_due_posts(10))
+    run(worker._deliver(post, ("text", None)))
+    post = _get_post(run, post_id)
+    assert (post.status, post.message_id, post.last_error) == ("sent", 1234, None)
+    assert post.sent_at is not None
+
+    other_id = _add_post(run, item_id=2)
+    [other] = run(claim_due_posts(10))
+    run(worker._deliver(other, None))
+    assert _get_post(run, other_id).status == "failed"
+
+
+def test_interrupted_posts_are_failed_on_recovery(database, run):
+    post_id = _add_post(run)
+    run(claim_due_posts(10))
+
+    assert run(recover_interrupted_posts()) == 1
+    post = _get_post(run, post_id)
+    assert post.status == "failed"
+    assert run(claim_due_posts(10)) == []
@@ -0,0 +1,93 @@
+"""片名归一化与归一化片名的重建"""
+
+import pytest
+from sqlalchemy import delete, insert, select, update
+
+from app.database.db import AsyncSessionLocal, init_db
+from app.database.duplicates import TITLE_KEY_VERSION, normalize_title, title_trigrams
+from app.database.schema import MovieRequest, MovieTitleTrigram, SystemSettings, User
+
+
+@pytest.mark.parametrize("title, expected", [
+    ("肖申克的救贖", "肖申克的救赎"),
+    ("肖申克的救赎", "肖申克的救赎"),
+    ("蝙蝠俠：黑暗騎士", "蝙蝠侠黑暗骑士"),
+    ("ＴＨＥ　Ｍａｔｒｉｘ（１９９９）", "thematrix1999"),
+    ("The Matrix (1999)", "thematrix1999"),
+    ("  星際 效應 ", "星际效应"),
+    ("！！！", "!!!"),
+    ("...  ---", "... ---"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_title(title, expected):
+    assert normalize_title(title) == expected
+
+
+def test_traditional_and_simplified_titles_share_a_key():
+    assert normalize_title("無間道") == normalize_title("无间道")
+    assert title_trigrams(normalize_title("海上鋼琴師")) == title_trigrams(normalize_title("海上钢琴师"))
+
+
+def test_title_trigrams_pad_short_keys():
+    assert title_trigrams("a") == {"  a", " a "}
+    assert title_trigrams("") == set()
+
+
+def test_init_db_rebuilds_keys_when_version_changes(database, run):
+    async def seed():
+        async with AsyncSessionLocal() as session:
+            session.add(User(chat_id=1, username="tester", full_name="Tester"))
+            await session.flush()
+            await session.execute(insert(MovieRequest), [
+                {"user_id": 1, "category_id": 1, "title": "肖申克的救贖", "normalized_title": "过期的键"},
+            ])
+            await session.commit()
+
+    async def stored():
+        async with AsyncSessionLocal() as session:
+            key = await session.scalar(select(MovieRequest.normalized_title))
+            grams = set(await session.scalars(select(MovieTitleTrigram.trigram)))
+            version = await session.scalar(
+                select(SystemSettings.setting_value).where(SystemSettings.setting_key == "title_key_version")
+            )
+            return key, grams, version
+
+    async def set_version(value: str):
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(SystemSettings)
+                .where(SystemSettings.setting_key == "title_key_version")
+                .values(setting_value=value)
+            )
+            await session.commit()
+
+    run(seed())
+    # 版本一致时不会重建已有的归一化片名
+    run(init_db())
+    assert run(stored()) == ("过期的键", set(), str(TITLE_KEY_VERSION))
+
+    run(set_version("0"))
+    run(init_db())
+    key, grams, version = run(stored())
+    assert key == "肖申克的救赎"
+    assert grams == title_trigrams(key)
+    assert version == str(TITLE_KEY_VERSION)
+
+
+def test_init_db_records_version_on_existing_database(database, run):
+    async def drop_version():
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(SystemSettings).where(SystemSettings.setting_key == "title_key_version"))
+            await session.commit()
+
+    run(drop_version())
+    run(init_db())
+
+    async def version():
+        async with AsyncSessionLocal() as session:
+            return await session.scalar(
+                select(SystemSettings.setting_value).where(SystemSettings.setting_key == "title_key_version")
+            )
+
+    assert run(version()) == str(TITLE_KEY_VERSION)
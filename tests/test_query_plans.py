@@ -0,0 +1,13 @@
+"""热点查询执行计划"""
+
+from app.database.db import engine
+from app.database.query_plans import check_query_plans
+
+
+def test_hot_queries_use_indexes(database, run):
+    async def check():
+        async with engine.connect() as conn:
+            return await conn.run_sync(check_query_plans)
+
+    failed = {name: plan for name, plan, ok in run(check()) if not ok}
+    assert failed == {}
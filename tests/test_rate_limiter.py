@@ -0,0 +1,118 @@
+"""令牌桶与出站请求调度"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import rate_limiter
+from app.utils.rate_limiter import (
+    OutgoingScheduler, TokenBucket, PRIORITY_BROADCAST, PRIORITY_INTERACTIVE, PRIORITY_NOTIFICATION
+)
+
+
+class FakeClock:
+    """替换限速模块中的 time.monotonic 与 asyncio.sleep，sleep 直接推进时间"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(rate_limiter, "asyncio", SimpleNamespace(sleep=clock.sleep, Lock=asyncio.Lock))
+    return clock
+
+
+def test_token_bucket_burst_then_refill(run, clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+
+    async def scenario():
+        for _ in range(4):
+            await bucket.acquire()
+        assert clock.now == 0
+        await bucket.acquire()
+        assert clock.now == pytest.approx(0.5)
+        # 空闲足够久后最多补满容量
+        clock.now += 100
+        start = clock.now
+        for _ in range(4):
+            await bucket.acquire()
+        assert clock.now == start
+        await bucket.acquire()
+        assert clock.now == pytest.approx(start + 0.5)
+
+    run(scenario())
+
+
+def test_token_bucket_pause(run, clock):
+    bucket = TokenBucket(rate=2, capacity=4)
+
+    async def scenario():
+        await bucket.acquire()
+        bucket.pause(10)
+        # 暂停会清空令牌，暂停结束后从零开始补充
+        await bucket.acquire()
+        assert clock.now == pytest.approx(10.5)
+        # 暂停期间不计入补充时间，恢复后不会立即放出整桶突发
+        await bucket.acquire()
+        assert clock.now == pytest.approx(11)
+
+    run(scenario())
+
+
+def test_token_bucket_pause_does_not_shorten(run, clock):
+    bucket = TokenBucket(rate=1)
+
+    async def scenario():
+        bucket.pause(10)
+        bucket.pause(3)
+        await bucket.acquire()
+        assert clock.now == pytest.approx(11)
+
+    run(scenario())
+
+
+def test_token_bucket_take_overdraws(run, clock):
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    async def scenario():
+        await bucket.take()
+        await bucket.take()
+        assert clock.now == 0
+        # 透支的令牌补回之前，排队的 acquire 继续等待
+        await bucket.acquire()
+        assert clock.now == pytest.approx(2)
+
+    run(scenario())
+
+
+@pytest.mark.parametrize("queued_priority", [PRIORITY_BROADCAST, PRIORITY_NOTIFICATION])
+def test_interactive_reply_not_delayed_behind_queued_sends(run, queued_priority):
+    scheduler = OutgoingScheduler(
+        global_rate=1000, private_rate=1, private_burst=1, group_rate_per_minute=20, group_burst=3
+    )
+
+    async def scenario():
+        queued = [asyncio.create_task(scheduler.acquire(42, queued_priority)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        # 第一条取走了该私聊的令牌，其余在私聊令牌桶中排队（约 1 秒一条）
+        assert sum(task.done() for task in queued) == 1
+        start = time.monotonic()
+        await asyncio.wait_for(scheduler.acquire(42, PRIORITY_INTERACTIVE), timeout=0.5)
+        elapsed = time.monotonic() - start
+        for task in queued + [scheduler._task]:
+            task.cancel()
+        await asyncio.gather(*queued, scheduler._task, return_exceptions=True)
+        return elapsed
+
+    assert run(scenario()) < 0.1
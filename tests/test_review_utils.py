@@ -0,0 +1,36 @@
+"""审核命令的ID列表解析"""
+
+import pytest
+
+from app.utils.review_utils import parse_id_list
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("12", [12]),
+    ("3-7,9", [3, 4, 5, 6, 7, 9]),
+    ("3,5,8-10", [3, 5, 8, 9, 10]),
+    ("7-3", [3, 4, 5, 6, 7]),
+    ("5-5", [5]),
+    (" 1 , 1, 2-3 ,,", [1, 2, 3]),
+    ("3 - 5", [3, 4, 5]),
+    ("10,2,2-4", [2, 3, 4, 10]),
+])
+def test_parse_ranges(text, expected):
+    assert parse_id_list(text) == expected
+
+
+@pytest.mark.parametrize("text", ["1-5", "1,2,3,4,5", "1-3,3-5", "5,1-4,2"])
+def test_limit_counts_distinct_ids(text):
+    assert parse_id_list(text, max_items=5) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("text", ["1-6", "1,2,3,4,5,6", "1-3,4-6", "1-1000000000"])
+def test_limit_exceeded(text):
+    with pytest.raises(ValueError, match="最多处理 5 条"):
+        parse_id_list(text, max_items=5)
+
+
+@pytest.mark.parametrize("text", ["", ",", " , ", "abc", "1-", "-3", "1-2-3", "1,x"])
+def test_invalid_input(text):
+    with pytest.raises(ValueError):
+        parse_id_list(text)
@@ -0,0 +1,120 @@
+"""工作单元：helper 的 SAVEPOINT、单个 helper 回滚与出站请求前提交"""
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.database.db import AsyncSessionLocal, get_db, on_commit, unit_of_work
+from app.database.schema import User
+from app.middlewares.database import CommitBeforeRequestMiddleware
+
+
+async def _add_user(chat_id: int, committed: list) -> bool:
+    async for session in get_db():
+        try:
+            session.add(User(chat_id=chat_id, username=f"user{chat_id}", full_name=f"User {chat_id}"))
+            on_commit(session, lambda: committed.append(chat_id))
+            await session.commit()
+            return True
+        except IntegrityError:
+            await session.rollback()
+            return False
+
+
+async def _count_in_unit() -> int:
+    async for session in get_db():
+        return await session.scalar(select(func.count()).select_from(User))
+
+
+async def _count_committed() -> int:
+    """工作单元之外（另一个会话）能看到的用户数"""
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(select(func.count()).select_from(User))
+
+
+def test_nested_helpers_commit_once(database, run):
+    committed = []
+
+    async def outer_helper():
+        async for session in get_db():
+            session.add(User(chat_id=1, username="user1", full_name="User 1"))
+            # helper 内调用的 helper 嵌套一层 SAVEPOINT
+            assert await _add_user(2, committed)
+            assert session.in_helper()
+            await session.commit()
+            return True
+
+    async def scenario():
+        async with unit_of_work() as session:
+            assert await outer_helper()
+            assert not session.in_helper()
+            for _ in range(5):
+                assert await _count_in_unit() == 2
+            # 只读 helper 结束后同样释放 SAVEPOINT，不会越积越多
+            assert len(session.info["savepoints"]) <= 1
+            assert await _count_committed() == 0
+            assert committed == []
+        assert await _count_committed() == 2
+        assert committed == [2]
+
+    run(scenario())
+
+
+def test_rollback_of_one_helper(database, run):
+    committed = []
+
+    async def scenario():
+        async with unit_of_work():
+            assert await _add_user(1, committed)
+            # 重复的 chat_id 违反唯一约束，只回滚这一次 helper 调用
+            assert not await _add_user(1, committed)
+            assert await _add_user(2, committed)
+            assert await _count_in_unit() == 2
+        assert await _count_committed() == 2
+        assert committed == [1, 2]
+
+    run(scenario())
+
+
+def test_rollback_inside_helper_keeps_earlier_commit(database, run):
+    async def helper():
+        async for session in get_db():
+            session.add(User(chat_id=1, username="user1", full_name="User 1"))
+            await session.commit()
+            session.add(User(chat_id=2, username="user2", full_name="User 2"))
+            await session.flush()
+            await session.rollback()
+            return await session.scalar(select(func.count()).select_from(User))
+
+    async def scenario():
+        async with unit_of_work():
+            assert await helper() == 1
+        assert await _count_committed() == 1
+
+    run(scenario())
+
+
+def test_commit_before_send_only_at_handler_level(database, run):
+    middleware = CommitBeforeRequestMiddleware()
+    visible = []
+
+    async def make_request(bot, method):
+        visible.append(await _count_committed())
+
+    async def helper_that_sends():
+        async for session in get_db():
+            session.add(User(chat_id=2, username="user2", full_name="User 2"))
+            await session.flush()
+            # helper 内部的请求不会提交其未完成的修改
+            await middleware(make_request, None, None)
+            await session.commit()
+            return True
+
+    async def scenario():
+        async with unit_of_work():
+            assert await _add_user(1, [])
+            await middleware(make_request, None, None)
+            assert await helper_that_sends()
+        assert await _count_committed() == 2
+
+    run(scenario())
+    assert visible == [1, 1]
@@ -0,0 +1,47 @@
+"""写回缓冲：写回失败时合并回缓冲区"""
+
+import pytest
+from sqlalchemy import select, text
+
+from app.database.activity import ActivityAggregator
+from app.database.db import AsyncSessionLocal
+from app.database.schema import User
+from app.database.write_behind import WriteBehindAggregator
+
+
+def test_params_is_abstract():
+    class Incomplete(WriteBehindAggregator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(flush_interval=1)
+
+
+def test_failed_flush_merges_back(database, run):
+    async def seed():
+        async with AsyncSessionLocal() as session:
+            session.add(User(chat_id=1, username="tester", full_name="Tester"))
+            await session.commit()
+
+    async def stored() -> tuple:
+        async with AsyncSessionLocal() as session:
+            user = await session.scalar(select(User).where(User.chat_id == 1))
+            return user.total_messages, user.total_commands, user.last_command
+
+    run(seed())
+    aggregator = ActivityAggregator(flush_interval=60, max_pending=None)
+    aggregator.record(1, command="/start")
+    aggregator.record(1)
+
+    # 写回语句出错：换出的数据回填到缓冲区
+    aggregator.flush_stmt = text("UPDATE missing_table SET total_messages = :b_messages")
+    assert run(aggregator.flush()) == 0
+    assert aggregator.pending_count == 1
+    assert run(stored()) == (0, 0, None)
+
+    # 失败后的新记录与回填的数据合并，恢复后一次写回
+    aggregator.record(1)
+    del aggregator.flush_stmt
+    assert run(aggregator.flush()) == 1
+    assert aggregator.pending_count == 0
+    assert run(stored()) == (3, 1, "/start")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""SQLite 连接参数基准测试工具
+
+对比 SQLite 默认设置与 app/database/db.py 中性能参数（WAL 等）下的写入吞吐：
+- 连接层：单连接逐条提交的小事务，反映每次提交的 fsync 开销
+- 应用层：通过 SQLAlchemy + aiosqlite 并发执行“读角色 + 更新活跃时间”的事务，
+  与中间件处理一条消息的模式相同（包含驱动与 ORM 的开销）
+
+示例：
+    python tools/bench_sqlite.py --writes 2000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from sqlalchemy import event, update, select, func
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.database.schema import Base, User
+    from app.database.db import SQLITE_PRAGMAS, apply_sqlite_pragmas
+except ImportError:
+    print("无法导入数据库模块，请确保在项目根目录运行此脚本")
+    sys.exit(1)
+
+
+def run_raw_case(name: str, db_path: Path, pragmas: dict, users: int, writes: int) -> None:
+    """连接层测试：单连接逐条提交"""
+    connection = sqlite3.connect(db_path)
+    apply_sqlite_pragmas(connection, pragmas)
+    connection.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, last_activity_at TEXT)")
+    connection.executemany("INSERT INTO t VALUES (?, NULL)", [(i,) for i in range(users)])
+    connection.commit()
+
+    started = time.perf_counter()
+    for i in range(writes):
+        connection.execute("UPDATE t SET last_activity_at = ? WHERE id = ?", (datetime.now().isoformat(), i % users))
+        connection.commit()
+    elapsed = time.perf_counter() - started
+    connection.close()
+
+    print(f"{name:<10} {writes / elapsed:>10.0f} 次写入/秒  耗时 {elapsed:6.2f}s")
+
+
+async def run_case(name: str, db_path: Path, pragmas: dict, users: int, writes: int, concurrency: int) -> None:
+    """运行一组写入测试并打印结果"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    if pragmas:
+        @event.listens_for(engine.sync_engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            apply_sqlite_pragmas(dbapi_connection, pragmas)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        session.add_all(
+            User(chat_id=chat_id, full_name=f"user{chat_id}", username=f"user{chat_id}")
+            for chat_id in range(1, users + 1)
+        )
+        await session.commit()
+
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(writes):
+        queue.put_nowait(i % users + 1)
+
+    async def worker() -> None:
+        nonlocal errors
+        while not queue.empty():
+            chat_id = queue.get_nowait()
+            try:
+                async with session_factory() as session:
+                    # 读 + 写，与中间件处理一条消息的模式相同
+                    await session.execute(select(User.role).where(User.chat_id == chat_id))
+                    await session.execute(
+                        update(User).where(User.chat_id == chat_id).values(last_activity_at=datetime.now())
+                    )
+                    await session.commit()
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        updated = (await session.execute(
+            select(func.count()).select_from(User).where(User.last_activity_at.isnot(None))
+        )).scalar()
+    await engine.dispose()
+
+    print(f"{name:<10} {writes / elapsed:>10.0f} 次写入/秒  耗时 {elapsed:6.2f}s  失败 {errors}  已更新用户 {updated}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLite 连接参数基准测试")
+    parser.add_argument("--users", type=int, default=1000, help="测试用户数")
+    parser.add_argument("--writes", type=int, default=2000, help="写入事务数")
+    parser.add_argument("--concurrency", type=int, default=20, help="并发协程数")
+    parser.add_argument("--dir", default=None, help="临时数据库所在目录（应与生产数据库位于同类磁盘，tmpfs 上测不出 fsync 差异）")
+    args = parser.parse_args()
+
+    print(f"参数: {SQLITE_PRAGMAS}\n")
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        print("连接层（单连接逐条提交）")
+        run_raw_case("默认设置", Path(tmp) / "raw_default.db", {}, args.users, args.writes)
+        run_raw_case("性能参数", Path(tmp) / "raw_tuned.db", SQLITE_PRAGMAS, args.users, args.writes)
+        print(f"\n应用层（SQLAlchemy + aiosqlite，{args.concurrency} 并发）")
+        await run_case("默认设置", Path(tmp) / "default.db", {}, args.users, args.writes, args.concurrency)
+        await run_case("性能参数", Path(tmp) / "tuned.db", SQLITE_PRAGMAS, args.users, args.writes, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
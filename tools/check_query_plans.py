@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""热点查询执行计划检查工具
+
+补齐索引后对登记的热点查询执行 EXPLAIN QUERY PLAN，
+任何查询退化为全表扫描时以非零状态码退出（可用于部署前检查或 CI）。
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from app.config import DATABASE_URL_ASYNC
+    from app.database.db import engine, init_db
+    from app.database.query_plans import check_query_plans
+except ImportError:
+    print("无法导入数据库模块，请确保在项目根目录运行此脚本")
+    sys.exit(1)
+
+
+async def main() -> int:
+    if not DATABASE_URL_ASYNC.startswith("sqlite"):
+        print("当前仅支持检查 SQLite 数据库的执行计划")
+        return 0
+
+    # 建表并补齐缺失索引
+    await init_db()
+
+    async with engine.connect() as conn:
+        results = await conn.run_sync(check_query_plans)
+    await engine.dispose()
+
+    failed = 0
+    for name, plan, ok in results:
+        print(f"{'✅' if ok else '❌'} {name}")
+        for step in plan:
+            print(f"    {step}")
+        failed += not ok
+
+    print(f"\n共 {len(results)} 条查询，{failed} 条存在全表扫描")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))